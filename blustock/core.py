@@ -7,24 +7,43 @@ Funciones
         vinculado dependiendo del estado de activación del botón.
 
     insertarFilas(tabla: QtWidgets.QTableWidget,
-                  funcGuardar: types.FunctionType,
-                  funcEliminar: types.FunctionType,
+                  funcGuardar: types.FunctionType | None,
+                  funcEliminar: types.FunctionType | None,
                   campos: tuple,
                   sugerencias: tuple | list | None = None,
                   funcEspecial: types.FunctionType | None = None):
         Inserta una nueva fila en una tabla de una gestión.
 
-    generarBotones(funcGuardar: types.FunctionType,
-                   funcEliminar: types.FunctionType,
+    generarBotones(funcGuardar: types.FunctionType | None,
+                   funcEliminar: types.FunctionType | None,
                    tabla: QtWidgets.QTableWidget, numFila: int):
         Genera botones para guardar cambios y eliminar filas y los
         inserta en una fila de una tabla de la UI.
+
+    filaModificada(tabla: QtWidgets.QTableWidget, numFila: int) -> bool:
+        Devuelve si una fila de una tabla tiene cambios sin guardar.
+
+    marcarFila(tabla: QtWidgets.QTableWidget, numFila: int,
+               modificada: bool):
+        Habilita o deshabilita el botón guardar de una fila.
+
+    llenarLista(lista: QtWidgets.QComboBox, vocabulario: str,
+                opcionTodos: str):
+        Llena una lista de filtros con las opciones de la caché de
+        vocabularios, solo si cambiaron.
     
     cargarFuentes():
         Carga fuentes a la aplicación.
 
 Variables
 ---------
+    campos<Gestión>: tuple
+        El tipo de campo y el tipo de valor de cada columna de la
+        tabla de cada gestión.
+
+    encabezados<Listado>: tuple
+        Los títulos de las columnas de los listados que usan un
+        ModeloTabla.
 """
 import os
 import types
@@ -32,6 +51,9 @@ from PyQt6 import QtWidgets, QtGui, QtCore
 from ui.presets.popup import PopUp
 from ui.presets.param_edit import ParamEdit
 from ui.presets.boton import BotonFila
+from ui.presets.delegados import (DelegadoSugerencias, DelegadoBotones,
+                                  ROL_HABILITADO)
+from dal.vocabularios import vocabularios
 
 def mostrarContrasena(boton: QtWidgets.QCheckBox, entry: QtWidgets.QLineEdit):
     """Este método muestra o esconde lo ingresado en el campo de
@@ -78,9 +100,26 @@ camposUbis=((2, 1), (0, 1))
 camposUsuarios=((2, 1, 3, 1, 1, 1), (0, 1, 2, 1, 1, 1))
 camposReps=((2, 2, 2, 2, 2, 2, 2), (0, 1, 0, 1, 1, 1, 1))
 
+# Los títulos de las columnas de los listados de solo lectura, que usan
+# un modelo en lugar de un QTableWidget.
+encabezadosMovs=("ID", "Tipo", "Elemento", "Ubicación", "Estado", "Cantidad",
+                 "Motivo", "Persona", "Fecha y Hora", "Turno", "Pañorelo",
+                 "Profesor a cargo del turno")
+encabezadosTurnos=("ID", "Alumno", "Fecha y hora de ingreso",
+                   "Hora de egreso", "Profesor Responsable del Ingreso",
+                   "Profesor Responsable del Egreso", "Ubicación")
+encabezadosReps=("ID", "Herramienta", "Cantidad", "Usuario", "Destino",
+                 "Fecha de Envío", "Fecha de Regreso ")
+encabezadosHistorial=("Usuario", "Fecha y hora", "Gestión", "Tipo",
+                      "Registro", "Descripcion")
+encabezadosDeudas=("Persona", "Herramienta", "Cantidad", "Movimiento",
+                   "Pañolero", "Ubicación", "Turno")
+encabezadosBaja=("Persona", "Herramienta", "Cantidad", "Motivo",
+                 "Movimiento", "Pañolero", "Ubicación", "Turno")
+
 def insertarFilas(tabla: QtWidgets.QTableWidget,
-                  funcGuardar: types.FunctionType,
-                  funcEliminar: types.FunctionType,
+                  funcGuardar: types.FunctionType | None,
+                  funcEliminar: types.FunctionType | None,
                   funcTabla: types.FunctionType, campos: tuple,
                   sugerencias: tuple | list | None = None,
                   funcEspecial: types.FunctionType | None = None):
@@ -91,13 +130,15 @@ def insertarFilas(tabla: QtWidgets.QTableWidget,
         tabla: QtWidgets.QTableWidget
             La tabla a la que se le van a insertar los elementos.
 
-        funcGuardar: types.FunctionType
+        funcGuardar: types.FunctionType | None
             La función guardar que el botón guardar de la fila
-            ejecutará.
+            ejecutará. Se pasa None si los botones de la tabla los
+            dibuja un DelegadoBotones.
 
-        funcEliminar: types.FunctionType
+        funcEliminar: types.FunctionType | None
             La función eliminar que el botón eliminar de la fila
-            ejecutará.
+            ejecutará. Se pasa None si los botones de la tabla los
+            dibuja un DelegadoBotones.
 
         funcTabla: types.FunctionType | None = None
             La función que se conectará con la tabla, que se desconecta
@@ -144,7 +185,7 @@ def insertarFilas(tabla: QtWidgets.QTableWidget,
                 # ...verificamos si el campo es un lineedit o una celda
                 # normal, ya que el texto se obtiene de forma
                 # diferente, y obtenemos el texto
-                if tipoCampo == 1:
+                if tabla.cellWidget(ultimaFila, nCampo) is None:
                     texto=tabla.item(ultimaFila, nCampo).text()
                 else:
                     texto=tabla.cellWidget(ultimaFila, nCampo).text()
@@ -164,8 +205,11 @@ def insertarFilas(tabla: QtWidgets.QTableWidget,
         QtWidgets.QAbstractItemView.ScrollHint.PositionAtBottom)
     # Por cada número de campo y tipo de campo de la tabla...
     for nCampo, tipoCampo in enumerate(campos):
-        # Si el tipo de campo no es con sugerencia...
-        if tipoCampo in {0, 1, 2}:
+        # Si el tipo de campo no es con sugerencia, o si la columna
+        # tiene un delegado que crea el campo con sugerencias al
+        # editar...
+        if (tipoCampo in {0, 1, 2} or isinstance(
+                tabla.itemDelegateForColumn(nCampo), DelegadoSugerencias)):
             # Se crea el campo como un TableWidgetItem
             item=QtWidgets.QTableWidgetItem()
             item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
@@ -225,22 +269,40 @@ def insertarFilas(tabla: QtWidgets.QTableWidget,
     tabla.setCurrentCell(indiceFinal, 1)
     tabla.setRowHeight(indiceFinal, 35)
 
-def generarBotones(funcGuardar: types.FunctionType, funcEliminar: types.FunctionType,
+def generarBotones(funcGuardar: types.FunctionType | None,
+                   funcEliminar: types.FunctionType | None,
                    tabla: QtWidgets.QTableWidget, numFila: int):
         """Este método genera botones para guardar cambios y eliminar
         filas y los inserta en una fila de una tabla de la UI
 
+        Si las columnas de botones de la tabla tienen un
+        DelegadoBotones, los botones los dibuja el delegado y sus
+        clics se atienden con las señales del delegado. En ese caso
+        solo se crean los items que guardan el estado de los botones y
+        las funciones no se usan.
+
         Parámetros
         ----------
-            funcGuardar: types.FunctionType
+            funcGuardar: types.FunctionType | None
                 La función que estará vinculada al botón guardar.
-            funcEliminar: types.FunctionType
+            funcEliminar: types.FunctionType | None
                 La función que estará vinculada al botón eliminar.
             tabla: QtWidgets.QTableWidget
                 La tabla a la que se le añadirán los botones.
             numFila: int
                 La fila en la que se insertarán los botones.
         """
+        if isinstance(tabla.itemDelegateForColumn(tabla.columnCount() - 1),
+                      DelegadoBotones):
+            # El botón guardar empieza desactivado y el eliminar,
+            # activado, igual que los botones widget.
+            for col, habilitado in ((tabla.columnCount() - 2, False),
+                                    (tabla.columnCount() - 1, True)):
+                item = QtWidgets.QTableWidgetItem()
+                item.setFlags(QtCore.Qt.ItemFlag.ItemIsEnabled)
+                item.setData(ROL_HABILITADO, habilitado)
+                tabla.setItem(numFila, col, item)
+            return
         # Se crean dos botones: uno de editar y uno de eliminar
         guardar = BotonFila("guardar")
         # Conectamos el botón a su función guardar correspondiente.
@@ -257,6 +319,84 @@ def generarBotones(funcGuardar: types.FunctionType, funcEliminar: types.Function
         tabla.setCellWidget(numFila, tabla.columnCount() - 2, guardar)
         tabla.setCellWidget(numFila, tabla.columnCount() - 1, borrar)
 
+def filaModificada(tabla: QtWidgets.QTableWidget, numFila: int) -> bool:
+    """Esta función devuelve si una fila de una tabla tiene cambios sin
+    guardar, es decir, si su botón guardar está habilitado.
+
+    Parámetros
+    ----------
+        tabla: QtWidgets.QTableWidget
+            La tabla de la fila.
+        numFila: int
+            El número de la fila.
+
+    Devuelve
+    --------
+        bool: si la fila tiene cambios sin guardar.
+    """
+    boton = tabla.cellWidget(numFila, tabla.columnCount() - 2)
+    if boton is not None:
+        return boton.isEnabled()
+    # Si no hay un botón widget, el estado está en el item que dibuja
+    # el delegado.
+    item = tabla.item(numFila, tabla.columnCount() - 2)
+    return item is not None and bool(item.data(ROL_HABILITADO))
+
+def marcarFila(tabla: QtWidgets.QTableWidget, numFila: int,
+               modificada: bool):
+    """Esta función habilita o deshabilita el botón guardar de una
+    fila, marcándola como modificada o guardada.
+
+    Parámetros
+    ----------
+        tabla: QtWidgets.QTableWidget
+            La tabla de la fila.
+        numFila: int
+            El número de la fila.
+        modificada: bool
+            Si la fila tiene cambios sin guardar.
+    """
+    boton = tabla.cellWidget(numFila, tabla.columnCount() - 2)
+    if boton is not None:
+        return boton.setEnabled(modificada)
+    item = tabla.item(numFila, tabla.columnCount() - 2)
+    if item is not None:
+        # Bloqueamos las señales de la tabla para que el cambio de
+        # estado no cuente como una edición de la fila.
+        bloqueada = tabla.blockSignals(True)
+        item.setData(ROL_HABILITADO, modificada)
+        tabla.blockSignals(bloqueada)
+
+def llenarLista(lista: QtWidgets.QComboBox, vocabulario: str,
+                opcionTodos: str):
+    """Esta función llena una lista de filtros con las opciones de la
+    caché de vocabularios. Si las opciones no cambiaron desde la última
+    vez que se llenó, la lista queda como está.
+
+    Parámetros
+    ----------
+        lista: QtWidgets.QComboBox
+            La lista de filtros.
+        vocabulario: str
+            El nombre de las opciones en la caché de vocabularios.
+        opcionTodos: str
+            La primera opción, que no filtra ("Todos" o "Todas").
+    """
+    generacion, opciones = vocabularios.obtener(vocabulario)
+    # La lista guarda la generación de sus opciones.
+    if lista.property("generacionVocabulario") == generacion:
+        return
+    seleccionada = lista.currentText()
+    bloqueada = lista.blockSignals(True)
+    lista.clear()
+    lista.addItem(opcionTodos)
+    lista.addItems(opciones)
+    # Volvemos a seleccionar la opción que estaba seleccionada. Si ya
+    # no está, seleccionamos la que no filtra.
+    lista.setCurrentIndex(max(lista.findText(seleccionada), 0))
+    lista.blockSignals(bloqueada)
+    lista.setProperty("generacionVocabulario", generacion)
+
 def cargarFuentes():
     """Esta función carga fuentes a la aplicación."""
     # Por cada fuente en la carpeta de fuentes...
@@ -271,7 +411,7 @@ def refresh(tabla, funcFetch):
     """Este método revisa si se hicieron cambios en la tabla y avisa al
     usuario antes de refrescar la pantalla."""
     for row in range(tabla.rowCount()):
-        if tabla.cellWidget(row, tabla.columnCount()-2).isEnabled():
+        if filaModificada(tabla, row):
             resp=PopUp('Pregunta', 'Esta acción refrescará la tabla y hay cambios sin guardar. Si realiza esta acción, los cambios no guardados se perderán.\n¿Desea refrescar y descartar los cambios?').exec()
             if resp==QtWidgets.QMessageBox.StandardButton.Yes:
                 funcFetch()
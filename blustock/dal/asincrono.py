@@ -0,0 +1,411 @@
+"""Este módulo contiene la versión asincrónica de la obtención de datos
+de la DAL.
+
+Las consultas de los listados se ejecutan en un hilo aparte, con su
+propia conexión a la base de datos, así una consulta lenta no congela
+la ventana (ni los avisos de los turnos). El resultado vuelve al hilo
+de la interfaz con una señal.
+
+Cada pedido tiene una clave (por ejemplo, la pantalla que lo hizo). Si
+se hace un pedido nuevo con la misma clave antes de que termine el
+anterior, el anterior se cancela: si todavía no empezó, no se ejecuta,
+si se está ejecutando, se interrumpe con Connection.interrupt, y si ya
+terminó, su resultado se descarta. Así solo se muestra el resultado de
+la última búsqueda.
+
+Clases
+------
+    TrabajadorConsultas(QtCore.QObject):
+        Ejecuta las consultas en el hilo de consultas.
+
+    DALAsincrona(QtCore.QObject):
+        Pide datos a la base de datos sin bloquear la interfaz.
+
+Variables
+---------
+    dalAsincrona: DALAsincrona
+        La instancia que usa la aplicación.
+"""
+import sqlite3
+import threading
+import types
+from datetime import date
+from PyQt6 import QtCore
+from db.bdd import bdd
+from dal.consultas import consultas, TAMANO_PAGINA
+from dal.dal import reemplazarNulos
+
+
+class TrabajadorConsultas(QtCore.QObject):
+    """Esta clase ejecuta las consultas en el hilo de consultas. La
+    conexión se abre recién con la primera consulta, para que la cree
+    el mismo hilo que la usa.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        funcVigente: types.FunctionType
+            Una función que recibe la clave y el número de un pedido y
+            devuelve si el pedido sigue siendo el último de su clave.
+
+        con: sqlite3.Connection | None
+            La conexión de solo lectura del hilo.
+
+        enCurso: str | None
+            La clave del pedido que se está ejecutando.
+
+        candado: threading.Lock
+            Protege enCurso, para no interrumpir la consulta de otro
+            pedido.
+
+    Señales
+    -------
+        terminado(str, int, object):
+            Se emite con la clave, el número y las filas de un pedido
+            que terminó.
+
+        fallo(str, int, str):
+            Se emite con la clave, el número y el error de un pedido
+            que falló.
+    """
+    terminado = QtCore.pyqtSignal(str, int, object)
+    fallo = QtCore.pyqtSignal(str, int, str)
+
+    def __init__(self, funcVigente: types.FunctionType):
+        super().__init__()
+        self.funcVigente = funcVigente
+        self.con = None
+        self.enCurso = None
+        self.candado = threading.Lock()
+
+    @QtCore.pyqtSlot(str, int, str, object)
+    def ejecutar(self, clave: str, numero: int, sql: str,
+                 parametros: dict):
+        """Este método ejecuta la consulta de un pedido, si todavía es
+        el último de su clave.
+
+        Parámetros
+        ----------
+            clave: str
+                La clave del pedido.
+
+            numero: int
+                El número del pedido.
+
+            sql: str
+                El código sql de la consulta.
+
+            parametros: dict
+                Los parámetros de la consulta.
+        """
+        # Si mientras esperaba llegó otro pedido con la misma clave,
+        # este ya no hace falta.
+        if not self.funcVigente(clave, numero):
+            return
+        try:
+            if self.con is None:
+                self.con = bdd.conexion(soloLectura=True)
+            with self.candado:
+                self.enCurso = clave
+            try:
+                datos = self.con.execute(sql, parametros).fetchall()
+            finally:
+                with self.candado:
+                    self.enCurso = None
+        except sqlite3.OperationalError as error:
+            # Una consulta interrumpida porque llegó otro pedido no es
+            # un error.
+            if self.funcVigente(clave, numero):
+                self.fallo.emit(clave, numero, str(error))
+            return
+        except Exception as error:
+            self.fallo.emit(clave, numero, str(error))
+            return
+        self.terminado.emit(clave, numero, reemplazarNulos(datos))
+
+    def interrumpir(self, clave: str):
+        """Este método interrumpe la consulta que se está ejecutando,
+        si es de la clave indicada. Se llama desde el hilo de la
+        interfaz.
+
+        Parámetros
+        ----------
+            clave: str
+                La clave del pedido a interrumpir.
+        """
+        with self.candado:
+            if self.enCurso == clave and self.con is not None:
+                self.con.interrupt()
+
+    @QtCore.pyqtSlot()
+    def cerrar(self):
+        """Este método cierra la conexión del hilo."""
+        if self.con is not None:
+            bdd.cerrar()
+            self.con = None
+
+
+class DALAsincrona(QtCore.QObject):
+    """Esta clase pide datos a la base de datos sin bloquear la
+    interfaz. Las consultas se preparan igual que en dal.obtenerDatos
+    y se ejecutan en orden en el hilo de consultas.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        hilo: QtCore.QThread
+            El hilo de consultas.
+
+        trabajador: TrabajadorConsultas
+            El objeto que ejecuta las consultas en el hilo.
+
+        ultimos: dict
+            El número del último pedido de cada clave.
+
+        funcsResultado: dict
+            La función que recibe el resultado del último pedido de
+            cada clave que todavía no terminó.
+
+        funcsCancelado: dict
+            La función que se llama si el último pedido de cada clave
+            se cancela o falla, para los pedidos que la pasaron.
+
+        cerrada: bool
+            Si ya se detuvo el hilo de consultas. Después de cerrarla,
+            los pedidos se ignoran.
+
+    Señales
+    -------
+        pedido(str, int, str, object):
+            Envía un pedido al hilo de consultas.
+
+        error(str, str):
+            Se emite con la clave y el mensaje cuando falla el último
+            pedido de una clave.
+
+    Métodos
+    -------
+        obtenerDatos(self, clave: str, funcResultado: types.FunctionType,
+                     tabla: str, busqueda: str | None = None,
+                     filtrosExtra: list | tuple | None = None,
+                     desde: date | None = None, hasta: date | None = None,
+                     cursor: tuple | None = None,
+                     limite: int | None = None,
+                     funcCancelado: types.FunctionType | None = None
+                     ) -> int:
+            Pide los datos de una consulta.
+
+        obtenerPagina(self, clave: str,
+                      funcResultado: types.FunctionType, tabla: str,
+                      busqueda: str | None = None,
+                      filtrosExtra: list | tuple | None = None,
+                      desde: date | None = None,
+                      hasta: date | None = None,
+                      ultimaFila: list | None = None,
+                      limite: int = TAMANO_PAGINA,
+                      funcCancelado: types.FunctionType | None = None
+                      ) -> int:
+            Pide la página que sigue a una fila de un listado paginado.
+
+        cancelar(self, clave: str):
+            Cancela el pedido pendiente de una clave.
+
+        hayPendientes(self) -> bool:
+            Devuelve si hay pedidos que todavía no terminaron.
+
+        cerrar(self):
+            Detiene el hilo de consultas.
+    """
+    pedido = QtCore.pyqtSignal(str, int, str, object)
+    error = QtCore.pyqtSignal(str, str)
+
+    def __init__(self, parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.ultimos = {}
+        self.funcsResultado = {}
+        self.funcsCancelado = {}
+        self.cerrada = False
+        self.hilo = QtCore.QThread()
+        self.hilo.setObjectName("hiloConsultas")
+        self.trabajador = TrabajadorConsultas(self._vigente)
+        self.trabajador.moveToThread(self.hilo)
+        # Las señales entre los dos hilos se encolan: los pedidos se
+        # ejecutan en el hilo de consultas y los resultados vuelven al
+        # hilo de la interfaz.
+        self.pedido.connect(self.trabajador.ejecutar)
+        self.trabajador.terminado.connect(self._entregar)
+        self.trabajador.fallo.connect(self._fallar)
+
+    def _vigente(self, clave: str, numero: int) -> bool:
+        """Devuelve si un pedido sigue siendo el último de su clave.
+        Se llama desde el hilo de consultas; leer un diccionario es
+        seguro entre hilos."""
+        return self.ultimos.get(clave) == numero
+
+    def obtenerDatos(self, clave: str, funcResultado: types.FunctionType,
+                     tabla: str, busqueda: str | None = None,
+                     filtrosExtra: list | tuple | None = None,
+                     desde: date | None = None, hasta: date | None = None,
+                     cursor: tuple | None = None,
+                     limite: int | None = None,
+                     funcCancelado: types.FunctionType | None = None
+                     ) -> int:
+        """Este método pide los datos de una consulta. Cuando la
+        consulta termina, se llama a funcResultado con las filas, en el
+        hilo de la interfaz.
+
+        Parámetros
+        ----------
+            clave: str
+                La clave del pedido. Un pedido nuevo con la misma clave
+                cancela el anterior.
+
+            funcResultado: types.FunctionType
+                La función que recibe las filas obtenidas.
+
+            tabla, busqueda, filtrosExtra, desde, hasta, cursor, limite
+                Los mismos parámetros que dal.obtenerDatos.
+
+            funcCancelado: types.FunctionType | None = None
+                La función que se llama, sin argumentos, si el pedido
+                se cancela con cancelar o falla. No se llama si lo
+                reemplaza otro pedido de la misma clave.
+                Default: None.
+
+        Devuelve
+        --------
+            int: el número del pedido, o 0 si ya se cerró.
+        """
+        # Mientras se cierra la app, algunos widgets todavía pueden
+        # pedir datos.
+        if self.cerrada:
+            return 0
+        # La consulta se prepara acá, así el hilo de consultas no
+        # comparte el registro de consultas.
+        sql, parametros = consultas.obtener(tabla).preparar(
+            busqueda, filtrosExtra, desde, hasta, cursor, limite)
+        # El hilo arranca con el primer pedido, cuando la aplicación
+        # ya existe.
+        if not self.hilo.isRunning():
+            self.hilo.start()
+        numero = self.ultimos.get(clave, 0) + 1
+        self.ultimos[clave] = numero
+        # Si el pedido anterior de la clave se está ejecutando, lo
+        # cortamos para que el hilo pase a este.
+        self.trabajador.interrumpir(clave)
+        self.funcsResultado[clave] = funcResultado
+        if funcCancelado is None:
+            self.funcsCancelado.pop(clave, None)
+        else:
+            self.funcsCancelado[clave] = funcCancelado
+        self.pedido.emit(clave, numero, sql, parametros)
+        return numero
+
+    def obtenerPagina(self, clave: str, funcResultado: types.FunctionType,
+                      tabla: str, busqueda: str | None = None,
+                      filtrosExtra: list | tuple | None = None,
+                      desde: date | None = None, hasta: date | None = None,
+                      ultimaFila: list | None = None,
+                      limite: int = TAMANO_PAGINA,
+                      funcCancelado: types.FunctionType | None = None
+                      ) -> int:
+        """Este método pide la página que sigue a una fila de un
+        listado paginado, como dal.obtenerPagina. El pedido se cancela
+        y se entrega igual que los de obtenerDatos.
+
+        Parámetros
+        ----------
+            clave: str
+                La clave del pedido.
+
+            funcResultado: types.FunctionType
+                La función que recibe las filas de la página.
+
+            tabla, busqueda, filtrosExtra, desde, hasta, ultimaFila,
+            limite
+                Los mismos parámetros que dal.obtenerPagina.
+
+            funcCancelado: types.FunctionType | None = None
+                El mismo parámetro que obtenerDatos.
+                Default: None.
+
+        Devuelve
+        --------
+            int: el número del pedido, o 0 si ya se cerró.
+        """
+        # Las dos últimas columnas de las consultas paginadas son la
+        # fecha y el id de la fila.
+        cursor = None if ultimaFila is None else tuple(ultimaFila[-2:])
+        return self.obtenerDatos(clave, funcResultado, tabla, busqueda,
+                                 filtrosExtra, desde, hasta, cursor, limite,
+                                 funcCancelado)
+
+    def cancelar(self, clave: str):
+        """Este método cancela el pedido pendiente de una clave. Si se
+        está ejecutando, se interrumpe, y su resultado no se entrega.
+        Si el pedido pasó funcCancelado, se la llama.
+
+        Parámetros
+        ----------
+            clave: str
+                La clave del pedido.
+        """
+        if clave in self.ultimos:
+            self.ultimos[clave] += 1
+        self.trabajador.interrumpir(clave)
+        self.funcsResultado.pop(clave, None)
+        self._avisarCancelado(clave)
+
+    def hayPendientes(self) -> bool:
+        """Este método devuelve si hay pedidos que todavía no
+        terminaron.
+
+        Devuelve
+        --------
+            bool: si hay pedidos pendientes.
+        """
+        return bool(self.funcsResultado)
+
+    def _entregar(self, clave: str, numero: int, datos: list):
+        """Entrega las filas de un pedido, si es el último de su
+        clave."""
+        if not self._vigente(clave, numero):
+            return
+        funcResultado = self.funcsResultado.pop(clave, None)
+        self.funcsCancelado.pop(clave, None)
+        if funcResultado is not None:
+            funcResultado(datos)
+
+    def _fallar(self, clave: str, numero: int, mensaje: str):
+        """Avisa que falló un pedido, si es el último de su clave."""
+        if not self._vigente(clave, numero):
+            return
+        self.funcsResultado.pop(clave, None)
+        self._avisarCancelado(clave)
+        self.error.emit(clave, mensaje)
+
+    def _avisarCancelado(self, clave: str):
+        """Llama a la función funcCancelado del pedido de una clave que
+        no se va a entregar, si la pasó."""
+        funcCancelado = self.funcsCancelado.pop(clave, None)
+        if funcCancelado is not None:
+            funcCancelado()
+
+    def cerrar(self):
+        """Este método detiene el hilo de consultas y cierra su
+        conexión."""
+        for clave in list(self.ultimos):
+            self.cancelar(clave)
+        self.cerrada = True
+        if not self.hilo.isRunning():
+            return
+        QtCore.QMetaObject.invokeMethod(
+            self.trabajador, "cerrar",
+            QtCore.Qt.ConnectionType.BlockingQueuedConnection)
+        self.hilo.quit()
+        self.hilo.wait()
+
+
+dalAsincrona = DALAsincrona()
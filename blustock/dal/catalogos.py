@@ -0,0 +1,180 @@
+"""Este módulo contiene la caché de las tablas de catálogo (grupos,
+subgrupos, ubicaciones, clases, categorías de clase, estados, tipos de
+movimiento, tipos de cambio y gestiones) y de los ids del personal por
+dni.
+
+Los métodos que guardan datos necesitan el id de cada descripción
+ingresada. En lugar de buscarlo en la base de datos cada vez, cada
+catálogo se carga entero en un diccionario (descripción en minúsculas
+-> id). Los catálogos usan las generaciones de dal.vocabularios: cuando
+se escribe en una tabla y se llama a marcarCambio, su catálogo se
+vuelve a cargar la próxima vez que se usa.
+
+Clases
+------
+    Catalogo():
+        Guarda los ids de una tabla según su descripción.
+
+    Catalogos():
+        Agrupa los catálogos que usa la aplicación.
+
+Funciones
+---------
+    normalizar(clave) -> object:
+        Normaliza una clave para buscarla en un catálogo.
+
+Variables
+---------
+    catalogos: Catalogos
+        Los catálogos que usa la aplicación.
+"""
+from db.bdd import bdd
+from dal.vocabularios import generacion
+
+
+def normalizar(clave) -> object:
+    """Esta función normaliza una clave para buscarla en un catálogo.
+    Los textos se comparan sin distinguir mayúsculas, igual que LIKE;
+    los demás valores quedan como están.
+
+    Parámetros
+    ----------
+        clave
+            La clave a normalizar.
+
+    Devuelve
+    --------
+        object: la clave normalizada.
+    """
+    if isinstance(clave, str):
+        return clave.casefold()
+    return clave
+
+
+class Catalogo():
+    """Esta clase guarda los ids de una tabla según su descripción (o
+    según varias columnas, como los subgrupos, que se identifican por
+    su descripción y su grupo).
+
+    Atributos
+    ---------
+        sql: str
+            La consulta que obtiene los datos. La primera columna es el
+            id y las demás forman la clave.
+
+        tablas: tuple
+            Las tablas de las que sale el catálogo.
+
+        generacion: int | None
+            La generación de las tablas cuando se cargó el catálogo.
+
+        ids: dict
+            El id de cada clave normalizada.
+
+        filas: dict
+            La clave original de cada id.
+
+    Métodos
+    -------
+        id(self, *clave) -> int | None:
+            Devuelve el id de una clave.
+
+        fila(self, *clave) -> tuple | None:
+            Devuelve el id y la clave tal como está guardada.
+    """
+    def __init__(self, sql: str, tablas: tuple):
+        self.sql = sql
+        self.tablas = tablas
+        self.generacion = None
+        self.ids = {}
+        self.filas = {}
+
+    def _actualizar(self):
+        """Vuelve a cargar el catálogo si cambiaron sus tablas."""
+        actual = generacion(self.tablas)
+        if self.generacion == actual:
+            return
+        self.ids = {}
+        self.filas = {}
+        # Usamos un cursor propio para no pisar los resultados de
+        # bdd.cur de quien nos llama.
+        for idd, *clave in bdd.con.execute(self.sql):
+            self.ids[tuple(normalizar(dato) for dato in clave)] = idd
+            self.filas[idd] = tuple(clave)
+        self.generacion = actual
+
+    def id(self, *clave) -> int | None:
+        """Este método devuelve el id de una clave.
+
+        Parámetros
+        ----------
+            *clave
+                Los valores de la clave (por ejemplo, la descripción).
+
+        Devuelve
+        --------
+            int | None: el id, o None si no está registrada.
+        """
+        self._actualizar()
+        return self.ids.get(tuple(normalizar(dato) for dato in clave))
+
+    def fila(self, *clave) -> tuple | None:
+        """Este método devuelve el id de una clave junto con la clave
+        tal como está guardada en la base de datos.
+
+        Parámetros
+        ----------
+            *clave
+                Los valores de la clave.
+
+        Devuelve
+        --------
+            tuple | None: el id y los valores guardados, o None si no
+            está registrada.
+        """
+        idd = self.id(*clave)
+        if idd is None:
+            return None
+        return (idd, *self.filas[idd])
+
+
+class Catalogos():
+    """Esta clase agrupa los catálogos que usa la aplicación.
+
+    Atributos
+    ---------
+        grupos, subgrupos, ubicaciones, clases, catsClase, estados,
+        tiposMov, tiposCambio, gestiones: Catalogo
+            Los catálogos de cada tabla. Los subgrupos se buscan por
+            descripción e id del grupo, y las clases por descripción e
+            id de la categoría.
+
+        personal: Catalogo
+            Los ids del personal según su dni.
+    """
+    def __init__(self):
+        self.grupos = Catalogo(
+            "SELECT id, descripcion FROM grupos", ("grupos",))
+        self.subgrupos = Catalogo(
+            "SELECT id, descripcion, id_grupo FROM subgrupos",
+            ("subgrupos",))
+        self.ubicaciones = Catalogo(
+            "SELECT id, descripcion FROM ubicaciones", ("ubicaciones",))
+        self.clases = Catalogo(
+            "SELECT id, descripcion, id_cat FROM clases", ("clases",))
+        self.catsClase = Catalogo(
+            "SELECT id, descripcion FROM cats_clase", ("cats_clase",))
+        self.estados = Catalogo(
+            "SELECT id, descripcion FROM estados", ("estados",))
+        self.tiposMov = Catalogo(
+            "SELECT id, descripcion FROM tipos_mov", ("tipos_mov",))
+        self.tiposCambio = Catalogo(
+            "SELECT id, descripcion FROM tipos_cambio", ("tipos_cambio",))
+        self.gestiones = Catalogo(
+            "SELECT id, descripcion FROM gestiones", ("gestiones",))
+        self.personal = Catalogo(
+            "SELECT id, dni FROM personal WHERE dni IS NOT NULL",
+            ("personal",))
+
+
+catalogos = Catalogos()
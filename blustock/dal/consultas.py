@@ -0,0 +1,355 @@
+"""Este módulo contiene el registro de consultas sql de la aplicación.
+
+Las consultas de la carpeta dal/queries se leen y analizan una sola
+vez, al importar el módulo, en lugar de abrir el archivo en cada
+obtención de datos.
+
+Clases
+------
+    Consulta():
+        Guarda el código sql de una consulta y los parámetros que
+        necesita.
+
+    RegistroConsultas():
+        Carga todas las consultas de una carpeta y las entrega listas
+        para ejecutar.
+
+Funciones
+---------
+    nombresParametros(sql: str) -> set:
+        Obtiene los parámetros de una consulta, ignorando comentarios y
+        textos.
+
+    expresionBusqueda(busqueda: str) -> str | None:
+        Convierte el texto de una búsqueda en una expresión de FTS5.
+"""
+import datetime
+import os
+import re
+from db.fechas import textoFecha
+
+# Si esta variable de entorno vale "1", el registro vuelve a leer los
+# archivos que se modificaron desde la última carga. Sirve para
+# desarrollar consultas sin reiniciar la aplicación.
+VARIABLE_RECARGA = "BLUSTOCK_RECARGAR_SQL"
+# Las líneas de la consulta entre estas dos marcas solo se usan cuando
+# hay algo para buscar.
+INICIO_BUSQUEDA = "-- [busqueda]"
+FIN_BUSQUEDA = "-- [/busqueda]"
+# Los valores de :desde y :hasta cuando no se pasa una fecha. Coinciden
+# con cualquier fecha.
+FECHA_MINIMA = "0000"
+FECHA_MAXIMA = "9999"
+# La cantidad de filas de cada página de los listados paginados.
+TAMANO_PAGINA = 100
+
+
+def nombresParametros(sql: str) -> set:
+    """Esta función obtiene los nombres de los parámetros (":nombre")
+    de una consulta sql, sin contar los que estén dentro de comentarios
+    o textos entre comillas.
+
+    Parámetros
+    ----------
+        sql: str
+            El código sql de la consulta.
+
+    Devuelve
+    --------
+        set: los nombres de los parámetros de la consulta.
+    """
+    nombres = set()
+    i = 0
+    largo = len(sql)
+    while i < largo:
+        caracter = sql[i]
+        # Comentario de línea: se saltea hasta el salto de línea.
+        if sql.startswith("--", i):
+            fin = sql.find("\n", i)
+            i = largo if fin == -1 else fin + 1
+        # Comentario de bloque: se saltea hasta el cierre.
+        elif sql.startswith("/*", i):
+            fin = sql.find("*/", i + 2)
+            i = largo if fin == -1 else fin + 2
+        # Texto o identificador entre comillas: se saltea hasta la
+        # comilla de cierre.
+        elif caracter in ("'", '"'):
+            fin = sql.find(caracter, i + 1)
+            i = largo if fin == -1 else fin + 1
+        elif caracter == ":":
+            nombre = re.match(r"\w+", sql[i + 1:])
+            if nombre:
+                nombres.add(nombre.group())
+                i += len(nombre.group())
+            i += 1
+        else:
+            i += 1
+    return nombres
+
+
+def expresionBusqueda(busqueda) -> str | None:
+    """Esta función convierte el texto de una barra de búsqueda en una
+    expresión MATCH de FTS5. Cada palabra se busca como prefijo y todas
+    tienen que aparecer (por ejemplo, "llave tub" se convierte en
+    '"llave"* "tub"*').
+
+    Parámetros
+    ----------
+        busqueda: str
+            El texto de la búsqueda.
+
+    Devuelve
+    --------
+        str | None: la expresión, o None si la búsqueda no tiene
+        ninguna palabra.
+    """
+    if busqueda is None:
+        return None
+    # Se separa igual que el tokenizador unicode61: letras y números.
+    palabras = re.findall(r"[^\W_]+", str(busqueda))
+    if not palabras:
+        return None
+    return " ".join(f'"{palabra}"*' for palabra in palabras)
+
+
+class Consulta():
+    """Esta clase guarda el código sql de una consulta, junto con su
+    versión sin búsqueda y los parámetros que necesita.
+
+    Las consultas usan parámetros con nombre:
+        :filtro1, :filtro2...: los filtros extra, en orden.
+        :busqueda: el texto de búsqueda entre "%", para usar con LIKE.
+        :fts: la expresión de búsqueda para los índices FTS5.
+        :numero: la búsqueda como número entero, o NULL si no lo es.
+        :desde, :hasta: los límites del rango de fechas, como textos
+        en el formato de la base de datos.
+        :cursorFecha, :cursorId: la fecha y el id de la última fila de
+        la página anterior, en las consultas paginadas.
+        :limite: la cantidad máxima de filas, o -1 si no hay límite.
+
+    Las consultas paginadas se ordenan de la fila más nueva a la más
+    vieja y tienen como dos últimas columnas la fecha y el id de la
+    fila, que forman el cursor.
+
+    Atributos
+    ---------
+        sql: str
+            El código sql de la consulta.
+
+        sqlSinBusqueda: str
+            El código sql sin las líneas marcadas como búsqueda.
+
+        nombres: set
+            Los nombres de los parámetros de la consulta.
+
+        ruta: str
+            La ruta del archivo del que se leyó la consulta.
+
+        modificado: float
+            La fecha de modificación del archivo al momento de leerlo.
+
+    Métodos
+    -------
+        preparar(self, busqueda: str | None = None,
+                 filtrosExtra: list | tuple | None = None,
+                 desde: datetime.date | None = None,
+                 hasta: datetime.date | None = None,
+                 cursor: tuple | None = None,
+                 limite: int | None = None) -> tuple:
+            Devuelve el código sql y los parámetros para ejecutar la
+            consulta.
+    """
+    def __init__(self, ruta: str):
+        """El constructor, lee el archivo y analiza sus parámetros.
+
+        Parámetros
+        ----------
+            ruta: str
+                La ruta del archivo sql.
+        """
+        self.ruta = ruta
+        self.modificado = os.path.getmtime(ruta)
+        with open(ruta, 'r') as queryText:
+            self.sql = queryText.read()
+        self.nombres = nombresParametros(self.sql)
+        # Armamos la versión sin búsqueda salteando las líneas entre
+        # las marcas.
+        lineas = []
+        enBusqueda = False
+        for linea in self.sql.splitlines():
+            if linea.strip() == INICIO_BUSQUEDA:
+                enBusqueda = True
+            elif linea.strip() == FIN_BUSQUEDA:
+                enBusqueda = False
+            elif not enBusqueda:
+                lineas.append(linea)
+        self.sqlSinBusqueda = "\n".join(lineas)
+
+    def preparar(self, busqueda: str | None = None,
+                 filtrosExtra: list | tuple | None = None,
+                 desde: datetime.date | None = None,
+                 hasta: datetime.date | None = None,
+                 cursor: tuple | None = None,
+                 limite: int | None = None) -> tuple:
+        """Este método devuelve el código sql y los parámetros para
+        ejecutar la consulta.
+
+        Los filtros extra vacíos se reemplazan por '%%', que coincide
+        con todo, igual que las fechas que no se pasan. Si la búsqueda
+        no tiene ninguna palabra, se usa la versión de la consulta sin
+        búsqueda.
+
+        Parámetros
+        ----------
+            busqueda: str | None = None
+                El texto ingresado en la barra de búsqueda.
+                Default: None.
+
+            filtrosExtra: list | tuple | None = None
+                Los filtros extra de la consulta.
+                Default: None.
+
+            desde: datetime.date | None = None
+                La fecha (o fecha y hora) desde la que se obtienen los
+                datos, incluida.
+                Default: None.
+
+            hasta: datetime.date | None = None
+                La fecha (o fecha y hora) hasta la que se obtienen los
+                datos, incluida.
+                Default: None.
+
+            cursor: tuple | None = None
+                La fecha y el id de la última fila de la página
+                anterior. Si se pasa None, se obtiene la primera
+                página.
+                Default: None.
+
+            limite: int | None = None
+                La cantidad máxima de filas. Si se pasa None, no hay
+                límite.
+                Default: None.
+
+        Devuelve
+        --------
+            tuple: el código sql y el diccionario de parámetros.
+        """
+        # Los filtros que no se pasaron también coinciden con todo.
+        parametros = {nombre: '%%' for nombre in self.nombres
+                      if nombre.startswith("filtro")}
+        for numFiltro, filtroExtra in enumerate(filtrosExtra or (), 1):
+            parametros[f"filtro{numFiltro}"] = (
+                filtroExtra if filtroExtra else '%%')
+        if "desde" in self.nombres:
+            parametros["desde"] = (
+                FECHA_MINIMA if desde is None else textoFecha(desde))
+        if "hasta" in self.nombres:
+            parametros["hasta"] = (
+                FECHA_MAXIMA if hasta is None else textoFecha(hasta, True))
+        if "cursorFecha" in self.nombres:
+            # Sin cursor, la primera página empieza después de todas
+            # las fechas.
+            parametros["cursorFecha"], parametros["cursorId"] = (
+                cursor if cursor is not None else (FECHA_MAXIMA, 0))
+        if "limite" in self.nombres:
+            parametros["limite"] = -1 if limite is None else limite
+        fts = expresionBusqueda(busqueda)
+        if fts is None:
+            return self.sqlSinBusqueda, parametros
+        texto = str(busqueda).strip()
+        parametros["busqueda"] = f"%{busqueda}%"
+        parametros["fts"] = fts
+        parametros["numero"] = int(texto) if texto.isdigit() else None
+        return self.sql, parametros
+
+
+class RegistroConsultas():
+    """Esta clase carga todas las consultas sql de una carpeta (y sus
+    subcarpetas) y las entrega listas para ejecutar.
+
+    Las consultas se identifican por su ruta relativa a la carpeta,
+    sin la extensión y separada con "/" (por ejemplo, "stock" o
+    "merge/alumnos").
+
+    Métodos
+    -------
+        __init__(self, carpeta: str, recargar: bool | None = None):
+            El constructor, carga las consultas de la carpeta.
+
+        cargar(self):
+            Lee todas las consultas de la carpeta.
+
+        obtener(self, nombre: str) -> Consulta:
+            Devuelve una consulta del registro.
+    """
+    def __init__(self, carpeta: str, recargar: bool | None = None):
+        """El constructor, carga las consultas de la carpeta.
+
+        Parámetros
+        ----------
+            carpeta: str
+                La carpeta donde están los archivos sql.
+
+            recargar: bool | None = None
+                Si es True, las consultas cuyo archivo se modificó se
+                vuelven a leer al pedirlas. Si es None, se usa la
+                variable de entorno BLUSTOCK_RECARGAR_SQL.
+                Default: None.
+        """
+        self.carpeta = carpeta
+        if recargar is None:
+            recargar = os.environ.get(VARIABLE_RECARGA) == "1"
+        self.recargar = recargar
+        self.consultas = {}
+        self.cargar()
+
+    def _clave(self, nombre: str) -> str:
+        """Normaliza el nombre de una consulta, así "resumen\\baja" y
+        "resumen/baja" son la misma clave."""
+        return nombre.replace("\\", "/").replace(os.sep, "/")
+
+    def cargar(self):
+        """Este método lee todas las consultas de la carpeta."""
+        consultas = {}
+        for raiz, _, archivos in os.walk(self.carpeta):
+            for archivo in archivos:
+                if not archivo.endswith(".sql"):
+                    continue
+                ruta = os.path.join(raiz, archivo)
+                nombre = os.path.relpath(ruta, self.carpeta)[:-4]
+                consultas[self._clave(nombre)] = Consulta(ruta)
+        self.consultas = consultas
+
+    def obtener(self, nombre: str) -> Consulta:
+        """Este método devuelve una consulta del registro.
+
+        Parámetros
+        ----------
+            nombre: str
+                El nombre de la consulta, por ejemplo "stock" o
+                "merge/alumnos".
+
+        Devuelve
+        --------
+            Consulta: la consulta pedida.
+        """
+        clave = self._clave(nombre)
+        consulta = self.consultas.get(clave)
+        if consulta is None:
+            if not self.recargar:
+                raise KeyError(f"No existe la consulta {nombre}")
+            # En modo recarga puede tratarse de un archivo nuevo.
+            self.cargar()
+            consulta = self.consultas[clave]
+        elif self.recargar:
+            try:
+                modificado = os.path.getmtime(consulta.ruta)
+            except OSError:
+                modificado = consulta.modificado
+            if modificado != consulta.modificado:
+                consulta = Consulta(consulta.ruta)
+                self.consultas[clave] = consulta
+        return consulta
+
+
+consultas = RegistroConsultas(f"dal{os.sep}queries")
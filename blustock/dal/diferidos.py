@@ -0,0 +1,95 @@
+"""Este módulo contiene los módulos pesados que la app importa recién
+cuando los usa.
+
+Pandas, numpy, openpyxl y pyarrow tardan cientos de milisegundos en
+importarse y ocupan decenas de MB, pero solo se usan para cargar
+planillas y exportar listados. Si se importaran al iniciar la app,
+demorarían el inicio de sesión cada vez, aunque no se usen. En su
+lugar, los módulos que los usan importan de acá un ModuloDiferido, que
+importa el módulo real la primera vez que se le pide un atributo.
+
+Como las anotaciones de tipos se evalúan al definir las funciones, en
+los módulos que usan estos objetos van entre comillas (por ejemplo,
+"pd.DataFrame"), para que no los importen.
+
+Clases
+------
+    ModuloDiferido():
+        Importa un módulo la primera vez que se usa.
+
+Funciones
+---------
+    instalado(nombre: str) -> bool:
+        Devuelve si un módulo está instalado, sin importarlo.
+
+Variables
+---------
+    pd: ModuloDiferido
+        pandas.
+
+    openpyxl: ModuloDiferido
+        openpyxl.
+
+    pa: ModuloDiferido
+        pyarrow. Es opcional: solo se usa si instalado("pyarrow").
+
+    pq: ModuloDiferido
+        pyarrow.parquet. Es opcional, igual que pyarrow.
+"""
+import importlib
+import importlib.util
+import threading
+
+
+class ModuloDiferido():
+    """Esta clase importa un módulo la primera vez que se le pide un
+    atributo, y desde entonces le pasa todos los pedidos.
+
+    Atributos
+    ---------
+        nombre: str
+            El nombre del módulo.
+    """
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+        self._modulo = None
+        # Los hilos de planillas y de exportación también los usan.
+        self._candado = threading.Lock()
+
+    def __getattr__(self, atributo: str):
+        # Solo se llama con los atributos que no son del objeto, es
+        # decir, con los del módulo.
+        with self._candado:
+            if self._modulo is None:
+                self._modulo = importlib.import_module(self.nombre)
+        return getattr(self._modulo, atributo)
+
+    def __repr__(self) -> str:
+        estado = "importado" if self._modulo is not None else "diferido"
+        return f"<módulo {estado} '{self.nombre}'>"
+
+
+def instalado(nombre: str) -> bool:
+    """Esta función devuelve si un módulo está instalado, sin
+    importarlo.
+
+    Parámetros
+    ----------
+        nombre: str
+            El nombre del módulo.
+
+    Devuelve
+    --------
+        bool: si el módulo está instalado.
+    """
+    try:
+        return importlib.util.find_spec(nombre) is not None
+    except ModuleNotFoundError:
+        # Pasa si no está instalado el paquete de un submódulo.
+        return False
+
+
+pd = ModuloDiferido("pandas")
+openpyxl = ModuloDiferido("openpyxl")
+pa = ModuloDiferido("pyarrow")
+pq = ModuloDiferido("pyarrow.parquet")
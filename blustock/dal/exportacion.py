@@ -0,0 +1,358 @@
+"""Este módulo contiene la exportación de los listados a archivos.
+
+Las filas se leen de a bloques de la base de datos, en un hilo aparte y
+con su propia conexión, y cada bloque se escribe directamente en el
+archivo: una hoja de cálculo (con openpyxl en modo de solo escritura),
+un csv o, si está instalado pyarrow, un archivo parquet. Así un listado
+grande nunca está entero en memoria, la interfaz sigue respondiendo y
+la exportación se puede cancelar.
+
+Clases
+------
+    EscritorXlsx():
+        Escribe las filas en una hoja de cálculo.
+
+    EscritorCsv():
+        Escribe las filas en un csv.
+
+    EscritorParquet():
+        Escribe las filas en un archivo parquet.
+
+    TrabajadorExportacion(QtCore.QObject):
+        Exporta un listado en el hilo de exportación.
+
+    Exportacion(QtCore.QObject):
+        Exporta un listado sin bloquear la interfaz.
+
+Funciones
+---------
+    formatosDisponibles() -> dict:
+        Devuelve los formatos a los que se puede exportar.
+
+Variables
+---------
+    TAMANO_BLOQUE: int
+        La cantidad de filas que se leen y se escriben juntas.
+
+    LISTADOS: dict
+        Las columnas que se exportan de cada listado.
+
+    FORMATOS: dict
+        La descripción y la clase escritora de cada formato.
+"""
+import csv
+import os
+import threading
+from datetime import date
+from PyQt6 import QtCore
+from db.bdd import bdd
+from dal.consultas import consultas
+# Openpyxl y pyarrow se importan recién al exportar el primer listado.
+from dal.diferidos import openpyxl, pa, pq, instalado
+
+TAMANO_BLOQUE = 1000
+
+# Por cada listado, los títulos de las columnas que se exportan y la
+# posición de la primera en las filas de la consulta. Las columnas que
+# siguen a las exportadas (como las que usa la paginación) se omiten.
+LISTADOS = {
+    "stock": (("Elemento", "Cant. en Condiciones", "Cant. en Reparación",
+               "Cant. de Baja", "Cant. Prestadas", "Total", "Grupo",
+               "Subgrupo", "Ubicación"), 1),
+    "movimientos": (("ID", "Tipo", "Elemento", "Ubicación", "Estado",
+                     "Cantidad", "Motivo", "Persona", "Fecha y Hora",
+                     "Turno", "Pañolero", "Profesor a cargo del turno"), 0),
+    "deudas": (("Herramienta", "Cantidad", "Persona", "Fecha y Hora",
+                "Movimiento", "Turno", "Pañolero"), 0),
+    "turnos": (("ID", "Alumno", "Fecha y hora de ingreso",
+                "Hora de egreso", "Profesor Responsable del Ingreso",
+                "Profesor Responsable del Egreso", "Ubicación"), 0),
+    "historial": (("Usuario", "Fecha y hora", "Gestión", "Tipo",
+                   "Registro", "Descripcion"), 0),
+    "reparaciones": (("ID", "Herramienta", "Cantidad", "Usuario",
+                      "Destino", "Fecha de Envío", "Fecha de Regreso"), 0),
+}
+
+
+class EscritorXlsx():
+    """Esta clase escribe las filas en una hoja de cálculo. El libro se
+    crea en modo de solo escritura, que guarda las filas a medida que
+    llegan en lugar de armar la hoja entera en memoria.
+
+    Métodos
+    -------
+        escribir(self, filas: list):
+            Escribe un bloque de filas.
+
+        cerrar(self):
+            Termina y guarda el archivo.
+    """
+    def __init__(self, ruta: str, encabezados: tuple):
+        self.ruta = ruta
+        self.libro = openpyxl.Workbook(write_only=True)
+        self.hoja = self.libro.create_sheet()
+        self.hoja.append(encabezados)
+
+    def escribir(self, filas: list):
+        """Este método escribe un bloque de filas."""
+        for fila in filas:
+            self.hoja.append(fila)
+
+    def cerrar(self):
+        """Este método termina y guarda el archivo."""
+        self.libro.save(self.ruta)
+
+
+class EscritorCsv():
+    """Esta clase escribe las filas en un csv. Se usa utf-8 con BOM para
+    que Excel reconozca los acentos.
+
+    Métodos
+    -------
+        escribir(self, filas: list):
+            Escribe un bloque de filas.
+
+        cerrar(self):
+            Cierra el archivo.
+    """
+    def __init__(self, ruta: str, encabezados: tuple):
+        self.archivo = open(ruta, "w", newline="", encoding="utf-8-sig")
+        self.escritor = csv.writer(self.archivo)
+        self.escritor.writerow(encabezados)
+
+    def escribir(self, filas: list):
+        """Este método escribe un bloque de filas."""
+        self.escritor.writerows(filas)
+
+    def cerrar(self):
+        """Este método cierra el archivo."""
+        self.archivo.close()
+
+
+class EscritorParquet():
+    """Esta clase escribe las filas en un archivo parquet, un grupo de
+    filas por bloque. Los tipos de las columnas salen del primer
+    bloque; las columnas que en él están vacías se guardan como texto.
+
+    Métodos
+    -------
+        escribir(self, filas: list):
+            Escribe un bloque de filas.
+
+        cerrar(self):
+            Cierra el archivo.
+    """
+    def __init__(self, ruta: str, encabezados: tuple):
+        self.ruta = ruta
+        self.encabezados = list(encabezados)
+        self.escritor = None
+
+    def escribir(self, filas: list):
+        """Este método escribe un bloque de filas."""
+        columnas = [pa.array(columna) for columna in zip(*filas)]
+        if self.escritor is None:
+            esquema = pa.schema(
+                [(nombre, pa.string() if columna.type == pa.null()
+                  else columna.type)
+                 for nombre, columna in zip(self.encabezados, columnas)])
+            self.escritor = pq.ParquetWriter(self.ruta, esquema)
+        tabla = pa.Table.from_arrays(columnas, names=self.encabezados)
+        self.escritor.write_table(tabla.cast(self.escritor.schema))
+
+    def cerrar(self):
+        """Este método cierra el archivo. Si no hubo filas, lo crea
+        vacío, con todas las columnas de texto."""
+        if self.escritor is None:
+            esquema = pa.schema([(nombre, pa.string())
+                                 for nombre in self.encabezados])
+            self.escritor = pq.ParquetWriter(self.ruta, esquema)
+        self.escritor.close()
+
+
+FORMATOS = {
+    "xlsx": ("Hoja de cálculo (*.xlsx)", EscritorXlsx),
+    "csv": ("CSV (*.csv)", EscritorCsv),
+    "parquet": ("Parquet (*.parquet)", EscritorParquet),
+}
+
+
+def formatosDisponibles() -> dict:
+    """Esta función devuelve los formatos a los que se puede exportar.
+    Parquet solo está disponible si está instalado pyarrow.
+
+    Devuelve
+    --------
+        dict: la descripción de cada formato, según su extensión.
+    """
+    return {extension: descripcion
+            for extension, (descripcion, _) in FORMATOS.items()
+            if extension != "parquet" or instalado("pyarrow")}
+
+
+class TrabajadorExportacion(QtCore.QObject):
+    """Esta clase exporta un listado en el hilo de exportación, con su
+    propia conexión de solo lectura.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        sql: str
+            La consulta del listado.
+
+        parametros: dict
+            Los parámetros de la consulta.
+
+        listado: str
+            El nombre del listado, una clave de LISTADOS.
+
+        ruta: str
+            La ruta del archivo.
+
+        formato: str
+            La extensión del formato, una clave de FORMATOS.
+
+        cancelada: threading.Event
+            Se activa cuando el usuario cancela la exportación.
+
+    Señales
+    -------
+        total(int):
+            Se emite con la cantidad de filas a exportar.
+
+        progreso(int):
+            Se emite con la cantidad de filas exportadas.
+
+        terminado(bool, str):
+            Se emite al terminar, con si se exportó el listado y, si
+            no, el motivo.
+    """
+    total = QtCore.pyqtSignal(int)
+    progreso = QtCore.pyqtSignal(int)
+    terminado = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, sql: str, parametros: dict, listado: str, ruta: str,
+                 formato: str):
+        super().__init__()
+        self.sql = sql
+        self.parametros = parametros
+        self.listado = listado
+        self.ruta = ruta
+        self.formato = formato
+        self.cancelada = threading.Event()
+
+    @QtCore.pyqtSlot()
+    def exportar(self):
+        """Este método exporta el listado."""
+        encabezados, primera = LISTADOS[self.listado]
+        ultima = primera + len(encabezados)
+        try:
+            # El total y las filas se leen en la misma transacción, así
+            # coinciden aunque la app cambie los datos mientras tanto.
+            with bdd.lectura() as cur:
+                self.total.emit(cur.execute(
+                    f"SELECT count(*) FROM ({self.sql})",
+                    self.parametros).fetchone()[0])
+                escritor = FORMATOS[self.formato][1](self.ruta, encabezados)
+                cur.execute(self.sql, self.parametros)
+                exportadas = 0
+                while filas := cur.fetchmany(TAMANO_BLOQUE):
+                    if self.cancelada.is_set():
+                        break
+                    escritor.escribir(
+                        [fila[primera:ultima] for fila in filas])
+                    exportadas += len(filas)
+                    self.progreso.emit(exportadas)
+                escritor.cerrar()
+        except PermissionError:
+            # Suele ocurrir porque se quiere reemplazar un archivo que
+            # está siendo usado por otra app.
+            return self.terminado.emit(False, "Ocurrió un error al exportar la tabla. Esto pudo haber ocurrido porque intentó reemplazar un documento que tenía abierto o estaba siendo usado por otra app. Por favor, verifique que el documento que desea reemplazar esté cerrado y no esté siendo usado por ningún otra app.")
+        except Exception as error:
+            return self.terminado.emit(
+                False, f"Ocurrió un error al exportar la tabla: {error}")
+        finally:
+            bdd.cerrar()
+        if self.cancelada.is_set():
+            # El archivo quedó a medias, así que lo borramos.
+            os.remove(self.ruta)
+            return self.terminado.emit(False, "Se canceló la exportación.")
+        self.terminado.emit(True, "")
+
+
+class Exportacion(QtCore.QObject):
+    """Esta clase exporta un listado en un hilo aparte, sin bloquear la
+    interfaz. El listado se exporta con los mismos filtros que se usan
+    para mostrarlo.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        hilo: QtCore.QThread
+            El hilo de exportación.
+
+        trabajador: TrabajadorExportacion
+            El objeto que exporta el listado en el hilo.
+
+    Señales
+    -------
+        total(int):
+            Se emite con la cantidad de filas a exportar.
+
+        progreso(int):
+            Se emite con la cantidad de filas exportadas.
+
+        terminado(bool, str):
+            Se emite al terminar, con si se exportó el listado y, si
+            no, el motivo.
+
+    Métodos
+    -------
+        iniciar(self):
+            Empieza la exportación.
+
+        cancelar(self):
+            Cancela la exportación y borra el archivo.
+    """
+    total = QtCore.pyqtSignal(int)
+    progreso = QtCore.pyqtSignal(int)
+    terminado = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, listado: str, ruta: str, formato: str,
+                 busqueda: str | None = None,
+                 filtros: list | tuple | None = None,
+                 desde: date | None = None, hasta: date | None = None,
+                 parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        # La consulta se prepara acá, igual que en dal.asincrono, así
+        # el hilo de exportación no comparte el registro de consultas.
+        sql, parametros = consultas.obtener(listado).preparar(
+            busqueda, filtros, desde, hasta)
+        self.hilo = QtCore.QThread()
+        self.hilo.setObjectName("hiloExportacion")
+        # Se le saca el punto y coma para poder contar sus filas con
+        # una subconsulta.
+        sql = sql.strip().rstrip(";")
+        self.trabajador = TrabajadorExportacion(sql, parametros, listado,
+                                                ruta, formato)
+        self.trabajador.moveToThread(self.hilo)
+        self.hilo.started.connect(self.trabajador.exportar)
+        self.trabajador.total.connect(self.total)
+        self.trabajador.progreso.connect(self.progreso)
+        self.trabajador.terminado.connect(self._terminar)
+
+    def iniciar(self):
+        """Este método empieza la exportación."""
+        self.hilo.start()
+
+    def cancelar(self):
+        """Este método cancela la exportación. Se detiene antes del
+        siguiente bloque y borra el archivo."""
+        self.trabajador.cancelada.set()
+
+    def _terminar(self, exportado: bool, mensaje: str):
+        """Detiene el hilo de exportación y avisa que terminó."""
+        self.hilo.quit()
+        self.hilo.wait()
+        self.terminado.emit(exportado, mensaje)
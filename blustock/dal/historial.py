@@ -0,0 +1,161 @@
+"""Este módulo contiene las funciones que arman los registros del
+historial.
+
+Los datos viejos y nuevos de cada cambio se guardan como listas JSON,
+y la descripción que se muestra en la pantalla historial se arma una
+sola vez, al guardar el cambio, y se guarda en la columna descripcion.
+Así, abrir el historial es una sola consulta, sin volver a armar cada
+descripción.
+
+Funciones
+---------
+    textoDatos(datos: list | tuple | None) -> str | None:
+        Convierte una lista de datos en el texto JSON que se guarda en
+        el historial.
+
+    describirCambio(gestion: str, tipo: str, fila,
+                    datosViejos: list | tuple | None = None,
+                    datosNuevos: list | tuple | None = None) -> str:
+        Arma la descripción de un cambio para mostrar en el historial.
+
+Variables
+---------
+    PLANTILLAS: dict
+        La plantilla de la descripción de cada gestión y tipo de
+        cambio.
+"""
+import json
+from textwrap import dedent
+
+# Cada plantilla recibe la fila modificada ({fila}) y las listas de
+# datos viejos ({viejos[n]}) y nuevos ({nuevos[n]}), en el orden en que
+# las guarda cada gestión.
+PLANTILLAS = {
+    ("Stock", "Inserción"): dedent("""\
+        Se insertó la herramienta {fila}, con los siguientes datos:
+                - Cantidad en condiciones: {nuevos[0]}
+                - Cantidad de baja: {nuevos[1]}
+                - Grupo: {nuevos[2]}
+                - Subgrupo: {nuevos[3]}
+                - Ubicación: {nuevos[4]}"""),
+    ("Stock", "Edición"): dedent("""\
+        Se editó la herramienta {fila}, y se reemplazaron los siguientes datos:
+                - Descripción: {fila}, por {nuevos[0]}
+                - Cantidad en condiciones: {viejos[0]}, por {nuevos[1]}
+                - Cantidad de baja: {viejos[1]}, por {nuevos[2]}
+                - Grupo: {viejos[2]}, por {nuevos[3]}
+                - Subgrupo: {viejos[3]}, por {nuevos[4]}
+                - Ubicación: {viejos[4]}, por {nuevos[5]}"""),
+    ("Stock", "Eliminación"): dedent("""\
+        Se eliminó la herramienta {fila}, que tenía los siguientes datos:
+                - Cantidad en condiciones: {viejos[0]}
+                - Cantidad en reparacion: {viejos[1]}
+                - Cantidad de baja: {viejos[2]}
+                - Cantidad prestadas: {viejos[3]}
+                - Grupo: {viejos[4]}
+                - Subgrupo: {viejos[5]}
+                - Ubicación: {viejos[6]}"""),
+    ("Subgrupos", "Inserción"):
+        "Se insertó el subgrupo {fila}, perteneciendo al grupo {nuevos[0]}.",
+    ("Subgrupos", "Edición"): dedent("""\
+        Se editó el subgrupo {fila}, y se reemplazaron los siguientes datos:
+                - Subgrupo: {fila}, por {nuevos[0]}
+                - Grupo: {viejos[0]}, por {nuevos[1]}"""),
+    ("Subgrupos", "Eliminación"):
+        "Se eliminó el subgrupo {fila}, que pertenecía al grupo {viejos[0]}.",
+    ("Grupos", "Inserción"): "Se insertó el grupo {fila}.",
+    ("Grupos", "Edición"):
+        "Se editó el grupo {fila}, y se reemplazó por el grupo {nuevos[0]}.",
+    ("Grupos", "Eliminación"): "Se eliminó el grupo {fila}.",
+    ("Alumnos", "Inserción"): dedent("""\
+        Se insertó el alumno {fila}, con los siguientes datos:
+                - Curso: {nuevos[0]}
+                - DNI: {nuevos[1]}"""),
+    ("Alumnos", "Edición"): dedent("""\
+        Se editó el alumno {fila}, y se reemplazaron los siguientes datos:
+                - Nombre y apellido: {fila}, por {nuevos[0]}
+                - Curso: {viejos[0]}, por {nuevos[1]}
+                - DNI: {viejos[1]}, por {nuevos[2]}"""),
+    ("Alumnos", "Eliminación"):
+        "Se eliminó el alumno {fila}, que pertenecía al curso {viejos[0]} y tenía el dni {viejos[1]}.",
+    ("Personal", "Inserción"): dedent("""\
+        Se insertó el personal {fila}, con los siguientes datos:
+                - Clase: {nuevos[0]}
+                - DNI: {nuevos[1]}"""),
+    ("Personal", "Edición"): dedent("""\
+        Se editó el personal {fila}, y se reemplazaron los siguientes datos:
+                - Nombre y apellido: {fila}, por {nuevos[0]}
+                - Clase: {viejos[0]}, por {nuevos[1]}
+                - DNI: {viejos[1]}, por {nuevos[2]}"""),
+    ("Personal", "Eliminación"):
+        "Se eliminó el personal {fila}, cuya clase era {viejos[0]} y tenía el dni {viejos[1]}.",
+    ("Clases", "Inserción"):
+        "Se insertó la clase {fila}, perteneciendo a la categoría {nuevos[0]}.",
+    ("Clases", "Edición"): dedent("""\
+        Se editó la clase {fila}, y se reemplazaron los siguientes datos:
+                - Clase: {fila}, por {nuevos[0]}
+                - Categoría: {viejos[0]}, por {nuevos[1]}"""),
+    ("Clases", "Eliminación"):
+        "Se eliminó la clase {fila}, que pertenecía a la categoría {viejos[0]}.",
+    ("Ubicaciones", "Inserción"): "Se insertó la ubicación {fila}.",
+    ("Ubicaciones", "Edición"):
+        "Se editó la ubicación {fila}, y se reemplazó por la ubicación {nuevos[0]}.",
+    ("Ubicaciones", "Eliminación"): "Se eliminó la ubicación {fila}.",
+}
+
+
+def textoDatos(datos: list | tuple | None) -> str | None:
+    """Esta función convierte una lista de datos en el texto JSON que
+    se guarda en el historial.
+
+    Parámetros
+    ----------
+        datos: list | tuple | None
+            Los datos del cambio.
+
+    Devuelve
+    --------
+        str | None: la lista en JSON, o None si no hay datos.
+    """
+    if not datos:
+        return None
+    return json.dumps(list(datos), ensure_ascii=False, default=str)
+
+
+def describirCambio(gestion: str, tipo: str, fila,
+                    datosViejos: list | tuple | None = None,
+                    datosNuevos: list | tuple | None = None) -> str:
+    """Esta función arma la descripción de un cambio para mostrar en
+    la pantalla historial.
+
+    Parámetros
+    ----------
+        gestion: str
+            La gestión donde se realizó el cambio.
+
+        tipo: str
+            El tipo de cambio.
+
+        fila
+            La fila que se modificó, como se guarda en el historial.
+
+        datosViejos: list | tuple | None = None
+            Los datos que fueron eliminados o reemplazados.
+            Default: None.
+
+        datosNuevos: list | tuple | None = None
+            Los datos que se añadieron o reemplazaron otros datos.
+            Default: None.
+
+    Devuelve
+    --------
+        str: la descripción del cambio.
+    """
+    plantilla = PLANTILLAS.get((gestion, tipo))
+    try:
+        return plantilla.format(fila=fila, viejos=datosViejos or [],
+                                nuevos=datosNuevos or [])
+    # Si no hay plantilla o faltan datos, se describe el cambio sin
+    # sus datos.
+    except (AttributeError, IndexError):
+        return f"{tipo} en {gestion}: {fila}."
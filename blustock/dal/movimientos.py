@@ -0,0 +1,402 @@
+"""Este módulo contiene el motor que registra los movimientos de
+herramientas.
+
+Cada movimiento se aplica entero en una sola transacción: el registro
+del movimiento, los cambios en las cantidades del stock y los registros
+de deudas y reparaciones. Si algún paso falla (por ejemplo, si no hay
+suficientes herramientas), no se guarda nada.
+
+Las cantidades se descuentan con un único UPDATE condicional
+("... WHERE cant_x >= ?"): si no hay suficientes herramientas, el
+UPDATE no modifica ninguna fila y el movimiento se cancela, sin leer la
+cantidad antes.
+
+Los lotes de movimientos (por ejemplo, los retiros del comienzo de una
+clase) también se guardan en una sola transacción: se validan todos
+contra el stock con una consulta y se insertan con executemany.
+
+Clases
+------
+    ErrorMovimiento(Exception):
+        Se lanza cuando un movimiento no se puede realizar.
+
+    MotorMovimientos():
+        Registra los movimientos de herramientas.
+
+Funciones
+---------
+    columnaEstado(estado: str) -> str:
+        Devuelve la columna de stock con la cantidad de un estado.
+
+Variables
+---------
+    INGRESO, ENVIO_REPARACION, RETIRO, DEVOLUCION, BAJA,
+    REGRESO_REPARACION: int
+        Los ids de los tipos de movimiento.
+
+    COLUMNAS_STOCK: tuple
+        Las columnas de cantidades de la tabla stock.
+
+    ESTADO: str
+        Representa, en EFECTOS, la columna del estado del movimiento.
+
+    EFECTOS: dict
+        La columna de la que se resta y la columna a la que se suma en
+        cada tipo de movimiento.
+
+    CON_REGISTRO: set
+        Los tipos de movimiento que se guardan en la tabla movimientos.
+
+    INSERTAR_MOVIMIENTO, INSERTAR_REPARACION: str
+        Las consultas que insertan un movimiento y una reparación.
+
+    motorMovimientos: MotorMovimientos
+        El motor que usa la aplicación.
+"""
+from unidecode import unidecode
+from db.bdd import bdd
+from db.fechas import ahora
+from dal.catalogos import catalogos
+from dal.vocabularios import marcarCambio
+
+INGRESO = 1
+ENVIO_REPARACION = 2
+RETIRO = 3
+DEVOLUCION = 4
+BAJA = 5
+REGRESO_REPARACION = 6
+
+COLUMNAS_STOCK = ("cant_condiciones", "cant_reparacion", "cant_baja",
+                  "cant_prest")
+
+# La columna de stock del estado elegido en el movimiento.
+ESTADO = "estado"
+
+# De qué columna se restan y a qué columna se suman las herramientas en
+# cada tipo de movimiento.
+EFECTOS = {
+    INGRESO: (None, ESTADO),
+    ENVIO_REPARACION: (ESTADO, "cant_reparacion"),
+    RETIRO: (ESTADO, "cant_prest"),
+    DEVOLUCION: ("cant_prest", ESTADO),
+    BAJA: (ESTADO, "cant_baja"),
+    REGRESO_REPARACION: ("cant_reparacion", ESTADO),
+}
+
+# Los tipos de movimiento que quedan registrados en la tabla
+# movimientos.
+CON_REGISTRO = {INGRESO, RETIRO, BAJA}
+
+INSERTAR_MOVIMIENTO = """INSERT INTO movimientos(id_turno, id_elem,
+    id_estado, cant, id_persona, fecha_hora, id_tipo, descripcion)
+    VALUES(?, ?, ?, ?, ?, ?, ?, ?)"""
+
+INSERTAR_REPARACION = """INSERT INTO reparaciones(id_herramienta,
+    cantidad, id_usuario, destino, fecha_envio)
+    VALUES(?, ?, ?, ?, ?)"""
+
+
+class ErrorMovimiento(Exception):
+    """Esta excepción se lanza cuando un movimiento no se puede
+    realizar. Su mensaje es el que se le muestra al usuario."""
+
+
+def columnaEstado(estado: str) -> str:
+    """Esta función devuelve la columna de la tabla stock que guarda la
+    cantidad de herramientas en un estado. La columna se arma con la
+    última palabra del estado (por ejemplo, "En Reparación" ->
+    "cant_reparacion").
+
+    Parámetros
+    ----------
+        estado: str
+            La descripción del estado, o el nombre corto de la
+            columna ("prest", "baja"...).
+
+    Devuelve
+    --------
+        str: el nombre de la columna.
+    """
+    columna = "cant_" + unidecode(estado.split(" ")[-1]).lower()
+    # El nombre de la columna va dentro del sql, así que solo se
+    # aceptan las columnas que existen.
+    if columna not in COLUMNAS_STOCK:
+        raise ErrorMovimiento(f"El estado {estado} no es válido.")
+    return columna
+
+
+class MotorMovimientos():
+    """Esta clase registra los movimientos de herramientas, cada uno en
+    una sola transacción y con un solo commit.
+
+    Métodos
+    -------
+        registrar(self, tipo: str, herramienta: int, estado: str,
+                  cant: int, persona: int | None, usuario: int,
+                  descripcion: str = ""):
+            Registra un movimiento.
+
+        registrarLote(self, lineas: list, usuario: int) -> list:
+            Registra un lote de movimientos en una sola transacción.
+    """
+    def _sumar(self, cur, herramienta: int, columna: str, cant: int):
+        """Suma una cantidad a una columna de stock."""
+        cur.execute(
+            f"""UPDATE stock SET {columna} = coalesce({columna}, 0) + ?
+            WHERE id = ?""", (cant, herramienta))
+
+    def _restar(self, cur, herramienta: int, columna: str, cant: int):
+        """Resta una cantidad a una columna de stock. Si no hay
+        suficientes herramientas, cancela el movimiento."""
+        cur.execute(
+            f"""UPDATE stock SET {columna} = {columna} - ?
+            WHERE id = ? AND {columna} >= ?""", (cant, herramienta, cant))
+        if cur.rowcount == 0:
+            raise ErrorMovimiento(
+                "Movimiento cancelado no hay suficientes herramientas "
+                "para realizar el movimiento.")
+
+    def _preparar(self, tipo: str, estado: str) -> tuple:
+        """Devuelve el id del tipo, el id del estado y las columnas de
+        stock de las que se restan y a las que se suman las
+        herramientas."""
+        idTipo = catalogos.tiposMov.id(tipo)
+        filaEstado = catalogos.estados.fila(estado)
+        if idTipo not in EFECTOS or filaEstado is None:
+            raise ErrorMovimiento(
+                "El tipo de movimiento o el estado no son válidos.")
+        idEstado, descEstado = filaEstado
+        columna = columnaEstado(descEstado)
+        resta, suma = (columna if efecto == ESTADO else efecto
+                       for efecto in EFECTOS[idTipo])
+        return idTipo, idEstado, resta, suma
+
+    def registrar(self, tipo: str, herramienta: int, estado: str,
+                  cant: int, persona: int | None, usuario: int,
+                  descripcion: str = ""):
+        """Este método registra un movimiento y actualiza el stock, las
+        deudas y las reparaciones, todo en una transacción.
+
+        Parámetros
+        ----------
+            tipo: str
+                La descripción del tipo de movimiento.
+
+            herramienta: int
+                El id de la herramienta.
+
+            estado: str
+                La descripción del estado de las herramientas.
+
+            cant: int
+                La cantidad de herramientas.
+
+            persona: int | None
+                El id de la persona que hace el movimiento.
+
+            usuario: int
+                El id del usuario que registra el movimiento.
+
+            descripcion: str = ""
+                El destino de la reparación o el motivo de la baja.
+                Default: "".
+
+        Lanza
+        -----
+            ErrorMovimiento: si el movimiento no se puede realizar. En
+            ese caso no se guarda nada.
+        """
+        idTipo, idEstado, resta, suma = self._preparar(tipo, estado)
+        fecha = ahora()
+
+        with bdd.transaccion() as cur:
+            turno = cur.execute(
+                "SELECT id FROM turnos WHERE fecha_egr IS NULL").fetchone()
+            turno = turno[0] if turno else None
+
+            # Las devoluciones y los regresos de reparación cierran una
+            # deuda o una reparación que tiene que existir.
+            if idTipo == DEVOLUCION:
+                referencia = cur.execute(
+                    """SELECT d.id_mov FROM deudas d
+                    JOIN movimientos m ON d.id_mov = m.id
+                    WHERE m.id_elem = ? AND m.id_persona = ?
+                    ORDER BY d.id_mov""", (herramienta, persona)).fetchone()
+            elif idTipo == REGRESO_REPARACION:
+                referencia = cur.execute(
+                    """SELECT id FROM reparaciones
+                    WHERE id_herramienta = ? AND cantidad = ?
+                    AND fecha_regreso IS NULL
+                    ORDER BY id""", (herramienta, cant)).fetchone()
+            else:
+                referencia = ()
+            if referencia is None:
+                raise ErrorMovimiento("No se ha encontrado el movimiento")
+
+            if idTipo in CON_REGISTRO:
+                cur.execute(INSERTAR_MOVIMIENTO,
+                            (turno, herramienta, idEstado, cant, persona,
+                             fecha, idTipo, descripcion))
+                idMov = cur.lastrowid
+            if resta is not None:
+                self._restar(cur, herramienta, resta, cant)
+            self._sumar(cur, herramienta, suma, cant)
+
+            if idTipo == ENVIO_REPARACION:
+                cur.execute(INSERTAR_REPARACION,
+                            (herramienta, cant, usuario, descripcion,
+                             fecha[:10]))
+            elif idTipo == RETIRO:
+                cur.execute("INSERT INTO deudas(id_mov, cant) VALUES(?, ?)",
+                            (idMov, cant))
+            elif idTipo == DEVOLUCION:
+                cur.execute("DELETE FROM deudas WHERE id_mov = ?",
+                            referencia)
+            elif idTipo == REGRESO_REPARACION:
+                cur.execute(
+                    "UPDATE reparaciones SET fecha_regreso = ? WHERE id = ?",
+                    (fecha, *referencia))
+        marcarCambio("movimientos", "stock", "deudas", "reparaciones")
+
+    def registrarLote(self, lineas: list, usuario: int) -> list:
+        """Este método registra un lote de movimientos en una sola
+        transacción.
+
+        Las cantidades de todas las herramientas del lote se leen con
+        una sola consulta y cada línea se valida contra lo que dejan
+        las líneas anteriores. Las líneas que no se pueden realizar se
+        saltean y las demás se guardan juntas, con un executemany por
+        tabla. Las devoluciones y los regresos de reparación solo
+        cierran deudas y reparaciones que existían antes del lote.
+
+        Parámetros
+        ----------
+            lineas: list
+                Los movimientos del lote. Cada uno es una tupla con el
+                tipo, el id de la herramienta, el estado, la cantidad,
+                el id de la persona y la descripción, igual que en
+                registrar.
+
+            usuario: int
+                El id del usuario que registra los movimientos.
+
+        Devuelve
+        --------
+            list: el resultado de cada línea, None si se realizó o el
+            mensaje de error si no.
+        """
+        resultados = [None] * len(lineas)
+        preparadas = []
+        for indice, (tipo, herramienta, estado, cant, persona,
+                     descripcion) in enumerate(lineas):
+            try:
+                preparadas.append((indice, *self._preparar(tipo, estado),
+                                   herramienta, cant, persona, descripcion))
+            except ErrorMovimiento as error:
+                resultados[indice] = str(error)
+        if not preparadas:
+            return resultados
+        fecha = ahora()
+        herramientas = sorted({linea[5] for linea in preparadas})
+        marcas = ", ".join("?" * len(herramientas))
+
+        with bdd.transaccion() as cur:
+            turno = cur.execute(
+                "SELECT id FROM turnos WHERE fecha_egr IS NULL").fetchone()
+            turno = turno[0] if turno else None
+
+            # Las cantidades, deudas y reparaciones de todo el lote, en
+            # una consulta cada una. Como la transacción reserva la
+            # escritura, nadie las cambia hasta el commit.
+            disponibles = {}
+            for idd, *cantidades in cur.execute(
+                    f"""SELECT id, {", ".join(COLUMNAS_STOCK)} FROM stock
+                    WHERE id IN ({marcas})""", herramientas):
+                for columna, valor in zip(COLUMNAS_STOCK, cantidades):
+                    disponibles[(idd, columna)] = valor or 0
+            deudas = {}
+            for elem, persona, idMov in cur.execute(
+                    f"""SELECT m.id_elem, m.id_persona, d.id_mov
+                    FROM deudas d JOIN movimientos m ON d.id_mov = m.id
+                    WHERE m.id_elem IN ({marcas})
+                    ORDER BY d.id_mov""", herramientas):
+                deudas.setdefault((elem, persona), []).append(idMov)
+            reparaciones = {}
+            for idd, elem, cantidad in cur.execute(
+                    f"""SELECT id, id_herramienta, cantidad FROM reparaciones
+                    WHERE id_herramienta IN ({marcas})
+                    AND fecha_regreso IS NULL
+                    ORDER BY id""", herramientas):
+                reparaciones.setdefault((elem, cantidad), []).append(idd)
+
+            movimientos, envios, devoluciones, regresos = [], [], [], []
+            cambios = {}
+            for (indice, idTipo, idEstado, resta, suma, herramienta, cant,
+                 persona, descripcion) in preparadas:
+                if (herramienta, suma) not in disponibles:
+                    resultados[indice] = (
+                        "La herramienta no está registrada en el sistema.")
+                    continue
+                if idTipo == DEVOLUCION:
+                    pendientes = deudas.get((herramienta, persona))
+                elif idTipo == REGRESO_REPARACION:
+                    pendientes = reparaciones.get((herramienta, cant))
+                else:
+                    pendientes = [None]
+                if not pendientes:
+                    resultados[indice] = "No se ha encontrado el movimiento"
+                    continue
+                if resta is not None:
+                    if disponibles[(herramienta, resta)] < cant:
+                        resultados[indice] = (
+                            "Movimiento cancelado no hay suficientes "
+                            "herramientas para realizar el movimiento.")
+                        continue
+                    disponibles[(herramienta, resta)] -= cant
+                    cambios[(herramienta, resta)] = cambios.get(
+                        (herramienta, resta), 0) - cant
+                disponibles[(herramienta, suma)] += cant
+                cambios[(herramienta, suma)] = cambios.get(
+                    (herramienta, suma), 0) + cant
+                # Cada deuda o reparación se cierra una sola vez.
+                referencia = pendientes.pop(0)
+
+                if idTipo in CON_REGISTRO:
+                    movimientos.append((turno, herramienta, idEstado, cant,
+                                        persona, fecha, idTipo, descripcion))
+                if idTipo == ENVIO_REPARACION:
+                    envios.append((herramienta, cant, usuario, descripcion,
+                                   fecha[:10]))
+                elif idTipo == DEVOLUCION:
+                    devoluciones.append((referencia,))
+                elif idTipo == REGRESO_REPARACION:
+                    regresos.append((fecha, referencia))
+
+            # Los ids de movimientos son AUTOINCREMENT: los del lote son
+            # los mayores que el último que había.
+            ultimo = cur.execute(
+                "SELECT coalesce(max(id), 0) FROM movimientos").fetchone()[0]
+            cur.executemany(INSERTAR_MOVIMIENTO, movimientos)
+            cur.execute(
+                """INSERT INTO deudas(id_mov, cant)
+                SELECT id, cant FROM movimientos
+                WHERE id > ? AND id_tipo = ?""", (ultimo, RETIRO))
+            for columna in COLUMNAS_STOCK:
+                cur.executemany(
+                    f"""UPDATE stock SET {columna} = coalesce({columna}, 0) + ?
+                    WHERE id = ?""",
+                    [(cambio, herramienta)
+                     for (herramienta, col), cambio in cambios.items()
+                     if col == columna and cambio])
+            cur.executemany(INSERTAR_REPARACION, envios)
+            cur.executemany("DELETE FROM deudas WHERE id_mov = ?",
+                            devoluciones)
+            cur.executemany(
+                "UPDATE reparaciones SET fecha_regreso = ? WHERE id = ?",
+                regresos)
+        if cambios:
+            marcarCambio("movimientos", "stock", "deudas", "reparaciones")
+        return resultados
+
+
+motorMovimientos = MotorMovimientos()
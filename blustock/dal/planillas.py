@@ -0,0 +1,466 @@
+"""Este módulo contiene la carga de las planillas de alumnos y de
+personal.
+
+Las planillas se leen de a bloques (las hojas de cálculo con openpyxl en
+modo de solo lectura y los csv de a líneas), así una planilla grande
+nunca está entera en memoria. La carga se hace en un hilo aparte, con
+su propia conexión a la base de datos: cada bloque se valida y se
+inserta en una tabla temporal, y al final la tabla personal se
+actualiza con unas pocas consultas sobre todas las filas a la vez (ver
+dal/queries/merge), en una sola transacción. Mientras tanto, la
+interfaz sigue respondiendo y la carga se puede cancelar.
+
+Clases
+------
+    ErrorPlanilla(Exception):
+        Se lanza cuando los datos de una planilla no son válidos.
+
+    LectorPlanilla():
+        Lee una planilla de a bloques.
+
+    TrabajadorPlanilla(QtCore.QObject):
+        Carga una planilla en el hilo de carga.
+
+    CargaPlanilla(QtCore.QObject):
+        Carga una planilla sin bloquear la interfaz.
+
+Funciones
+---------
+    normalizarDnis(dnis: pd.Series) -> pd.Series:
+        Convierte los dni de una planilla en números.
+
+    prepararBloque(bloque: pd.DataFrame,
+                   cursosTutorvip: bool = False) -> pd.DataFrame:
+        Valida y normaliza un bloque de filas de una planilla.
+
+    importarPlanilla(lector: LectorPlanilla, orden: list, categoria: str,
+                     baja: str, cursosTutorvip: bool = False,
+                     funcProgreso: types.FunctionType | None = None,
+                     cancelada: threading.Event | None = None) -> bool:
+        Carga una planilla en la tabla personal, sin la interfaz.
+
+Variables
+---------
+    TAMANO_BLOQUE: int
+        La cantidad de filas que se leen y se insertan juntas.
+
+    EXTENSIONES_LIBRO: tuple
+        Las extensiones de las hojas de cálculo que se leen de a
+        bloques.
+"""
+import csv
+import itertools
+import os
+import threading
+import types
+from PyQt6 import QtCore
+from db.bdd import bdd
+from dal.consultas import consultas
+from dal.vocabularios import marcarCambio
+# Pandas y openpyxl se importan recién al cargar la primera planilla.
+from dal.diferidos import pd, openpyxl
+
+TAMANO_BLOQUE = 1000
+EXTENSIONES_LIBRO = (".xlsx", ".xlsm", ".xltx", ".xltm")
+
+
+class ErrorPlanilla(Exception):
+    """Esta excepción se lanza cuando los datos de una planilla no son
+    válidos. Su mensaje es el que se le muestra al usuario."""
+
+
+def normalizarDnis(dnis: "pd.Series") -> "pd.Series":
+    """Esta función convierte los dni de una planilla en números. Los
+    dni pueden venir como números o como texto con puntos
+    ("12.345.678").
+
+    Parámetros
+    ----------
+        dnis: pd.Series
+            Los dni de la planilla.
+
+    Devuelve
+    --------
+        pd.Series: los dni como números enteros.
+
+    Lanza
+    -----
+        ErrorPlanilla: si algún dni no es válido o es demasiado largo.
+    """
+    esTexto = dnis.map(type) == str
+    # A los textos les quitamos los puntos; si no queda un número, el
+    # dni no es válido.
+    textos = (dnis.where(esTexto).astype("string")
+              .str.replace(".", "", regex=False).str.strip())
+    textos = textos.where(textos.str.fullmatch(r"\d+").fillna(False))
+    numeros = pd.to_numeric(dnis.where(~esTexto),
+                            errors="coerce").astype("float64")
+    numeros = numeros.where(
+        ~esTexto, pd.to_numeric(textos, errors="coerce").astype("float64"))
+    # Los números con decimales tampoco son válidos.
+    numeros = numeros.where(numeros == numeros.round())
+    if numeros.isna().any():
+        raise ErrorPlanilla('Un dni proporcionado en la planilla no es válido. Revise los dni de la plantilla e intente nuevamente.')
+    if (numeros > 10**8).any():
+        raise ErrorPlanilla('Un dni proporcionado en la planilla es demasiado largo. Revise los dni de la plantilla e intente nuevamente.')
+    return numeros.astype("int64")
+
+
+def prepararBloque(bloque: "pd.DataFrame",
+                   cursosTutorvip: bool = False) -> "pd.DataFrame":
+    """Esta función valida y normaliza un bloque de filas de una
+    planilla.
+
+    Parámetros
+    ----------
+        bloque: pd.DataFrame
+            Las filas, con las columnas nombre_apellido, clase y dni.
+
+        cursosTutorvip: bool = False
+            Si los cursos se pasan al formato de tutorvip (el primer y
+            el último caracter del curso).
+            Default: False.
+
+    Devuelve
+    --------
+        pd.DataFrame: las filas listas para insertar.
+
+    Lanza
+    -----
+        ErrorPlanilla: si alguna fila no es válida.
+    """
+    # Las filas vacías (por ejemplo, las del final de la hoja) no
+    # cuentan.
+    bloque = bloque.dropna(how="all")
+    if bloque[["nombre_apellido", "clase"]].isna().any(axis=None):
+        raise ErrorPlanilla('Hay filas de la planilla sin nombre o sin clase. Complete los datos de la planilla e intente nuevamente.')
+    bloque = bloque.assign(
+        nombre_apellido=bloque["nombre_apellido"].astype(str),
+        clase=bloque["clase"].astype(str),
+        dni=normalizarDnis(bloque["dni"]))
+    if cursosTutorvip:
+        bloque["clase"] = bloque["clase"].str[0] + bloque["clase"].str[-1]
+    return bloque
+
+
+class LectorPlanilla():
+    """Esta clase lee una planilla de a bloques. Al crearla se lee solo
+    el encabezado.
+
+    Atributos
+    ---------
+        ruta: str
+            La ruta de la planilla.
+
+        total: int
+            La cantidad aproximada de filas de la planilla, contando el
+            encabezado, o 0 si no se sabe.
+
+        encabezado: list
+            Los nombres de las columnas, como texto.
+
+        filas: types.GeneratorType
+            Las filas que todavía no se leyeron.
+
+    Métodos
+    -------
+        bloques(self, orden: list,
+                tamano: int = TAMANO_BLOQUE) -> types.GeneratorType:
+            Devuelve las filas de a bloques.
+
+        cerrar(self):
+            Cierra el archivo de la planilla.
+    """
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension == ".csv":
+            self.total = self._contarLineas()
+            self.filas = self._filasCsv()
+        elif extension in EXTENSIONES_LIBRO:
+            libro = openpyxl.load_workbook(ruta, read_only=True,
+                                           data_only=True)
+            self.total = libro.active.max_row or 0
+            self.filas = self._filasLibro(libro)
+        else:
+            # Los formatos viejos (.xls y otros) no se pueden leer de a
+            # partes, así que se leen enteros.
+            datos = pd.read_excel(ruta, header=None, dtype=object)
+            datos = datos.astype(object).where(datos.notna(), None)
+            self.total = len(datos)
+            self.filas = datos.itertuples(index=False, name=None)
+        encabezado = list(next(self.filas, ()))
+        # Las celdas vacías del final no son columnas.
+        while encabezado and encabezado[-1] is None:
+            encabezado.pop()
+        self.encabezado = ["" if valor is None else str(valor)
+                           for valor in encabezado]
+
+    def _contarLineas(self) -> int:
+        """Cuenta las líneas del csv sin cargarlo entero."""
+        with open(self.ruta, "rb") as archivo:
+            return sum(parte.count(b"\n") for parte in
+                       iter(lambda: archivo.read(1 << 20), b""))
+
+    def _filasCsv(self):
+        """Devuelve las filas del csv. Las celdas vacías son None."""
+        with open(self.ruta, newline="", encoding="utf-8-sig") as archivo:
+            for fila in csv.reader(archivo):
+                yield tuple(valor or None for valor in fila)
+
+    def _filasLibro(self, libro: "openpyxl.Workbook"):
+        """Devuelve las filas de la hoja activa del libro."""
+        try:
+            yield from libro.active.iter_rows(values_only=True)
+        finally:
+            libro.close()
+
+    def bloques(self, orden: list, tamano: int = TAMANO_BLOQUE):
+        """Este método devuelve las filas de la planilla (sin el
+        encabezado) de a bloques.
+
+        Parámetros
+        ----------
+            orden: list
+                Las posiciones de las columnas nombre, clase y dni en
+                la planilla.
+
+            tamano: int = TAMANO_BLOQUE
+                La cantidad de filas de cada bloque.
+                Default: TAMANO_BLOQUE.
+
+        Devuelve
+        --------
+            types.GeneratorType: los bloques, como pd.DataFrame con las
+            columnas nombre_apellido, clase y dni.
+        """
+        while True:
+            filas = list(itertools.islice(self.filas, tamano))
+            if not filas:
+                return
+            yield pd.DataFrame(
+                [[fila[i] if i < len(fila) else None for i in orden]
+                 for fila in filas],
+                columns=["nombre_apellido", "clase", "dni"], dtype=object)
+
+    def cerrar(self):
+        """Este método cierra el archivo de la planilla."""
+        if hasattr(self.filas, "close"):
+            self.filas.close()
+
+
+def importarPlanilla(lector: LectorPlanilla, orden: list, categoria: str,
+                     baja: str, cursosTutorvip: bool = False,
+                     funcProgreso: types.FunctionType | None = None,
+                     cancelada: threading.Event | None = None) -> bool:
+    """Esta función carga una planilla en la tabla personal, con la
+    conexión del hilo que la llama. No usa la interfaz, así que también
+    se puede usar desde un script.
+
+    Parámetros
+    ----------
+        lector: LectorPlanilla
+            El lector de la planilla. No se cierra al terminar.
+
+        orden: list
+            Las posiciones de las columnas nombre, clase y dni en la
+            planilla.
+
+        categoria: str
+            La categoría de las clases de la planilla.
+
+        baja: str
+            La clase a la que pasan las personas de la categoría que
+            no están en la planilla.
+
+        cursosTutorvip: bool = False
+            Si los cursos vienen con el formato de Tutorvip.
+            Default: False.
+
+        funcProgreso: types.FunctionType | None = None
+            Una función que se llama con la cantidad de filas cargadas
+            después de cada bloque. Default: None.
+
+        cancelada: threading.Event | None = None
+            Si se activa, la carga se detiene antes del siguiente
+            bloque y la base de datos queda como estaba.
+            Default: None.
+
+    Devuelve
+    --------
+        bool: si se cargó la planilla (False si se canceló).
+
+    Lanza
+    -----
+        ErrorPlanilla: si los datos de la planilla no son válidos.
+    """
+    con = bdd.conexion(perfil="importacion")
+    # La tabla temporal es de esta conexión: llenarla no bloquea la
+    # base de datos para los demás.
+    con.execute("""CREATE TEMP TABLE planilla(
+                   nombre_apellido VARCHAR(100) NOT NULL,
+                   clase VARCHAR(40) NOT NULL,
+                   dni INTEGER PRIMARY KEY)""")
+    try:
+        cargadas = 0
+        for bloque in lector.bloques(orden):
+            if cancelada is not None and cancelada.is_set():
+                return False
+            bloque = prepararBloque(bloque, cursosTutorvip)
+            # Si un dni está repetido, queda la primera fila.
+            con.executemany("INSERT OR IGNORE INTO planilla VALUES(?, ?, ?)",
+                            bloque.itertuples(index=False, name=None))
+            cargadas += len(bloque)
+            if funcProgreso is not None:
+                funcProgreso(cargadas)
+        if cancelada is not None and cancelada.is_set():
+            return False
+        parametros = {"categoria": categoria, "baja": baja}
+        with bdd.transaccion() as cur:
+            # Agregamos las clases nuevas, damos de baja a los que no
+            # están, insertamos o actualizamos a los que están y
+            # eliminamos las bajas sin relaciones.
+            for consulta in ("clases", "bajas", "personal",
+                             "eliminar_bajas"):
+                cur.execute(consultas.obtener(f"merge/{consulta}").sql,
+                            parametros)
+    finally:
+        if con.in_transaction:
+            con.rollback()
+        con.execute("DROP TABLE temp.planilla")
+    marcarCambio("personal", "clases")
+    return True
+
+
+class TrabajadorPlanilla(QtCore.QObject):
+    """Esta clase carga una planilla en el hilo de carga, con su propia
+    conexión a la base de datos.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        lector: LectorPlanilla
+            El lector de la planilla.
+
+        orden: list
+            Las posiciones de las columnas nombre, clase y dni.
+
+        categoria: str
+            La categoría de clase de las personas de la planilla.
+
+        baja: str
+            La clase de las personas de la categoría que no están en la
+            planilla.
+
+        cursosTutorvip: bool
+            Si los cursos se pasan al formato de tutorvip.
+
+        cancelada: threading.Event
+            Se activa cuando el usuario cancela la carga.
+
+    Señales
+    -------
+        progreso(int):
+            Se emite con la cantidad de filas cargadas.
+
+        terminado(bool, str):
+            Se emite al terminar, con si se cargó la planilla y, si no,
+            el motivo.
+    """
+    progreso = QtCore.pyqtSignal(int)
+    terminado = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, lector: LectorPlanilla, orden: list, categoria: str,
+                 baja: str, cursosTutorvip: bool = False):
+        super().__init__()
+        self.lector = lector
+        self.orden = orden
+        self.categoria = categoria
+        self.baja = baja
+        self.cursosTutorvip = cursosTutorvip
+        self.cancelada = threading.Event()
+
+    @QtCore.pyqtSlot()
+    def cargar(self):
+        """Este método carga la planilla."""
+        try:
+            cargada = importarPlanilla(
+                self.lector, self.orden, self.categoria, self.baja,
+                self.cursosTutorvip, self.progreso.emit, self.cancelada)
+        except ErrorPlanilla as error:
+            return self.terminado.emit(False, str(error))
+        except Exception as error:
+            return self.terminado.emit(
+                False, f'Ocurrió un error al cargar la planilla: {error}')
+        finally:
+            self.lector.cerrar()
+            # La conexión es la del hilo de carga.
+            bdd.cerrar()
+        if not cargada:
+            return self.terminado.emit(
+                False, 'Se canceló la carga de la planilla.')
+        self.terminado.emit(True, "")
+
+
+class CargaPlanilla(QtCore.QObject):
+    """Esta clase carga una planilla en un hilo aparte, sin bloquear la
+    interfaz.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        hilo: QtCore.QThread
+            El hilo de carga.
+
+        trabajador: TrabajadorPlanilla
+            El objeto que carga la planilla en el hilo.
+
+    Señales
+    -------
+        progreso(int):
+            Se emite con la cantidad de filas cargadas.
+
+        terminado(bool, str):
+            Se emite al terminar, con si se cargó la planilla y, si no,
+            el motivo.
+
+    Métodos
+    -------
+        iniciar(self):
+            Empieza la carga.
+
+        cancelar(self):
+            Cancela la carga. Los bloques ya leídos se descartan.
+    """
+    progreso = QtCore.pyqtSignal(int)
+    terminado = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, lector: LectorPlanilla, orden: list, categoria: str,
+                 baja: str, cursosTutorvip: bool = False,
+                 parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.hilo = QtCore.QThread()
+        self.hilo.setObjectName("hiloPlanilla")
+        self.trabajador = TrabajadorPlanilla(lector, orden, categoria, baja,
+                                             cursosTutorvip)
+        self.trabajador.moveToThread(self.hilo)
+        self.hilo.started.connect(self.trabajador.cargar)
+        self.trabajador.progreso.connect(self.progreso)
+        self.trabajador.terminado.connect(self._terminar)
+
+    def iniciar(self):
+        """Este método empieza la carga."""
+        self.hilo.start()
+
+    def cancelar(self):
+        """Este método cancela la carga. Se detiene antes del siguiente
+        bloque y la base de datos queda como estaba."""
+        self.trabajador.cancelada.set()
+
+    def _terminar(self, cargada: bool, mensaje: str):
+        """Detiene el hilo de carga y avisa que terminó."""
+        self.hilo.quit()
+        self.hilo.wait()
+        self.terminado.emit(cargada, mensaje)
@@ -4,8 +4,9 @@ FROM personal p
 JOIN clases cl ON cl.id = p.id_clase
 JOIN cats_clase cat ON cl.id_cat = cat.id
 WHERE cat.descripcion = 'Alumno'
-AND (p.nombre_apellido LIKE ?
-OR p.id like ?
-OR cl.descripcion LIKE ?
-OR p.dni LIKE ?)
-ORDER BY p.nombre_apellido;
\ No newline at end of file
+-- [busqueda]
+AND (p.id IN (SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR p.id = :numero
+OR cl.descripcion LIKE :busqueda)
+-- [/busqueda]
+ORDER BY p.nombre_apellido;
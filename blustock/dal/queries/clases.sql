@@ -2,6 +2,8 @@
 SELECT cl.id, cat.descripcion, cl.descripcion
 FROM clases cl
 JOIN cats_clase cat ON cl.id_cat=cat.id
-WHERE cl.descripcion LIKE ?
-OR cat.descripcion LIKE ?
-ORDER BY cl.descripcion asc;
\ No newline at end of file
+-- [busqueda]
+WHERE cl.descripcion LIKE :busqueda
+OR cat.descripcion LIKE :busqueda
+-- [/busqueda]
+ORDER BY cl.descripcion asc;
@@ -12,15 +12,30 @@ JOIN clases cpe ON pe.id_clase=cpe.id
 LEFT JOIN turnos t ON m.id_turno = t.id
 LEFT JOIN personal pa ON t.id_panolero=pa.id
 LEFT JOIN clases cpa ON pa.id_clase = cpa.id
-WHERE m.id LIKE ?
-AND (m.id_turno LIKE ? OR m.id_turno IS NULL)
+WHERE m.id LIKE :filtro1
+AND (m.id_turno LIKE :filtro2 OR m.id_turno IS NULL)
 AND (
-    pa.nombre_apellido || ' ' || cpa.descripcion LIKE ?
+    pa.nombre_apellido || ' ' || cpa.descripcion LIKE :filtro3
     OR pa.nombre_apellido || ' ' || cpa.descripcion IS NULL
-) AND (h.descripcion LIKE ?
-OR d.cant LIKE ?
-OR pe.nombre_apellido || ' ' || cpe.descripcion LIKE ?
-OR m.fecha_hora LIKE ?
-OR m.id LIKE ?
-OR m.id_turno LIKE ?
-OR pa.nombre_apellido || ' ' || cpa.descripcion LIKE ?);
\ No newline at end of file
+)
+-- [busqueda]
+AND (
+    m.id IN (
+        SELECT rowid FROM movimientos_fts WHERE movimientos_fts MATCH :fts)
+    OR m.id = :numero
+    OR m.id_turno = :numero
+    OR d.cant = :numero
+    OR m.id_elem IN (SELECT rowid FROM stock_fts WHERE stock_fts MATCH :fts)
+    OR m.id_persona IN (
+        SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+    OR m.id_persona IN (
+        SELECT pc.id FROM personal pc
+        JOIN clases cl ON cl.id = pc.id_clase
+        WHERE cl.descripcion LIKE :busqueda)
+    OR m.id_turno IN (
+        SELECT tu.id FROM turnos tu
+        WHERE tu.id_panolero IN (
+            SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts))
+)
+-- [/busqueda]
+;
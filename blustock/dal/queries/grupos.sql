@@ -1,2 +1,5 @@
-SELECT * FROM grupos WHERE descripcion LIKE ?
-ORDER BY descripcion;
\ No newline at end of file
+SELECT * FROM grupos
+-- [busqueda]
+WHERE descripcion LIKE :busqueda
+-- [/busqueda]
+ORDER BY descripcion;
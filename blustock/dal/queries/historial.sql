@@ -1,10 +1,24 @@
---Obtenemos el usuario, hora, gestión, tipo de cambio, id de fila,
---datos viejos y datos nuevos.
+--Obtenemos el usuario, hora, gestión, tipo de cambio, id de fila y la
+--descripción del cambio, que se arma al guardarlo. Las dos últimas
+--columnas, fecha y rowid, son el cursor de la paginación.
 SELECT u.nombre_apellido || ' ' || u.usuario, h.fecha_hora, g.descripcion,
-t.descripcion, h.id_fila, h.datos_viejos, h.datos_nuevos
+t.descripcion, h.id_fila, h.descripcion, h.fecha_hora, h.rowid
 FROM historial h
 JOIN personal u ON h.id_usuario=u.id
 JOIN tipos_cambio t ON h.id_tipo=t.id
 JOIN gestiones g ON h.id_gest=g.id
-WHERE g.descripcion LIKE ?
-ORDER BY h.fecha_hora DESC;
\ No newline at end of file
+WHERE h.fecha_hora BETWEEN :desde AND :hasta
+-- La página empieza después de la última fila de la página anterior.
+AND h.fecha_hora <= :cursorFecha
+AND (h.fecha_hora, h.rowid) < (:cursorFecha, :cursorId)
+AND g.descripcion LIKE :filtro1
+-- [busqueda]
+AND (h.rowid IN (
+    SELECT rowid FROM historial_fts WHERE historial_fts MATCH :fts)
+OR h.id_usuario IN (
+    SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR h.id_tipo IN (SELECT id FROM tipos_cambio WHERE descripcion LIKE :busqueda)
+OR h.id_gest IN (SELECT id FROM gestiones WHERE descripcion LIKE :busqueda))
+-- [/busqueda]
+ORDER BY h.fecha_hora DESC, h.rowid DESC
+LIMIT :limite;
@@ -0,0 +1,11 @@
+-- Las personas de la categoría que no están en la planilla pasan a la
+-- clase de baja (Egresado o Destituído).
+UPDATE personal SET id_clase = (
+    SELECT id FROM clases WHERE descripcion = :baja
+)
+WHERE id_clase IN (
+    SELECT c.id FROM clases c
+    JOIN cats_clase cat ON c.id_cat = cat.id
+    WHERE cat.descripcion = :categoria
+)
+AND dni NOT IN (SELECT dni FROM planilla)
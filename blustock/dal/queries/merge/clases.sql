@@ -0,0 +1,10 @@
+-- Agregamos las clases de la planilla que todavía no existen (sin
+-- distinguir mayúsculas).
+INSERT INTO clases(descripcion, id_cat)
+SELECT DISTINCT pl.clase, (
+    SELECT id FROM cats_clase WHERE descripcion = :categoria
+)
+FROM planilla pl
+WHERE NOT EXISTS (
+    SELECT 1 FROM clases c WHERE c.descripcion = pl.clase COLLATE NOCASE
+)
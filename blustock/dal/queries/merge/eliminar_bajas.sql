@@ -0,0 +1,10 @@
+-- Las personas dadas de baja que no tienen relaciones en el sistema se
+-- eliminan para no ocupar espacio innecesario.
+DELETE FROM personal
+WHERE id_clase = (SELECT id FROM clases WHERE descripcion = :baja)
+AND NOT EXISTS (SELECT 1 FROM movimientos m WHERE m.id_persona = personal.id)
+AND NOT EXISTS (SELECT 1 FROM turnos t WHERE t.id_panolero = personal.id
+                OR t.id_prof_ing = personal.id OR t.id_prof_egr = personal.id)
+AND NOT EXISTS (SELECT 1 FROM reparaciones r
+                WHERE r.id_usuario = personal.id)
+AND NOT EXISTS (SELECT 1 FROM historial h WHERE h.id_usuario = personal.id)
@@ -1,15 +1,11 @@
---Obtenemos el nombre viejo, dni, nombre nuevo y clase nueva
-SELECT p.nombre_apellido, p.dni, pn.nombre_apellido, cn.descripcion
-FROM personal p
-JOIN clases c ON p.id_clase = c.id
-LEFT JOIN personal_nuevo pn ON p.dni = pn.dni
-LEFT JOIN clases cn ON pn.id_curso = cn.id
-JOIN cats_clase cat ON c.id_cat = cat.id
-WHERE cat.descripcion LIKE 'Personal'
-UNION
--- Obtenemos nombre viejo, dni nuevo, nombre nuevo y clase nueva.
-SELECT p.nombre_apellido, pn.dni, pn.nombre_apellido, cn.descripcion
-FROM personal_nuevo pn
-JOIN clases cn ON pn.id_curso = pn.id
-LEFT JOIN personal p
-ON p.dni = pn.dni
\ No newline at end of file
+-- Insertamos las personas nuevas y actualizamos el nombre y la clase de
+-- las que ya estaban, según el dni. El WHERE true es necesario para que
+-- sqlite no confunda el ON CONFLICT con el ON de un JOIN.
+INSERT INTO personal(nombre_apellido, dni, id_clase)
+SELECT pl.nombre_apellido, pl.dni, c.id
+FROM planilla pl
+JOIN clases c ON c.descripcion = pl.clase COLLATE NOCASE
+WHERE true
+ON CONFLICT(dni) DO UPDATE SET
+    nombre_apellido = excluded.nombre_apellido,
+    id_clase = excluded.id_clase
@@ -1,11 +1,12 @@
 --Obtenemos id, tipo de movimiento, elemento, estado del elemento,
 --cantidad, motivo, persona que hico el movimiento, fecha y hora,
 --turno, ubicación, nombre del pañolero y nombre del profesor que
---autorizó el ingreso del turno.
+--autorizó el ingreso del turno. Las dos últimas columnas, fecha e id,
+--son el cursor de la paginación.
 SELECT m.id, ti.descripcion, s.descripcion, u.descripcion, e.descripcion, m.cant,
 m.descripcion, p.nombre_apellido || ' ' || c.descripcion, m.fecha_hora,
 m.id_turno, pa.nombre_apellido || ' ' || ca.descripcion,
-pr.nombre_apellido
+pr.nombre_apellido, m.fecha_hora, m.id
 FROM movimientos m
 JOIN stock s ON s.id=m.id_elem
 JOIN ubicaciones u ON u.id=s.id_ubi
@@ -17,26 +18,49 @@ LEFT JOIN turnos tu ON tu.id=m.id_turno
 LEFT JOIN personal pa ON tu.id_panolero = pa.id
 LEFT JOIN clases ca ON pa.id_clase=ca.id
 LEFT JOIN personal pr ON tu.id_prof_ing = pr.id
-WHERE m.id LIKE ?
-AND (m.id_turno LIKE ? OR m.id_turno IS NULL)
-AND (s.descripcion LIKE ? OR s.descripcion IS NULL)
+WHERE m.fecha_hora BETWEEN :desde AND :hasta
+-- La página empieza después de la última fila de la página anterior.
+AND m.fecha_hora <= :cursorFecha
+AND (m.fecha_hora, m.id) < (:cursorFecha, :cursorId)
+AND m.id LIKE :filtro1
+AND (m.id_turno LIKE :filtro2 OR m.id_turno IS NULL)
+AND (s.descripcion LIKE :filtro3 OR s.descripcion IS NULL)
 AND (
-    p.nombre_apellido || ' ' || c.descripcion LIKE ?
+    p.nombre_apellido || ' ' || c.descripcion LIKE :filtro4
     OR p.nombre_apellido || ' ' || c.descripcion IS NULL
 ) AND (
-    pa.nombre_apellido || ' ' || ca.descripcion LIKE ?
+    pa.nombre_apellido || ' ' || ca.descripcion LIKE :filtro5
     OR pa.nombre_apellido || ' ' || ca.descripcion IS NULL
-) AND (
-    m.id_turno LIKE ?
-    OR s.descripcion LIKE ?
-    OR e.descripcion LIKE ?
-    OR p.nombre_apellido LIKE ?
-    OR m.fecha_hora LIKE ?
-    OR m.cant LIKE ?
-    OR ti.descripcion LIKE ?
-    OR u.descripcion LIKE ?
-    OR m.id LIKE ?
-    OR pa.nombre_apellido LIKE ?
-    OR pr.nombre_apellido LIKE ?
-    OR m.descripcion LIKE ?
-);
\ No newline at end of file
+)
+-- [busqueda]
+-- Los textos de movimientos, stock y personal se buscan en los índices
+-- de texto completo; las tablas chicas (estados, tipos, ubicaciones)
+-- se buscan con LIKE.
+AND (
+    m.id IN (
+        SELECT rowid FROM movimientos_fts WHERE movimientos_fts MATCH :fts)
+    OR m.id = :numero
+    OR m.id_turno = :numero
+    OR m.id_elem IN (SELECT rowid FROM stock_fts WHERE stock_fts MATCH :fts)
+    OR m.id_persona IN (
+        SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+    OR m.id_turno IN (
+        SELECT t.id FROM turnos t
+        WHERE t.id_panolero IN (
+            SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+        UNION
+        SELECT t.id FROM turnos t
+        WHERE t.id_prof_ing IN (
+            SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts))
+    OR m.id_estado IN (
+        SELECT id FROM estados WHERE descripcion LIKE :busqueda)
+    OR m.id_tipo IN (
+        SELECT id FROM tipos_mov WHERE descripcion LIKE :busqueda)
+    OR m.id_elem IN (
+        SELECT st.id FROM stock st
+        JOIN ubicaciones ub ON ub.id = st.id_ubi
+        WHERE ub.descripcion LIKE :busqueda)
+)
+-- [/busqueda]
+ORDER BY m.fecha_hora DESC, m.id DESC
+LIMIT :limite;
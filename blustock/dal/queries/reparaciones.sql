@@ -6,10 +6,20 @@ FROM reparaciones r
 JOIN stock s ON s.id = r.id_herramienta
 JOIN ubicaciones u ON u.id = s.id_ubi
 JOIN personal p ON p.id = r.id_usuario
-WHERE r.id LIKE ?
-OR s.descripcion LIKE ?
-OR r.cantidad LIKE ?
-OR p.nombre_apellido LIKE ?
-OR r.destino LIKE ?
-OR r.fecha_envio LIKE ?
-OR r.fecha_regreso LIKE ?;
\ No newline at end of file
+-- Se muestran las reparaciones enviadas o que regresaron en el rango.
+-- La fecha de envío no tiene hora, así que se compara con la fecha del
+-- límite inferior.
+WHERE (r.fecha_envio BETWEEN substr(:desde, 1, 10) AND :hasta
+OR r.fecha_regreso BETWEEN :desde AND :hasta)
+-- [busqueda]
+AND (r.id = :numero
+OR r.cantidad = :numero
+OR r.id_herramienta IN (
+    SELECT rowid FROM stock_fts WHERE stock_fts MATCH :fts)
+OR r.id_usuario IN (
+    SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR r.destino LIKE :busqueda
+OR r.fecha_envio LIKE :busqueda
+OR r.fecha_regreso LIKE :busqueda)
+-- [/busqueda]
+;
@@ -13,4 +13,5 @@ LEFT JOIN turnos tu ON tu.id=m.id_turno
 JOIN ubicaciones u ON u.id=s.id_ubi
 LEFT JOIN personal pa ON tu.id_panolero = pa.id
 LEFT JOIN clases ca ON pa.id_clase=ca.id
-WHERE e.descripcion='De Baja';
+WHERE e.descripcion='De Baja'
+AND m.fecha_hora BETWEEN :desde AND :hasta;
@@ -12,4 +12,5 @@ JOIN clases c ON p.id_clase = c.id
 LEFT JOIN turnos tu ON tu.id=m.id_turno
 JOIN ubicaciones u ON u.id=s.id_ubi
 LEFT JOIN personal pa ON tu.id_panolero = pa.id
-LEFT JOIN clases ca ON pa.id_clase=ca.id;
\ No newline at end of file
+LEFT JOIN clases ca ON pa.id_clase=ca.id
+WHERE m.fecha_hora BETWEEN :desde AND :hasta;
\ No newline at end of file
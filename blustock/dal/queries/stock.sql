@@ -8,13 +8,15 @@ FROM stock s
 JOIN subgrupos sub ON s.id_subgrupo = sub.id
 JOIN grupos g ON sub.id_grupo=g.id
 JOIN ubicaciones u ON s.id_ubi=u.id
-WHERE u.descripcion LIKE ? 
-AND (s.descripcion LIKE ?
-OR s.cant_condiciones LIKE ?
-OR s.cant_reparacion LIKE ?
-OR s.cant_baja LIKE ?
-OR g.descripcion LIKE ?
-OR sub.descripcion LIKE ?
-OR u.descripcion LIKE ?
-OR s.cant_prest LIKE ?)
-ORDER BY s.descripcion;
\ No newline at end of file
+WHERE u.descripcion LIKE :filtro1
+-- [busqueda]
+-- La descripción se busca en el índice de texto completo; grupos,
+-- subgrupos y ubicaciones son tablas chicas y se buscan con LIKE.
+AND (s.id IN (SELECT rowid FROM stock_fts WHERE stock_fts MATCH :fts)
+OR s.id_subgrupo IN (
+    SELECT sb.id FROM subgrupos sb
+    JOIN grupos gr ON sb.id_grupo = gr.id
+    WHERE sb.descripcion LIKE :busqueda OR gr.descripcion LIKE :busqueda)
+OR s.id_ubi IN (SELECT id FROM ubicaciones WHERE descripcion LIKE :busqueda))
+-- [/busqueda]
+ORDER BY s.descripcion;
@@ -3,6 +3,8 @@ SELECT s.id, s.descripcion, g.descripcion
 FROM subgrupos s
 JOIN grupos g
 ON s.id_grupo=g.id
-WHERE s.descripcion LIKE ?
-OR g.descripcion LIKE ?
-ORDER BY s.descripcion;
\ No newline at end of file
+-- [busqueda]
+WHERE s.descripcion LIKE :busqueda
+OR g.descripcion LIKE :busqueda
+-- [/busqueda]
+ORDER BY s.descripcion;
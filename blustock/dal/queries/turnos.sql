@@ -9,13 +9,22 @@ JOIN clases c ON p.id_clase=c.id
 JOIN personal pi ON pi.id = t.id_prof_ing
 LEFT JOIN personal pe ON pe.id=t.id_prof_egr
 JOIN ubicaciones u ON t.id_ubi=u.id
-WHERE t.id LIKE ?
-AND (t.id LIKE ?
-OR p.nombre_apellido || ' ' || c.descripcion LIKE ?
-OR t.fecha_ing LIKE ?
-OR t.fecha_egr LIKE ?
-OR u.descripcion LIKE ?
-OR pi.nombre_apellido LIKE ?
-OR pe.nombre_apellido LIKE ?);
-
-
+WHERE t.fecha_ing BETWEEN :desde AND :hasta
+AND t.id LIKE :filtro1
+-- [busqueda]
+AND (t.id = :numero
+OR t.id_panolero IN (
+    SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR t.id_panolero IN (
+    SELECT pc.id FROM personal pc
+    JOIN clases cl ON cl.id = pc.id_clase
+    WHERE cl.descripcion LIKE :busqueda)
+OR t.id_prof_ing IN (
+    SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR t.id_prof_egr IN (
+    SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR t.id_ubi IN (SELECT id FROM ubicaciones WHERE descripcion LIKE :busqueda)
+OR t.fecha_ing LIKE :busqueda
+OR t.fecha_egr LIKE :busqueda)
+-- [/busqueda]
+;
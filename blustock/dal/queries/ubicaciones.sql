@@ -1,3 +1,5 @@
 SELECT * FROM ubicaciones
-WHERE descripcion LIKE ?
-ORDER BY descripcion;
\ No newline at end of file
+-- [busqueda]
+WHERE descripcion LIKE :busqueda
+-- [/busqueda]
+ORDER BY descripcion;
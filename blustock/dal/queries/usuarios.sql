@@ -4,8 +4,8 @@ FROM personal p
 JOIN clases c ON c.id = p.id_clase
 JOIN cats_clase cat ON c.id_cat = cat.id
 WHERE cat.descripcion = 'Usuario'
-AND (p.nombre_apellido LIKE ?
-OR p.usuario LIKE ?
-OR c.descripcion LIKE ?
-OR p.dni LIKE ?)
-ORDER BY p.nombre_apellido;
\ No newline at end of file
+-- [busqueda]
+AND (p.id IN (SELECT rowid FROM personal_fts WHERE personal_fts MATCH :fts)
+OR c.descripcion LIKE :busqueda)
+-- [/busqueda]
+ORDER BY p.nombre_apellido;
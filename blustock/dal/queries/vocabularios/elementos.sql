@@ -0,0 +1,5 @@
+--Las herramientas que tienen movimientos, para el filtro de elementos
+--de la pantalla movimientos.
+SELECT DISTINCT s.descripcion
+FROM movimientos m
+JOIN stock s ON s.id=m.id_elem;
@@ -0,0 +1,5 @@
+--Las gestiones que tienen cambios en el historial, para el filtro de
+--gestiones de la pantalla historial.
+SELECT DISTINCT g.descripcion
+FROM historial h
+JOIN gestiones g ON g.id=h.id_gest;
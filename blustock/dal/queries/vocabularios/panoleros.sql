@@ -0,0 +1,7 @@
+--Los pañoleros de los turnos que tienen movimientos, para los filtros
+--de pañoleros de las pantallas movimientos y deudas.
+SELECT DISTINCT p.nombre_apellido || ' ' || c.descripcion
+FROM movimientos m
+JOIN turnos t ON m.id_turno = t.id
+JOIN personal p ON p.id=t.id_panolero
+JOIN clases c ON p.id_clase = c.id;
@@ -0,0 +1,6 @@
+--Las personas que tienen movimientos, para el filtro de personas de la
+--pantalla movimientos.
+SELECT DISTINCT p.nombre_apellido || ' ' || c.descripcion
+FROM movimientos m
+JOIN personal p ON p.id=m.id_persona
+JOIN clases c ON p.id_clase = c.id;
@@ -0,0 +1,739 @@
+"""Este módulo contiene los servicios que guardan los datos de las
+gestiones, sin interfaz gráfica.
+
+Los servicios reciben los datos como objetos simples (FilaStock,
+FilaPersonal, etc.), los validan, los guardan junto con su registro en
+el historial en una sola transacción y, si algo no es válido, lanzan
+una excepción de ErrorServicio con el mensaje para el usuario. No usan
+PyQt, así que se pueden usar en scripts, en tareas programadas o en
+mediciones, sin abrir la app. Los métodos save de la DAL leen los datos
+de las tablas de la interfaz, llaman a estos servicios y muestran sus
+errores.
+
+Los movimientos de herramientas se registran con dal/movimientos.py y
+las planillas se cargan con la función importarPlanilla de
+dal/planillas.py, que tampoco usan la interfaz.
+
+Clases
+------
+    ErrorServicio(Exception):
+        Se lanza cuando no se pueden guardar los datos.
+
+    ErrorCampoVacio(ErrorServicio):
+        Se lanza cuando falta un dato obligatorio.
+
+    ErrorDatoInvalido(ErrorServicio):
+        Se lanza cuando un dato no tiene el formato correcto.
+
+    ErrorNoRegistrado(ErrorServicio):
+        Se lanza cuando un dato relacionado no está registrado.
+
+    ErrorRepetido(ErrorServicio):
+        Se lanza cuando los datos ya están registrados.
+
+    ErrorRelaciones(ErrorServicio):
+        Se lanza cuando un cambio afectaría a datos relacionados.
+
+    FilaStock, FilaPersonal, FilaGrupo, FilaSubgrupo, FilaUbicacion,
+    FilaClase:
+        Los datos de una fila de cada gestión.
+
+Funciones
+---------
+    registrarHistorial(cur: sqlite3.Cursor, usuario: int, tipo: str,
+                       gestion: str, fila,
+                       datosViejos: list | None = None,
+                       datosNuevos: list | None = None):
+        Registra un cambio en el historial.
+
+    guardarStock(fila: FilaStock, usuario: int,
+                 filaVieja: list | None = None) -> int:
+        Guarda una herramienta.
+
+    guardarAlumno(fila: FilaPersonal, usuario: int,
+                  filaVieja: list | None = None) -> int:
+        Guarda un alumno.
+
+    guardarOtroPersonal(fila: FilaPersonal, usuario: int,
+                        filaVieja: list | None = None) -> int:
+        Guarda a alguien del personal.
+
+    guardarUsuario(fila: FilaPersonal, usuario: int,
+                   filaVieja: list | None = None) -> int:
+        Guarda un usuario.
+
+    guardarGrupo(fila: FilaGrupo, usuario: int,
+                 filaVieja: list | None = None) -> int:
+        Guarda un grupo.
+
+    guardarSubgrupo(fila: FilaSubgrupo, usuario: int,
+                    filaVieja: list | None = None) -> int:
+        Guarda un subgrupo.
+
+    guardarUbicacion(fila: FilaUbicacion, usuario: int,
+                     filaVieja: list | None = None) -> int:
+        Guarda una ubicación.
+
+    validarClase(fila: FilaClase) -> int:
+        Valida una clase y devuelve el id de su categoría.
+
+    guardarClase(fila: FilaClase, usuario: int,
+                 filaVieja: list | None = None) -> int:
+        Guarda una clase.
+"""
+import sqlite3
+from dataclasses import dataclass
+from db.bdd import bdd
+from db.fechas import ahora
+from dal.catalogos import catalogos
+from dal.historial import textoDatos, describirCambio
+from dal.vocabularios import marcarCambio
+
+
+class ErrorServicio(Exception):
+    """Esta excepción se lanza cuando no se pueden guardar los datos.
+    Su mensaje es el que se le muestra al usuario.
+
+    Atributos
+    ---------
+        titulo: str
+            El título del mensaje que se le muestra al usuario.
+    """
+    titulo = "Error"
+
+
+class ErrorCampoVacio(ErrorServicio):
+    """Esta excepción se lanza cuando falta un dato obligatorio."""
+
+
+class ErrorDatoInvalido(ErrorServicio):
+    """Esta excepción se lanza cuando un dato no tiene el formato
+    correcto."""
+
+
+class ErrorNoRegistrado(ErrorServicio):
+    """Esta excepción se lanza cuando un dato relacionado (un grupo,
+    una clase, etc.) no está registrado."""
+
+
+class ErrorRepetido(ErrorServicio):
+    """Esta excepción se lanza cuando los datos ya están registrados."""
+
+
+class ErrorRelaciones(ErrorServicio):
+    """Esta excepción se lanza cuando un cambio afectaría a datos
+    relacionados."""
+    titulo = "Advertencia"
+
+
+# Los datos de las filas de cada gestión. El id es None si la fila es
+# nueva. Los números pueden venir como texto (por ejemplo, desde una
+# tabla o un csv): los servicios los convierten y los validan.
+@dataclass
+class FilaStock():
+    """Los datos de una herramienta."""
+    id: int | None
+    descripcion: str
+    condiciones: int | str
+    baja: int | str
+    grupo: str
+    subgrupo: str
+    ubicacion: str
+
+
+@dataclass
+class FilaPersonal():
+    """Los datos de un alumno, de alguien del personal o de un usuario.
+    El usuario y la contraseña solo se usan con los usuarios."""
+    id: int | None
+    nombre: str
+    clase: str
+    dni: int | str
+    usuario: str | None = None
+    contrasena: str | None = None
+
+
+@dataclass
+class FilaGrupo():
+    """Los datos de un grupo."""
+    id: int | None
+    descripcion: str
+
+
+@dataclass
+class FilaSubgrupo():
+    """Los datos de un subgrupo."""
+    id: int | None
+    descripcion: str
+    grupo: str
+
+
+@dataclass
+class FilaUbicacion():
+    """Los datos de una ubicación."""
+    id: int | None
+    descripcion: str
+
+
+@dataclass
+class FilaClase():
+    """Los datos de una clase."""
+    id: int | None
+    descripcion: str
+    categoria: str
+
+
+def _verificarCompletos(registro: str, *datos):
+    """Lanza ErrorCampoVacio si alguno de los datos está vacío."""
+    for dato in datos:
+        if dato is None or dato == "":
+            raise ErrorCampoVacio(f"El registro {registro} tiene campos en blanco que son obligatorios. Ingreselos e intente nuevamente.")
+
+
+def _entero(dato: int | str, mensaje: str) -> int:
+    """Convierte un dato en número o lanza ErrorDatoInvalido con el
+    mensaje."""
+    try:
+        return int(dato)
+    except (TypeError, ValueError):
+        raise ErrorDatoInvalido(mensaje) from None
+
+
+def _dni(dato: int | str) -> int:
+    """Convierte un dni en número y verifica su largo."""
+    dni = _entero(dato, "Los datos ingresados no son válidos. Por favor, ingreselos correctamente.")
+    if dni > 10**8:
+        raise ErrorDatoInvalido("El dni ingresado es muy largo. Por favor, reduzca los dígitos del dni ingresado.")
+    return dni
+
+
+def _limpiar(datos: list) -> list:
+    """Reemplaza los datos vacíos de una fila, como se guardan en el
+    historial."""
+    return ["" if dato in ("-", None) else dato for dato in datos]
+
+
+def registrarHistorial(cur: sqlite3.Cursor, usuario: int, tipo: str,
+                       gestion: str, fila,
+                       datosViejos: list | None = None,
+                       datosNuevos: list | None = None):
+    """Esta función registra un cambio en el historial. No confirma la
+    transacción: el registro se guarda junto con el cambio.
+
+    Parámetros
+    ----------
+        cur: sqlite3.Cursor
+            El cursor de la transacción del cambio.
+
+        usuario: int
+            El dni del usuario que realizó el cambio.
+
+        tipo: str
+            El tipo de cambio.
+
+        gestion: str
+            La gestión donde se realizó el cambio.
+
+        fila
+            La fila que se modificó.
+
+        datosViejos: list | None = None
+            Los datos que fueron eliminados o reemplazados.
+            Default: None.
+
+        datosNuevos: list | None = None
+            Los datos que se añadieron o reemplazaron otros datos.
+            Default: None.
+
+    Lanza
+    -----
+        ValueError: si el tipo de cambio o la gestión no existen.
+    """
+    idTipo = catalogos.tiposCambio.id(tipo)
+    idGestion = catalogos.gestiones.id(gestion)
+    # Si no están, entonces cometimos un error de programación.
+    if not idTipo or not idGestion:
+        raise ValueError(f"El tipo de cambio {tipo} o la gestión {gestion} no existen.")
+    # Armamos la descripción del cambio una sola vez, acá, para no
+    # tener que armarla cada vez que se abre el historial.
+    cur.execute("""INSERT INTO historial(id_usuario, fecha_hora, id_tipo,
+                id_gest, id_fila, datos_viejos, datos_nuevos, descripcion)
+                VALUES(?,?,?,?,?,?,?,?)""",
+                (catalogos.personal.id(usuario), ahora(), idTipo,
+                 idGestion, fila, textoDatos(datosViejos),
+                 textoDatos(datosNuevos),
+                 describirCambio(gestion, tipo, fila, datosViejos,
+                                 datosNuevos)))
+
+
+def guardarStock(fila: FilaStock, usuario: int,
+                 filaVieja: list | None = None) -> int:
+    """Esta función guarda una herramienta nueva o los cambios de una
+    herramienta.
+
+    Parámetros
+    ----------
+        fila: FilaStock
+            Los datos de la herramienta.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila de la herramienta como se muestra en la gestión
+            stock, antes del cambio, para el historial. Si no se pasa,
+            el historial no guarda los datos anteriores.
+            Default: None.
+
+    Devuelve
+    --------
+        int: el id de la herramienta.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.descripcion, fila.descripcion,
+                        fila.condiciones, fila.grupo, fila.subgrupo,
+                        fila.ubicacion)
+    mensaje = "Los datos ingresados no son válidos. Por favor, ingrese los datos correctamente."
+    cond = _entero(fila.condiciones, mensaje)
+    baja = _entero(fila.baja, mensaje)
+
+    # Los ids se buscan en los catálogos, sin consultar la base de
+    # datos.
+    idGrupo = catalogos.grupos.fila(fila.grupo)
+    if not idGrupo:
+        raise ErrorNoRegistrado("El grupo ingresado no está registrado. Regístrelo e ingrese nuevamente")
+    # El subgrupo tiene que pertenecer al grupo ingresado.
+    idSubgrupo = catalogos.subgrupos.fila(fila.subgrupo, idGrupo[0])
+    if not idSubgrupo:
+        raise ErrorNoRegistrado("El subgrupo ingresado no está registrado o no pertenece al grupo ingresado. Regístrelo o asegúrese que esté relacionado al grupo e ingrese nuevamente.")
+    idUbi = catalogos.ubicaciones.fila(fila.ubicacion)
+    if not idUbi:
+        raise ErrorNoRegistrado("La ubicación ingresada no está registrada. Regístrela e intente nuevamente.")
+
+    datosNuevos = _limpiar([fila.descripcion, cond, baja, fila.grupo,
+                            fila.subgrupo, fila.ubicacion])
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute(
+                    "INSERT INTO stock VALUES(NULL, ?, ?, 0, ?, 0, ?, ?)",
+                    (fila.descripcion, cond, baja, idSubgrupo[0],
+                     idUbi[0]))
+                # El id de la herramienta nueva lo da el insert, antes
+                # de que el historial use el cursor.
+                idd = cur.lastrowid
+                registrarHistorial(
+                    cur, usuario, 'Inserción', 'Stock',
+                    f'{fila.descripcion} {fila.ubicacion}', None,
+                    datosNuevos[1:])
+            else:
+                idd = fila.id
+                cur.execute(
+                    """UPDATE stock
+                    SET descripcion = ?, cant_condiciones = ?,
+                    cant_baja = ?, id_subgrupo = ?, id_ubi=?
+                    WHERE id = ?""",
+                    (fila.descripcion, cond, baja, idSubgrupo[0],
+                     idUbi[0], idd))
+                if filaVieja:
+                    datosViejos = _limpiar(filaVieja)
+                    registrarHistorial(
+                        cur, usuario, 'Edición', 'Stock',
+                        f'{datosViejos[1]} {datosViejos[9]}',
+                        datosViejos[2:], datosNuevos)
+                else:
+                    registrarHistorial(cur, usuario, 'Edición', 'Stock',
+                                       fila.descripcion, None, datosNuevos)
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido("La herramienta que desea ingresar ya está ingresada. Ingrese otra información o revise la información ya ingresada") from None
+    marcarCambio("stock", "historial")
+    return idd
+
+
+def _guardarPersonal(fila: FilaPersonal, usuario: int,
+                     filaVieja: list | None, categoria: int,
+                     gestion: str, datosNuevos: list,
+                     datosInsercion: list, mensajes: tuple) -> int:
+    """Valida y guarda a una persona y devuelve su id. Los alumnos, el
+    resto del personal y los usuarios solo se diferencian en la
+    categoría de su clase, en sus datos en el historial y en sus
+    mensajes de error (el de la clase no registrada y el del dni
+    repetido)."""
+    dni = _dni(fila.dni)
+    idClase = catalogos.clases.fila(fila.clase, categoria)
+    if not idClase:
+        raise ErrorNoRegistrado(mensajes[0])
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute(
+                    "INSERT INTO personal VALUES(NULL, ?, ?, ?, ?, ?)",
+                    (fila.nombre, dni, idClase[0], fila.usuario,
+                     fila.contrasena))
+                idd = cur.lastrowid
+                registrarHistorial(cur, usuario, 'Inserción', gestion,
+                                   fila.nombre, None, datosInsercion)
+            else:
+                idd = fila.id
+                cur.execute(
+                    """UPDATE personal
+                    SET nombre_apellido=?, id_clase=?, dni=?
+                    WHERE id = ?""",
+                    (fila.nombre, idClase[0], dni, idd))
+                registrarHistorial(
+                    cur, usuario, 'Edición', gestion,
+                    filaVieja[1] if filaVieja else fila.nombre,
+                    filaVieja[2:] if filaVieja else None, datosNuevos)
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido(mensajes[1]) from None
+    marcarCambio("personal", "historial")
+    return idd
+
+
+def guardarAlumno(fila: FilaPersonal, usuario: int,
+                  filaVieja: list | None = None) -> int:
+    """Esta función guarda un alumno nuevo o los cambios de un alumno.
+
+    Parámetros
+    ----------
+        fila: FilaPersonal
+            Los datos del alumno.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila del alumno como se muestra en la gestión alumnos,
+            antes del cambio, para el historial. Default: None.
+
+    Devuelve
+    --------
+        int: el id del alumno.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.nombre, fila.nombre, fila.clase, fila.dni)
+    datosNuevos = [fila.nombre, fila.clase, _dni(fila.dni)]
+    return _guardarPersonal(
+        fila, usuario, filaVieja, 1, 'Alumnos', datosNuevos,
+        datosNuevos[1:],
+        ("El curso ingresado no está registrado o no está vinculado correctamente a la categoría alumno. Regístrelo o revise los datos ya ingresados.",
+         "El dni ingresado ya está registrado. Regístre uno nuevo o revise la información ya ingresada."))
+
+
+def guardarOtroPersonal(fila: FilaPersonal, usuario: int,
+                        filaVieja: list | None = None) -> int:
+    """Esta función guarda a alguien nuevo del personal o sus cambios.
+
+    Parámetros
+    ----------
+        fila: FilaPersonal
+            Los datos de la persona.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila de la persona como se muestra en la gestión del
+            personal, antes del cambio, para el historial.
+            Default: None.
+
+    Devuelve
+    --------
+        int: el id de la persona.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.nombre, fila.nombre, fila.clase, fila.dni)
+    datosNuevos = [fila.nombre, fila.clase, _dni(fila.dni)]
+    return _guardarPersonal(
+        fila, usuario, filaVieja, 2, 'Personal', datosNuevos,
+        datosNuevos[1:],
+        ('La clase ingresada no está registrada o no está vinculada a la categoría "Personal". Regístrela o revise los datos ya ingresados.',
+         "El dni ingresado ya está registrado. Ingrese uno nuevo o revise la información ya ingresada."))
+
+
+def guardarUsuario(fila: FilaPersonal, usuario: int,
+                   filaVieja: list | None = None) -> int:
+    """Esta función guarda un usuario nuevo o los cambios de un
+    usuario. Al editar un usuario no se cambian su nombre de usuario
+    ni su contraseña.
+
+    Parámetros
+    ----------
+        fila: FilaPersonal
+            Los datos del usuario, con su nombre de usuario y su
+            contraseña.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila del usuario como se muestra en la gestión usuarios,
+            antes del cambio, para el historial. Default: None.
+
+    Devuelve
+    --------
+        int: el id del usuario.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.nombre, fila.nombre, fila.clase, fila.dni,
+                        fila.usuario, fila.contrasena)
+    datosNuevos = [fila.nombre, _dni(fila.dni), fila.clase, fila.usuario]
+    # El historial de los usuarios se guarda en la gestión alumnos.
+    return _guardarPersonal(
+        fila, usuario, filaVieja, 3, 'Alumnos', datosNuevos, datosNuevos,
+        ("La clase ingresada no está registrada o no está vinculada correctamente a la categoría usuario. Regístrela o revise los datos ya ingresados.",
+         "El dni ingresado ya está registrado. Regístre uno nuevo o revise la información ya ingresada."))
+
+
+def guardarGrupo(fila: FilaGrupo, usuario: int,
+                 filaVieja: list | None = None) -> int:
+    """Esta función guarda un grupo nuevo o los cambios de un grupo.
+
+    Parámetros
+    ----------
+        fila: FilaGrupo
+            Los datos del grupo.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila del grupo como se muestra en la gestión grupos,
+            antes del cambio, para el historial. Default: None.
+
+    Devuelve
+    --------
+        int: el id del grupo.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.descripcion, fila.descripcion)
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute("INSERT INTO grupos VALUES(NULL, ?)",
+                            (fila.descripcion,))
+                idd = cur.lastrowid
+                registrarHistorial(cur, usuario, 'Inserción', 'Grupos',
+                                   fila.descripcion, None, None)
+            else:
+                idd = fila.id
+                cur.execute(
+                    "UPDATE grupos SET descripcion = ? WHERE id = ?",
+                    (fila.descripcion, idd))
+                registrarHistorial(
+                    cur, usuario, 'Edición', 'Grupos',
+                    filaVieja[1] if filaVieja else fila.descripcion, None,
+                    [fila.descripcion])
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido("El grupo que desea ingresar ya está ingresado. Ingrese otro grupo o revise los datos ya ingresados.") from None
+    marcarCambio("grupos", "historial")
+    return idd
+
+
+def guardarSubgrupo(fila: FilaSubgrupo, usuario: int,
+                    filaVieja: list | None = None) -> int:
+    """Esta función guarda un subgrupo nuevo o los cambios de un
+    subgrupo.
+
+    Parámetros
+    ----------
+        fila: FilaSubgrupo
+            Los datos del subgrupo.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila del subgrupo como se muestra en la gestión
+            subgrupos, antes del cambio, para el historial.
+            Default: None.
+
+    Devuelve
+    --------
+        int: el id del subgrupo.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.descripcion, fila.descripcion, fila.grupo)
+    idGrupo = catalogos.grupos.fila(fila.grupo)
+    if not idGrupo:
+        raise ErrorNoRegistrado("El grupo ingresado no está registrado. Regístrelo e ingrese nuevamente")
+    datosNuevos = [fila.descripcion, fila.grupo]
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute("INSERT INTO subgrupos VALUES(NULL, ?, ?)",
+                            (fila.descripcion, idGrupo[0]))
+                idd = cur.lastrowid
+                registrarHistorial(cur, usuario, 'Inserción', 'Subgrupos',
+                                   fila.descripcion, None, datosNuevos[1:])
+            else:
+                idd = fila.id
+                cur.execute(
+                    """UPDATE subgrupos
+                    SET descripcion=?, id_grupo=?
+                    WHERE id = ?""",
+                    (fila.descripcion, idGrupo[0], idd))
+                registrarHistorial(
+                    cur, usuario, 'Edición', 'Subgrupos',
+                    filaVieja[1] if filaVieja else fila.descripcion,
+                    filaVieja[2:] if filaVieja else None, datosNuevos)
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido("El subgrupo ingresado ya está registrado en el grupo. Ingrese un subgrupo distinto, ingreselo en un grupo distinto o revise los datos ya ingresados.") from None
+    marcarCambio("subgrupos", "historial")
+    return idd
+
+
+def guardarUbicacion(fila: FilaUbicacion, usuario: int,
+                     filaVieja: list | None = None) -> int:
+    """Esta función guarda una ubicación nueva o los cambios de una
+    ubicación.
+
+    Parámetros
+    ----------
+        fila: FilaUbicacion
+            Los datos de la ubicación.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila de la ubicación como se muestra en la gestión
+            ubicaciones, antes del cambio, para el historial.
+            Default: None.
+
+    Devuelve
+    --------
+        int: el id de la ubicación.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    _verificarCompletos(fila.descripcion, fila.descripcion)
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute("INSERT INTO ubicaciones VALUES(NULL, ?)",
+                            (fila.descripcion,))
+                idd = cur.lastrowid
+                registrarHistorial(cur, usuario, 'Inserción',
+                                   'Ubicaciones', fila.descripcion, None,
+                                   None)
+            else:
+                idd = fila.id
+                cur.execute(
+                    """UPDATE ubicaciones
+                    SET descripcion=?
+                    WHERE id = ?""",
+                    (fila.descripcion, idd))
+                registrarHistorial(
+                    cur, usuario, 'Edición', 'Ubicaciones',
+                    filaVieja[1] if filaVieja else fila.descripcion, None,
+                    [fila.descripcion])
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido("La ubicación ingresada ya está registrada. Ingrese otra o revise los datos ya ingresados.") from None
+    marcarCambio("ubicaciones", "historial")
+    return idd
+
+
+def validarClase(fila: FilaClase) -> int:
+    """Esta función valida los datos de una clase, antes de pedir que
+    se confirme el cambio.
+
+    Parámetros
+    ----------
+        fila: FilaClase
+            Los datos de la clase.
+
+    Devuelve
+    --------
+        int: el id de la categoría de la clase.
+
+    Lanza
+    -----
+        ErrorServicio: si los datos no son válidos.
+    """
+    _verificarCompletos(fila.descripcion, fila.categoria, fila.descripcion)
+    idCat = catalogos.catsClase.fila(fila.categoria)
+    if not idCat:
+        raise ErrorNoRegistrado("La categoría ingresada no está registrada. Ingresela e intente nuevamente.")
+    return idCat[0]
+
+
+def guardarClase(fila: FilaClase, usuario: int,
+                 filaVieja: list | None = None) -> int:
+    """Esta función guarda una clase nueva o los cambios de una clase.
+    Una clase con personal no puede cambiar de categoría.
+
+    Parámetros
+    ----------
+        fila: FilaClase
+            Los datos de la clase.
+
+        usuario: int
+            El dni del usuario que guarda los datos.
+
+        filaVieja: list | None = None
+            La fila de la clase como se muestra en la gestión clases,
+            antes del cambio, para el historial. Default: None.
+
+    Devuelve
+    --------
+        int: el id de la clase.
+
+    Lanza
+    -----
+        ErrorServicio: si no se pueden guardar los datos.
+    """
+    idCat = validarClase(fila)
+    datosNuevos = [fila.descripcion, fila.categoria]
+    try:
+        with bdd.transaccion() as cur:
+            if fila.id is None:
+                cur.execute("INSERT INTO clases VALUES(NULL, ?, ?)",
+                            (fila.descripcion, idCat))
+                idd = cur.lastrowid
+                registrarHistorial(cur, usuario, 'Inserción', 'Clases',
+                                   fila.descripcion, None, datosNuevos[1:])
+            else:
+                idd = fila.id
+                # Si cambia la categoría, no puede tener personal.
+                if cur.execute(
+                        """SELECT 1 FROM clases c
+                        WHERE c.id = ? AND c.id_cat != ? AND EXISTS (
+                            SELECT 1 FROM personal p
+                            WHERE p.id_clase = c.id)""",
+                        (idd, idCat)).fetchone():
+                    raise ErrorRelaciones("La clase que desea cambiar de categoría tiene personal relacionado. Por motivos de seguridad, debe eliminar primero el personal relacionado antes de modificar la categoría de la clase.")
+                cur.execute(
+                    """UPDATE clases
+                    SET descripcion=?,
+                    id_cat=?
+                    WHERE id = ?""",
+                    (fila.descripcion, idCat, idd))
+                registrarHistorial(
+                    cur, usuario, 'Edición', 'Clases',
+                    filaVieja[1] if filaVieja else fila.descripcion,
+                    filaVieja[2:] if filaVieja else None, datosNuevos)
+    except sqlite3.IntegrityError:
+        raise ErrorRepetido("La clase ingresada ya está registrada. Ingrese otra o revise los datos ya ingresados.") from None
+    marcarCambio("clases", "historial")
+    return idd
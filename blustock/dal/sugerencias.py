@@ -0,0 +1,127 @@
+"""Este módulo contiene el caché de sugerencias de los campos con
+sugerencia de la gestión stock.
+
+En lugar de consultar la base de datos y crear una lista de
+sugerencias por cada fila de la tabla, hay un único modelo por dominio
+(grupos, ubicaciones y subgrupos de cada grupo) que comparten todos los
+campos. Cuando los datos cambian, los modelos se actualizan en el lugar
+y los campos que los usan ven las sugerencias nuevas.
+
+Clases
+------
+    CacheSugerencias():
+        Guarda los modelos de sugerencias compartidos.
+"""
+from PyQt6 import QtCore
+from db.bdd import bdd
+
+
+class CacheSugerencias():
+    """Esta clase guarda los modelos de sugerencias compartidos de
+    grupos, ubicaciones y subgrupos.
+
+    Los datos se cargan la primera vez que se piden, con una consulta
+    por dominio, sin importar cuántas filas tenga la tabla.
+
+    Métodos
+    -------
+        grupos(self) -> QtCore.QStringListModel:
+            Devuelve el modelo de sugerencias de grupos.
+
+        ubicaciones(self) -> QtCore.QStringListModel:
+            Devuelve el modelo de sugerencias de ubicaciones.
+
+        subgrupos(self, grupo: str) -> QtCore.QStringListModel:
+            Devuelve el modelo de sugerencias de los subgrupos de un
+            grupo.
+
+        invalidar(self):
+            Vuelve a cargar las sugerencias de todos los modelos.
+    """
+    def __init__(self):
+        """El constructor, inicializa el caché vacío."""
+        self._grupos = None
+        self._ubicaciones = None
+        # Los modelos de subgrupos, por grupo en minúsculas.
+        self._subgrupos = {}
+        # Las listas de subgrupos de cada grupo, en minúsculas.
+        self._listasSubgrupos = None
+
+    def _listaGrupos(self) -> list:
+        return [i[0] for i in bdd.cur.execute(
+            'SELECT descripcion FROM grupos').fetchall()]
+
+    def _listaUbicaciones(self) -> list:
+        return [i[0] for i in bdd.cur.execute(
+            'SELECT descripcion FROM ubicaciones').fetchall()]
+
+    def _cargarSubgrupos(self):
+        """Carga los subgrupos de todos los grupos en una consulta."""
+        self._listasSubgrupos = {}
+        for grupo, subgrupo in bdd.cur.execute('''
+                SELECT g.descripcion, s.descripcion FROM subgrupos s
+                JOIN grupos g ON s.id_grupo = g.id''').fetchall():
+            self._listasSubgrupos.setdefault(
+                str(grupo).casefold(), []).append(subgrupo)
+
+    def grupos(self) -> QtCore.QStringListModel:
+        """Este método devuelve el modelo de sugerencias de grupos.
+
+        Devuelve
+        --------
+            QtCore.QStringListModel: el modelo compartido.
+        """
+        if self._grupos is None:
+            self._grupos = QtCore.QStringListModel(self._listaGrupos())
+        return self._grupos
+
+    def ubicaciones(self) -> QtCore.QStringListModel:
+        """Este método devuelve el modelo de sugerencias de
+        ubicaciones.
+
+        Devuelve
+        --------
+            QtCore.QStringListModel: el modelo compartido.
+        """
+        if self._ubicaciones is None:
+            self._ubicaciones = QtCore.QStringListModel(
+                self._listaUbicaciones())
+        return self._ubicaciones
+
+    def subgrupos(self, grupo: str) -> QtCore.QStringListModel:
+        """Este método devuelve el modelo de sugerencias de los
+        subgrupos de un grupo. Todas las filas con el mismo grupo
+        comparten el mismo modelo.
+
+        Parámetros
+        ----------
+            grupo: str
+                La descripción del grupo. No distingue mayúsculas.
+
+        Devuelve
+        --------
+            QtCore.QStringListModel: el modelo compartido.
+        """
+        if self._listasSubgrupos is None:
+            self._cargarSubgrupos()
+        clave = str(grupo).casefold()
+        if clave not in self._subgrupos:
+            self._subgrupos[clave] = QtCore.QStringListModel(
+                self._listasSubgrupos.get(clave, []))
+        return self._subgrupos[clave]
+
+    def invalidar(self):
+        """Este método vuelve a cargar las sugerencias de los modelos
+        que ya se crearon. Se actualizan los mismos modelos, así los
+        campos que los usan no tienen que volver a crearse."""
+        if self._grupos is not None:
+            self._grupos.setStringList(self._listaGrupos())
+        if self._ubicaciones is not None:
+            self._ubicaciones.setStringList(self._listaUbicaciones())
+        if self._listasSubgrupos is not None:
+            self._cargarSubgrupos()
+            for clave, modelo in self._subgrupos.items():
+                modelo.setStringList(self._listasSubgrupos.get(clave, []))
+
+
+sugerencias = CacheSugerencias()
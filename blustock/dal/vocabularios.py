@@ -0,0 +1,124 @@
+"""Este módulo contiene la caché de las opciones de las listas de
+filtros de los listados (los elementos, personas y pañoleros de los
+movimientos y las gestiones del historial).
+
+Estas opciones salen de consultas DISTINCT sobre tablas grandes y solo
+cambian cuando se escribe en esas tablas. Cada tabla tiene un número de
+generación que los métodos que escriben en ella incrementan con
+marcarCambio. Una lista de opciones se vuelve a consultar solo si
+cambió la generación de alguna de sus tablas; si no, se usa la que ya
+estaba guardada.
+
+Clases
+------
+    CacheVocabularios():
+        Guarda las opciones de cada lista de filtros junto con la
+        generación de sus tablas.
+
+Funciones
+---------
+    marcarCambio(*tablas: str):
+        Incrementa la generación de las tablas en las que se escribió.
+
+    generacion(tablas: tuple) -> int:
+        Devuelve la generación de un conjunto de tablas.
+
+Variables
+---------
+    generaciones: dict
+        La generación de cada tabla.
+
+    VOCABULARIOS: dict
+        Las tablas de las que depende cada lista de opciones. La
+        consulta de cada lista está en dal/queries/vocabularios.
+
+    vocabularios: CacheVocabularios
+        La caché que usa la aplicación.
+"""
+from db.bdd import bdd
+from dal.consultas import consultas
+
+generaciones = {}
+
+VOCABULARIOS = {
+    "elementos": ("movimientos", "stock"),
+    "personas": ("movimientos", "personal", "clases"),
+    "panoleros": ("movimientos", "turnos", "personal", "clases"),
+    "gestiones": ("historial",),
+}
+
+
+def marcarCambio(*tablas: str):
+    """Esta función incrementa la generación de las tablas en las que
+    se escribió. La llaman los métodos que insertan, editan o eliminan
+    filas.
+
+    Parámetros
+    ----------
+        *tablas: str
+            Los nombres de las tablas modificadas.
+    """
+    for tabla in tablas:
+        generaciones[tabla] = generaciones.get(tabla, 0) + 1
+
+
+def generacion(tablas: tuple) -> int:
+    """Esta función devuelve la generación de un conjunto de tablas.
+    Como las generaciones solo crecen, la suma cambia cada vez que se
+    escribe en alguna de las tablas.
+
+    Parámetros
+    ----------
+        tablas: tuple
+            Los nombres de las tablas.
+
+    Devuelve
+    --------
+        int: la generación del conjunto.
+    """
+    return sum(generaciones.get(tabla, 0) for tabla in tablas)
+
+
+class CacheVocabularios():
+    """Esta clase guarda las opciones de cada lista de filtros junto
+    con la generación de las tablas de las que salieron.
+
+    Atributos
+    ---------
+        guardados: dict
+            La generación y las opciones de cada lista ya consultada.
+
+    Métodos
+    -------
+        obtener(self, nombre: str) -> tuple:
+            Devuelve la generación y las opciones de una lista.
+    """
+    def __init__(self):
+        self.guardados = {}
+
+    def obtener(self, nombre: str) -> tuple:
+        """Este método devuelve la generación y las opciones de una
+        lista. Solo consulta la base de datos si cambió alguna de las
+        tablas de la lista desde la última vez.
+
+        Parámetros
+        ----------
+            nombre: str
+                El nombre de la lista, una clave de VOCABULARIOS.
+
+        Devuelve
+        --------
+            tuple: la generación y la lista de opciones.
+        """
+        actual = generacion(VOCABULARIOS[nombre])
+        guardado = self.guardados.get(nombre)
+        if guardado is not None and guardado[0] == actual:
+            return guardado
+        sql, parametros = consultas.obtener(
+            f"vocabularios/{nombre}").preparar()
+        opciones = [fila[0] for fila in bdd.cur.execute(sql, parametros)]
+        self.guardados[nombre] = (actual, opciones)
+        return self.guardados[nombre]
+
+
+vocabularios = CacheVocabularios()
@@ -1,28 +1,398 @@
-"""Este módulo contiene una clase que crea la conexión y el cursor de
-la base de datos.
+"""Este módulo contiene una clase que reparte las conexiones a la base
+de datos entre los hilos de la app.
 
 Clases
 ------
     BDD():
-        Crea la base de datos y su cursor correspondiente.
+        Da a cada hilo su propia conexión y su propio cursor.
+
+Funciones
+---------
+    conectar(soloLectura: bool = False,
+             perfil: str = "kiosco") -> sqlite3.Connection:
+        Abre una conexión nueva a la base de datos.
+
+    aplicarPerfil(con: sqlite3.Connection, perfil: str):
+        Configura una conexión según un perfil.
+
+    transaccion(con: sqlite3.Connection):
+        Ejecuta un bloque de código en una sola transacción.
+
+    aplicarMigraciones(con: sqlite3.Connection) -> int:
+        Aplica a la base de datos las migraciones que todavía no se
+        aplicaron.
+
+Variables
+---------
+    PERFILES: dict
+        La configuración de las conexiones según su uso.
+
+    CACHE_SENTENCIAS: int
+        La cantidad de sentencias preparadas que guarda cada conexión.
+
+    bdd: BDD
+        La instancia que usa la aplicación.
 """
 import sqlite3 as db
+import contextlib
+import importlib.util
 import os
+import threading
+
+# La carpeta con las migraciones. Cada archivo se llama
+# NNN_descripcion.sql, donde NNN es el número de versión que deja la
+# base de datos después de aplicarlo. Las migraciones que necesitan
+# python (por ejemplo, para convertir datos) se llaman
+# NNN_descripcion.py y tienen una función migrar(con).
+CARPETA_MIGRACIONES = f"db{os.sep}migraciones"
+# La ruta del archivo de la base de datos.
+RUTA_BDD = f"db{os.sep}blustock.sqlite3"
+# La configuración de las conexiones, según su uso, como PRAGMAs de
+# sqlite:
+#   - kiosco: la conexión principal de la app, que hace muchas
+#     consultas y escrituras chicas.
+#   - importacion: la carga de planillas, que escribe miles de filas
+#     en pocas transacciones grandes.
+#   - reportes: los hilos que leen listados y exportaciones, que
+#     recorren tablas enteras y nunca escriben.
+# Con journal_mode=WAL las lecturas no bloquean a las escrituras ni al
+# revés, y con synchronous=NORMAL cada commit no espera a que el disco
+# confirme la escritura: si se corta la luz se pueden perder los
+# últimos commits, pero la base nunca queda dañada. WAL queda guardado
+# en el archivo de la base, así que las conexiones de solo lectura no
+# lo configuran. cache_size negativo es en KiB y mmap_size, en bytes.
+PERFILES = {
+    "kiosco": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -8000,
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "busy_timeout": 5000,
+    },
+    "importacion": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+        "busy_timeout": 30000,
+    },
+    "reportes": {
+        "query_only": "ON",
+        "cache_size": -16000,
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+# sqlite3 guarda 128 sentencias preparadas por conexión. La app arma
+# muchas consultas distintas (una por listado, filtro y orden), así que
+# guardamos más para no volver a prepararlas.
+CACHE_SENTENCIAS = 512
+
+
+def conectar(soloLectura: bool = False,
+             perfil: str = "kiosco") -> db.Connection:
+    """Esta función abre una conexión nueva a la base de datos,
+    configurada según un perfil.
+
+    Parámetros
+    ----------
+        soloLectura: bool = False
+            Si la conexión solo puede leer. Las conexiones de los
+            hilos de consulta son de solo lectura, así nunca escriben
+            por error fuera de la conexión principal.
+            Default: False.
+
+        perfil: str = "kiosco"
+            El nombre del perfil de la conexión, de PERFILES.
+            Default: "kiosco".
+
+    Devuelve
+    --------
+        sqlite3.Connection: la conexión.
+    """
+    if soloLectura:
+        con = db.connect(f"file:{RUTA_BDD}?mode=ro", uri=True,
+                         cached_statements=CACHE_SENTENCIAS)
+    else:
+        con = db.connect(RUTA_BDD, cached_statements=CACHE_SENTENCIAS)
+    aplicarPerfil(con, perfil)
+    return con
+
+
+def aplicarPerfil(con: db.Connection, perfil: str):
+    """Esta función configura una conexión según un perfil. Se puede
+    usar para cambiar el perfil de una conexión abierta, siempre que
+    no esté en una transacción.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos.
+
+        perfil: str
+            El nombre del perfil, de PERFILES.
+
+    Lanza
+    -----
+        KeyError: si el perfil no existe.
+    """
+    for pragma, valor in PERFILES[perfil].items():
+        con.execute(f"PRAGMA {pragma} = {valor}")
+
+
+@contextlib.contextmanager
+def transaccion(con: db.Connection):
+    """Esta función ejecuta un bloque de código en una sola transacción
+    de una conexión. Se usa con with:
+
+        with transaccion(con) as cur:
+            cur.execute(...)
+
+    La transacción empieza con BEGIN IMMEDIATE, que reserva la
+    escritura desde el principio, así ninguna otra conexión puede
+    cambiar los datos entre las verificaciones y los cambios. Si el
+    bloque termina bien, se hace un solo commit; si lanza una
+    excepción, se deshacen todos sus cambios.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos.
+
+    Devuelve
+    --------
+        sqlite3.Cursor: un cursor de la conexión.
+    """
+    # Si quedaron cambios sin confirmar de antes, los confirmamos para
+    # que no se mezclen con los de esta transacción.
+    if con.in_transaction:
+        con.commit()
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        yield con.cursor()
+    except BaseException:
+        con.rollback()
+        raise
+    con.commit()
+
+
+def aplicarMigraciones(con: db.Connection) -> int:
+    """Esta función aplica las migraciones de la carpeta
+    db/migraciones que todavía no se aplicaron a la base de datos.
+
+    La versión de la base de datos se guarda en PRAGMA user_version.
+    Cada migración se aplica en su propia transacción junto con el
+    cambio de versión, así que si falla la base queda como estaba.
+    Mientras se migra no se verifican las claves foráneas, porque para
+    cambiar una tabla hay que crearla de nuevo y copiar sus datos.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos.
+
+    Devuelve
+    --------
+        int: la versión de la base de datos después de migrar.
+    """
+    version = con.execute("PRAGMA user_version").fetchone()[0]
+    migraciones = []
+    for archivo in os.listdir(CARPETA_MIGRACIONES):
+        numero = archivo.split("_")[0]
+        if archivo.endswith((".sql", ".py")) and numero.isdigit():
+            migraciones.append((int(numero), archivo))
+    clavesForaneas = con.execute("PRAGMA foreign_keys").fetchone()[0]
+    con.execute("PRAGMA foreign_keys = OFF")
+    try:
+        version = _migrar(con, version, sorted(migraciones))
+    finally:
+        con.execute(f"PRAGMA foreign_keys = {clavesForaneas}")
+    return version
+
+
+def _migrar(con: db.Connection, version: int, migraciones: list) -> int:
+    """Aplica las migraciones posteriores a la versión y devuelve la
+    versión final."""
+    for numero, archivo in migraciones:
+        if numero <= version:
+            continue
+        ruta = os.path.join(CARPETA_MIGRACIONES, archivo)
+        try:
+            if archivo.endswith(".py"):
+                # Cargamos el módulo desde el archivo, porque su nombre
+                # empieza con un número y no se puede importar.
+                spec = importlib.util.spec_from_file_location(
+                    f"migracion{numero}", ruta)
+                modulo = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(modulo)
+                con.execute("BEGIN")
+                modulo.migrar(con)
+                con.execute(f"PRAGMA user_version = {numero}")
+                con.commit()
+            else:
+                with open(ruta, 'r') as script:
+                    sql = script.read()
+                con.executescript(
+                    f"BEGIN;\n{sql}\nPRAGMA user_version = {numero};\nCOMMIT;")
+        except Exception:
+            # Si algo falló, deshacemos la migración entera.
+            if con.in_transaction:
+                con.rollback()
+            raise
+        version = numero
+    return version
+
 
 class BDD():
-    """Esta clase crea la base de datos y su cursor correspondiente.
-    
+    """Esta clase reparte las conexiones a la base de datos entre los
+    hilos de la app. Cada hilo tiene su propia conexión (y, si la
+    pide, su propia conexión de solo lectura), que se crea la primera
+    vez que la usa. sqlite no permite usar una conexión desde otro
+    hilo, así que ningún hilo pisa las consultas ni las transacciones
+    de otro.
+
+    Atributos
+    ---------
+        con: sqlite3.Connection
+            La conexión del hilo que la pide.
+
+        cur: sqlite3.Cursor
+            El cursor de la conexión del hilo que lo pide.
+
     Métodos
     -------
         __init__(self):
-            El constructor, inicializa la conexión y el cursor.
+            El constructor, crea la conexión del hilo principal y
+            aplica las migraciones pendientes.
+
+        conexion(self, soloLectura: bool = False,
+                 perfil: str | None = None) -> sqlite3.Connection:
+            Devuelve una conexión del hilo que la pide.
+
+        transaccion(self):
+            Ejecuta un bloque de código en una sola transacción.
+
+        lectura(self, perfil: str = "reportes"):
+            Ejecuta varias consultas sobre los mismos datos.
+
+        cerrar(self):
+            Cierra las conexiones del hilo que lo pide.
     """
     def __init__(self):
-        """El constructor, inicializa la conexión y el cursor."""
-        # Se conecta a la base de datos
-        self.con = db.Connection(
-            f"db{os.sep}blustock.sqlite3")
-        # Crea el cursor
-        self.cur = self.con.cursor()
-
-bdd = BDD()
\ No newline at end of file
+        """El constructor, crea la conexión del hilo principal y aplica
+        las migraciones pendientes."""
+        # Las conexiones de cada hilo. threading.local guarda un valor
+        # distinto para cada hilo que lo usa.
+        self._hilos = threading.local()
+        # Actualiza la estructura de la base de datos
+        aplicarMigraciones(self.con)
+
+    @property
+    def con(self) -> db.Connection:
+        return self.conexion()
+
+    @property
+    def cur(self) -> db.Cursor:
+        # Cada hilo usa siempre el mismo cursor, porque hay código que
+        # ejecuta una consulta y después pide sus resultados al cursor.
+        cursor = getattr(self._hilos, "cursor", None)
+        if cursor is None:
+            cursor = self._hilos.cursor = self.conexion().cursor()
+        return cursor
+
+    def conexion(self, soloLectura: bool = False,
+                 perfil: str | None = None) -> db.Connection:
+        """Este método devuelve una conexión del hilo que la pide. Si
+        el hilo todavía no la tiene, la abre.
+
+        Parámetros
+        ----------
+            soloLectura: bool = False
+                Si se pide la conexión de solo lectura del hilo.
+                Default: False.
+
+            perfil: str | None = None
+                El perfil de la conexión, de PERFILES. Si la conexión
+                ya estaba abierta con otro perfil, se lo cambia. Si es
+                None, las conexiones nuevas se abren con "kiosco" o,
+                las de solo lectura, con "reportes". Default: None.
+
+        Devuelve
+        --------
+            sqlite3.Connection: la conexión.
+        """
+        conexiones = getattr(self._hilos, "conexiones", None)
+        if conexiones is None:
+            conexiones = self._hilos.conexiones = {}
+        if soloLectura not in conexiones:
+            perfilNuevo = perfil or ("reportes" if soloLectura else "kiosco")
+            conexiones[soloLectura] = (
+                conectar(soloLectura, perfilNuevo), perfilNuevo)
+        con, perfilActual = conexiones[soloLectura]
+        if perfil is not None and perfil != perfilActual:
+            aplicarPerfil(con, perfil)
+            conexiones[soloLectura] = (con, perfil)
+        return con
+
+    @contextlib.contextmanager
+    def transaccion(self):
+        """Este método ejecuta un bloque de código en una sola
+        transacción de la conexión del hilo (ver la función
+        transaccion). Se usa con with:
+
+            with bdd.transaccion() as cur:
+                cur.execute(...)
+
+        Devuelve
+        --------
+            sqlite3.Cursor: el cursor de la base de datos.
+        """
+        with transaccion(self.con):
+            yield self.cur
+
+    @contextlib.contextmanager
+    def lectura(self, perfil: str = "reportes"):
+        """Este método ejecuta varias consultas en una sola transacción
+        de lectura, con la conexión de solo lectura del hilo. Se usa con
+        with:
+
+            with bdd.lectura() as cur:
+                total = cur.execute("SELECT count(*) ...").fetchone()
+                filas = cur.execute("SELECT ...")
+
+        Como la base de datos usa WAL, todas las consultas del bloque
+        ven los mismos datos aunque otro hilo los cambie mientras tanto,
+        y no bloquean a las escrituras.
+
+        Parámetros
+        ----------
+            perfil: str = "reportes"
+                El perfil de la conexión, de PERFILES.
+                Default: "reportes".
+
+        Devuelve
+        --------
+            sqlite3.Cursor: un cursor de la conexión de solo lectura.
+        """
+        con = self.conexion(soloLectura=True, perfil=perfil)
+        con.execute("BEGIN")
+        try:
+            yield con.cursor()
+        finally:
+            con.rollback()
+
+    def cerrar(self):
+        """Este método cierra las conexiones del hilo que lo pide. Los
+        hilos que terminan lo tienen que llamar antes de terminar, para
+        no dejar conexiones abiertas."""
+        for con, _ in getattr(self._hilos, "conexiones", {}).values():
+            con.close()
+        self._hilos.conexiones = {}
+        self._hilos.cursor = None
+
+bdd = BDD()
@@ -0,0 +1,65 @@
+"""Este módulo contiene el formato con el que se guardan las fechas y
+horas en la base de datos y las funciones para generarlas.
+
+Todas las fechas se guardan como texto ISO 8601 ("AAAA-MM-DD
+HH:MM:SS"), el mismo formato que usan las funciones de fecha de
+sqlite. Ordenar los textos en este formato es lo mismo que ordenar las
+fechas, así que los rangos de fechas se resuelven con los índices.
+
+Funciones
+---------
+    ahora() -> str:
+        Devuelve la fecha y hora actual en el formato de la base de
+        datos.
+
+    textoFecha(fecha: datetime.date | datetime.datetime,
+               final: bool = False) -> str:
+        Convierte una fecha en el texto con el que se guarda en la base
+        de datos.
+
+Variables
+---------
+    FORMATO_FECHA: str
+        El formato de las fechas y horas de la base de datos, para
+        strftime.
+"""
+import datetime
+
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+
+
+def ahora() -> str:
+    """Esta función devuelve la fecha y hora actual en el formato de
+    la base de datos. Es la que usan todos los registros que guardan
+    una fecha.
+
+    Devuelve
+    --------
+        str: la fecha y hora actual.
+    """
+    return datetime.datetime.now().strftime(FORMATO_FECHA)
+
+
+def textoFecha(fecha: datetime.date | datetime.datetime,
+               final: bool = False) -> str:
+    """Esta función convierte una fecha en el texto con el que se
+    guarda en la base de datos, para usarla como límite de un rango.
+
+    Parámetros
+    ----------
+        fecha: datetime.date | datetime.datetime
+            La fecha. Si no tiene hora, se usa el principio del día o,
+            si final es True, el final del día.
+
+        final: bool = False
+            Si la fecha es el final del rango.
+            Default: False.
+
+    Devuelve
+    --------
+        str: el texto de la fecha.
+    """
+    if not isinstance(fecha, datetime.datetime):
+        hora = datetime.time.max if final else datetime.time.min
+        fecha = datetime.datetime.combine(fecha, hora)
+    return fecha.strftime(FORMATO_FECHA)
@@ -0,0 +1,114 @@
+-- Índices de búsqueda de texto completo (FTS5) usados por las barras de
+-- búsqueda de las gestiones. Son tablas de contenido externo: el texto
+-- se lee de la tabla original y los triggers mantienen el índice al
+-- día. El tokenizador ignora mayúsculas y tildes, y los índices de
+-- prefijo aceleran las búsquedas de tipo "palabra*".
+
+-- Stock: descripción de la herramienta.
+CREATE VIRTUAL TABLE IF NOT EXISTS stock_fts USING fts5(
+    descripcion,
+    content='stock', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS stock_fts_ai AFTER INSERT ON stock BEGIN
+    INSERT INTO stock_fts(rowid, descripcion)
+    VALUES (new.id, new.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS stock_fts_ad AFTER DELETE ON stock BEGIN
+    INSERT INTO stock_fts(stock_fts, rowid, descripcion)
+    VALUES ('delete', old.id, old.descripcion);
+END;
+CREATE TRIGGER IF NOT EXISTS stock_fts_au
+AFTER UPDATE OF id, descripcion ON stock BEGIN
+    INSERT INTO stock_fts(stock_fts, rowid, descripcion)
+    VALUES ('delete', old.id, old.descripcion);
+    INSERT INTO stock_fts(rowid, descripcion)
+    VALUES (new.id, new.descripcion);
+END;
+
+-- Personal: nombre, dni y usuario.
+CREATE VIRTUAL TABLE IF NOT EXISTS personal_fts USING fts5(
+    nombre_apellido, dni, usuario,
+    content='personal', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS personal_fts_ai AFTER INSERT ON personal BEGIN
+    INSERT INTO personal_fts(rowid, nombre_apellido, dni, usuario)
+    VALUES (new.id, new.nombre_apellido, new.dni, new.usuario);
+END;
+CREATE TRIGGER IF NOT EXISTS personal_fts_ad AFTER DELETE ON personal BEGIN
+    INSERT INTO personal_fts(personal_fts, rowid, nombre_apellido, dni,
+                             usuario)
+    VALUES ('delete', old.id, old.nombre_apellido, old.dni, old.usuario);
+END;
+CREATE TRIGGER IF NOT EXISTS personal_fts_au
+AFTER UPDATE OF id, nombre_apellido, dni, usuario ON personal BEGIN
+    INSERT INTO personal_fts(personal_fts, rowid, nombre_apellido, dni,
+                             usuario)
+    VALUES ('delete', old.id, old.nombre_apellido, old.dni, old.usuario);
+    INSERT INTO personal_fts(rowid, nombre_apellido, dni, usuario)
+    VALUES (new.id, new.nombre_apellido, new.dni, new.usuario);
+END;
+
+-- Movimientos: motivo y fecha.
+CREATE VIRTUAL TABLE IF NOT EXISTS movimientos_fts USING fts5(
+    descripcion, fecha_hora,
+    content='movimientos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS movimientos_fts_ai
+AFTER INSERT ON movimientos BEGIN
+    INSERT INTO movimientos_fts(rowid, descripcion, fecha_hora)
+    VALUES (new.id, new.descripcion, new.fecha_hora);
+END;
+CREATE TRIGGER IF NOT EXISTS movimientos_fts_ad
+AFTER DELETE ON movimientos BEGIN
+    INSERT INTO movimientos_fts(movimientos_fts, rowid, descripcion,
+                                fecha_hora)
+    VALUES ('delete', old.id, old.descripcion, old.fecha_hora);
+END;
+CREATE TRIGGER IF NOT EXISTS movimientos_fts_au
+AFTER UPDATE OF id, descripcion, fecha_hora ON movimientos BEGIN
+    INSERT INTO movimientos_fts(movimientos_fts, rowid, descripcion,
+                                fecha_hora)
+    VALUES ('delete', old.id, old.descripcion, old.fecha_hora);
+    INSERT INTO movimientos_fts(rowid, descripcion, fecha_hora)
+    VALUES (new.id, new.descripcion, new.fecha_hora);
+END;
+
+-- Historial: fecha, fila afectada y datos viejos y nuevos.
+CREATE VIRTUAL TABLE IF NOT EXISTS historial_fts USING fts5(
+    fecha_hora, id_fila, datos_viejos, datos_nuevos,
+    content='historial', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS historial_fts_ai AFTER INSERT ON historial BEGIN
+    INSERT INTO historial_fts(rowid, fecha_hora, id_fila, datos_viejos,
+                              datos_nuevos)
+    VALUES (new.rowid, new.fecha_hora, new.id_fila, new.datos_viejos,
+            new.datos_nuevos);
+END;
+CREATE TRIGGER IF NOT EXISTS historial_fts_ad AFTER DELETE ON historial BEGIN
+    INSERT INTO historial_fts(historial_fts, rowid, fecha_hora, id_fila,
+                              datos_viejos, datos_nuevos)
+    VALUES ('delete', old.rowid, old.fecha_hora, old.id_fila,
+            old.datos_viejos, old.datos_nuevos);
+END;
+CREATE TRIGGER IF NOT EXISTS historial_fts_au
+AFTER UPDATE OF fecha_hora, id_fila, datos_viejos, datos_nuevos
+ON historial BEGIN
+    INSERT INTO historial_fts(historial_fts, rowid, fecha_hora, id_fila,
+                              datos_viejos, datos_nuevos)
+    VALUES ('delete', old.rowid, old.fecha_hora, old.id_fila,
+            old.datos_viejos, old.datos_nuevos);
+    INSERT INTO historial_fts(rowid, fecha_hora, id_fila, datos_viejos,
+                              datos_nuevos)
+    VALUES (new.rowid, new.fecha_hora, new.id_fila, new.datos_viejos,
+            new.datos_nuevos);
+END;
+
+-- Llenamos los índices con los datos que ya había en las tablas.
+INSERT INTO stock_fts(stock_fts) VALUES ('rebuild');
+INSERT INTO personal_fts(personal_fts) VALUES ('rebuild');
+INSERT INTO movimientos_fts(movimientos_fts) VALUES ('rebuild');
+INSERT INTO historial_fts(historial_fts) VALUES ('rebuild');
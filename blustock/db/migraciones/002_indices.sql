@@ -0,0 +1,40 @@
+-- Índices sobre las claves foráneas y las columnas que se usan para
+-- filtrar y ordenar. Sin ellos, cada búsqueda por relación (por
+-- ejemplo, los movimientos de una herramienta o los turnos de un
+-- pañolero) recorre la tabla entera.
+
+-- Movimientos
+CREATE INDEX IF NOT EXISTS movimientos_id_elem ON movimientos(id_elem);
+CREATE INDEX IF NOT EXISTS movimientos_id_persona ON movimientos(id_persona);
+CREATE INDEX IF NOT EXISTS movimientos_id_turno ON movimientos(id_turno);
+CREATE INDEX IF NOT EXISTS movimientos_id_estado ON movimientos(id_estado);
+CREATE INDEX IF NOT EXISTS movimientos_id_tipo ON movimientos(id_tipo);
+CREATE INDEX IF NOT EXISTS movimientos_fecha_hora ON movimientos(fecha_hora);
+
+-- Turnos
+CREATE INDEX IF NOT EXISTS turnos_fecha_egr ON turnos(fecha_egr);
+CREATE INDEX IF NOT EXISTS turnos_id_panolero ON turnos(id_panolero);
+CREATE INDEX IF NOT EXISTS turnos_id_prof_ing ON turnos(id_prof_ing);
+CREATE INDEX IF NOT EXISTS turnos_id_prof_egr ON turnos(id_prof_egr);
+CREATE INDEX IF NOT EXISTS turnos_id_ubi ON turnos(id_ubi);
+
+-- Reparaciones
+CREATE INDEX IF NOT EXISTS reparaciones_id_herramienta
+ON reparaciones(id_herramienta);
+CREATE INDEX IF NOT EXISTS reparaciones_id_usuario
+ON reparaciones(id_usuario);
+
+-- Historial: el filtro por gestión siempre se ordena por fecha.
+CREATE INDEX IF NOT EXISTS historial_id_gest_fecha_hora
+ON historial(id_gest, fecha_hora);
+CREATE INDEX IF NOT EXISTS historial_fecha_hora ON historial(fecha_hora);
+CREATE INDEX IF NOT EXISTS historial_id_usuario ON historial(id_usuario);
+
+-- Stock, subgrupos, personal y clases
+CREATE INDEX IF NOT EXISTS stock_id_subgrupo ON stock(id_subgrupo);
+CREATE INDEX IF NOT EXISTS stock_id_ubi ON stock(id_ubi);
+CREATE INDEX IF NOT EXISTS subgrupos_id_grupo ON subgrupos(id_grupo);
+CREATE INDEX IF NOT EXISTS personal_id_clase ON personal(id_clase);
+CREATE INDEX IF NOT EXISTS clases_id_cat ON clases(id_cat);
+
+ANALYZE;
@@ -0,0 +1,9 @@
+-- Índices de las fechas por las que se filtran los listados de turnos y
+-- reparaciones, así el rango de fechas se resuelve en sqlite. Las
+-- fechas de movimientos e historial ya tienen índice.
+
+CREATE INDEX IF NOT EXISTS turnos_fecha_ing ON turnos(fecha_ing);
+CREATE INDEX IF NOT EXISTS reparaciones_fecha_envio ON reparaciones(fecha_envio);
+CREATE INDEX IF NOT EXISTS reparaciones_fecha_regreso ON reparaciones(fecha_regreso);
+
+ANALYZE;
@@ -0,0 +1,26 @@
+-- Pasamos todas las fechas al formato ISO 8601 ("AAAA-MM-DD HH:MM:SS"
+-- o "AAAA-MM-DD" si no tienen hora), el que usa db/fechas.py. Antes se
+-- guardaban como "AAAA/MM/DD HH:MM:SS" y algunos cierres de turno como
+-- "DD/MM/AAAA HH:MM:SS", que no se puede comparar como texto.
+
+-- Primero las fechas con el día adelante...
+UPDATE turnos
+SET fecha_egr = substr(fecha_egr, 7, 4) || '-' || substr(fecha_egr, 4, 2)
+    || '-' || substr(fecha_egr, 1, 2) || substr(fecha_egr, 11)
+WHERE fecha_egr GLOB '[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]*';
+
+-- ...y después las que tienen el año adelante.
+UPDATE movimientos SET fecha_hora = replace(fecha_hora, '/', '-')
+WHERE fecha_hora GLOB '[0-9][0-9][0-9][0-9]/*';
+UPDATE turnos SET fecha_ing = replace(fecha_ing, '/', '-')
+WHERE fecha_ing GLOB '[0-9][0-9][0-9][0-9]/*';
+UPDATE turnos SET fecha_egr = replace(fecha_egr, '/', '-')
+WHERE fecha_egr GLOB '[0-9][0-9][0-9][0-9]/*';
+UPDATE reparaciones SET fecha_envio = replace(fecha_envio, '/', '-')
+WHERE fecha_envio GLOB '[0-9][0-9][0-9][0-9]/*';
+UPDATE reparaciones SET fecha_regreso = replace(fecha_regreso, '/', '-')
+WHERE fecha_regreso GLOB '[0-9][0-9][0-9][0-9]/*';
+UPDATE historial SET fecha_hora = replace(fecha_hora, '/', '-')
+WHERE fecha_hora GLOB '[0-9][0-9][0-9][0-9]/*';
+
+ANALYZE;
@@ -0,0 +1,229 @@
+"""Esta migración guarda los datos del historial como listas JSON y
+agrega la columna descripcion, con la descripción de cada cambio ya
+armada.
+
+Antes, los datos viejos y nuevos se guardaban como textos separados por
+";" (con un ";" al final) y la descripción se armaba cada vez que se
+abría el historial.
+
+Las plantillas de las descripciones y las funciones que las arman son
+una copia de las de dal/historial.py al escribir esta migración, así la
+migración siempre deja las mismas descripciones, aunque después cambien
+las de la app.
+
+Funciones
+---------
+    datosLegados(texto: str | None) -> list | None:
+        Separa los datos guardados en el formato anterior.
+
+    textoDatos(datos: list | tuple | None) -> str | None:
+        Convierte una lista de datos en el texto JSON que se guarda.
+
+    describirCambio(gestion: str, tipo: str, fila,
+                    datosViejos: list | tuple | None = None,
+                    datosNuevos: list | tuple | None = None) -> str:
+        Arma la descripción de un cambio.
+
+    migrar(con: sqlite3.Connection):
+        Convierte los datos del historial y arma sus descripciones.
+
+Variables
+---------
+    PLANTILLAS: dict
+        La plantilla de la descripción de cada gestión y tipo de
+        cambio.
+"""
+import json
+import sqlite3
+from textwrap import dedent
+
+# Cada plantilla recibe la fila modificada ({fila}) y las listas de
+# datos viejos ({viejos[n]}) y nuevos ({nuevos[n]}), en el orden en que
+# las guarda cada gestión.
+PLANTILLAS = {
+    ("Stock", "Inserción"): dedent("""\
+        Se insertó la herramienta {fila}, con los siguientes datos:
+                - Cantidad en condiciones: {nuevos[0]}
+                - Cantidad de baja: {nuevos[1]}
+                - Grupo: {nuevos[2]}
+                - Subgrupo: {nuevos[3]}
+                - Ubicación: {nuevos[4]}"""),
+    ("Stock", "Edición"): dedent("""\
+        Se editó la herramienta {fila}, y se reemplazaron los siguientes datos:
+                - Descripción: {fila}, por {nuevos[0]}
+                - Cantidad en condiciones: {viejos[0]}, por {nuevos[1]}
+                - Cantidad de baja: {viejos[1]}, por {nuevos[2]}
+                - Grupo: {viejos[2]}, por {nuevos[3]}
+                - Subgrupo: {viejos[3]}, por {nuevos[4]}
+                - Ubicación: {viejos[4]}, por {nuevos[5]}"""),
+    ("Stock", "Eliminación"): dedent("""\
+        Se eliminó la herramienta {fila}, que tenía los siguientes datos:
+                - Cantidad en condiciones: {viejos[0]}
+                - Cantidad en reparacion: {viejos[1]}
+                - Cantidad de baja: {viejos[2]}
+                - Cantidad prestadas: {viejos[3]}
+                - Grupo: {viejos[4]}
+                - Subgrupo: {viejos[5]}
+                - Ubicación: {viejos[6]}"""),
+    ("Subgrupos", "Inserción"):
+        "Se insertó el subgrupo {fila}, perteneciendo al grupo {nuevos[0]}.",
+    ("Subgrupos", "Edición"): dedent("""\
+        Se editó el subgrupo {fila}, y se reemplazaron los siguientes datos:
+                - Subgrupo: {fila}, por {nuevos[0]}
+                - Grupo: {viejos[0]}, por {nuevos[1]}"""),
+    ("Subgrupos", "Eliminación"):
+        "Se eliminó el subgrupo {fila}, que pertenecía al grupo {viejos[0]}.",
+    ("Grupos", "Inserción"): "Se insertó el grupo {fila}.",
+    ("Grupos", "Edición"):
+        "Se editó el grupo {fila}, y se reemplazó por el grupo {nuevos[0]}.",
+    ("Grupos", "Eliminación"): "Se eliminó el grupo {fila}.",
+    ("Alumnos", "Inserción"): dedent("""\
+        Se insertó el alumno {fila}, con los siguientes datos:
+                - Curso: {nuevos[0]}
+                - DNI: {nuevos[1]}"""),
+    ("Alumnos", "Edición"): dedent("""\
+        Se editó el alumno {fila}, y se reemplazaron los siguientes datos:
+                - Nombre y apellido: {fila}, por {nuevos[0]}
+                - Curso: {viejos[0]}, por {nuevos[1]}
+                - DNI: {viejos[1]}, por {nuevos[2]}"""),
+    ("Alumnos", "Eliminación"):
+        "Se eliminó el alumno {fila}, que pertenecía al curso {viejos[0]} y tenía el dni {viejos[1]}.",
+    ("Personal", "Inserción"): dedent("""\
+        Se insertó el personal {fila}, con los siguientes datos:
+                - Clase: {nuevos[0]}
+                - DNI: {nuevos[1]}"""),
+    ("Personal", "Edición"): dedent("""\
+        Se editó el personal {fila}, y se reemplazaron los siguientes datos:
+                - Nombre y apellido: {fila}, por {nuevos[0]}
+                - Clase: {viejos[0]}, por {nuevos[1]}
+                - DNI: {viejos[1]}, por {nuevos[2]}"""),
+    ("Personal", "Eliminación"):
+        "Se eliminó el personal {fila}, cuya clase era {viejos[0]} y tenía el dni {viejos[1]}.",
+    ("Clases", "Inserción"):
+        "Se insertó la clase {fila}, perteneciendo a la categoría {nuevos[0]}.",
+    ("Clases", "Edición"): dedent("""\
+        Se editó la clase {fila}, y se reemplazaron los siguientes datos:
+                - Clase: {fila}, por {nuevos[0]}
+                - Categoría: {viejos[0]}, por {nuevos[1]}"""),
+    ("Clases", "Eliminación"):
+        "Se eliminó la clase {fila}, que pertenecía a la categoría {viejos[0]}.",
+    ("Ubicaciones", "Inserción"): "Se insertó la ubicación {fila}.",
+    ("Ubicaciones", "Edición"):
+        "Se editó la ubicación {fila}, y se reemplazó por la ubicación {nuevos[0]}.",
+    ("Ubicaciones", "Eliminación"): "Se eliminó la ubicación {fila}.",
+}
+
+
+def textoDatos(datos: list | tuple | None) -> str | None:
+    """Esta función convierte una lista de datos en el texto JSON que
+    se guarda en el historial.
+
+    Parámetros
+    ----------
+        datos: list | tuple | None
+            Los datos del cambio.
+
+    Devuelve
+    --------
+        str | None: la lista en JSON, o None si no hay datos.
+    """
+    if not datos:
+        return None
+    return json.dumps(list(datos), ensure_ascii=False, default=str)
+
+
+def describirCambio(gestion: str, tipo: str, fila,
+                    datosViejos: list | tuple | None = None,
+                    datosNuevos: list | tuple | None = None) -> str:
+    """Esta función arma la descripción de un cambio, con las
+    plantillas de esta migración.
+
+    Parámetros
+    ----------
+        gestion: str
+            La gestión donde se realizó el cambio.
+
+        tipo: str
+            El tipo de cambio.
+
+        fila
+            La fila que se modificó.
+
+        datosViejos: list | tuple | None = None
+            Los datos que fueron eliminados o reemplazados.
+            Default: None.
+
+        datosNuevos: list | tuple | None = None
+            Los datos que se añadieron o reemplazaron otros datos.
+            Default: None.
+
+    Devuelve
+    --------
+        str: la descripción del cambio.
+    """
+    plantilla = PLANTILLAS.get((gestion, tipo))
+    try:
+        return plantilla.format(fila=fila, viejos=datosViejos or [],
+                                nuevos=datosNuevos or [])
+    # Si no hay plantilla o faltan datos, se describe el cambio sin
+    # sus datos.
+    except (AttributeError, IndexError):
+        return f"{tipo} en {gestion}: {fila}."
+
+
+def datosLegados(texto: str | None) -> list | None:
+    """Esta función separa los datos del historial guardados en el
+    formato anterior ("dato1;dato2;").
+
+    Parámetros
+    ----------
+        texto: str | None
+            Los datos guardados.
+
+    Devuelve
+    --------
+        list | None: la lista de datos, o None si no había datos.
+    """
+    if texto is None:
+        return None
+    datos = texto.split(';')
+    # Cada dato terminaba con ";", así que el último elemento está
+    # vacío.
+    if datos[-1] == '':
+        datos.pop()
+    return datos
+
+
+def migrar(con: sqlite3.Connection):
+    """Esta función convierte los datos del historial a JSON y arma la
+    descripción de cada cambio.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos, dentro de la transacción de
+            la migración.
+    """
+    con.execute("ALTER TABLE historial ADD COLUMN descripcion VARCHAR(1000)")
+    filas = con.execute("""
+        SELECT h.rowid, g.descripcion, t.descripcion, h.id_fila,
+        h.datos_viejos, h.datos_nuevos
+        FROM historial h
+        LEFT JOIN gestiones g ON h.id_gest = g.id
+        LEFT JOIN tipos_cambio t ON h.id_tipo = t.id""").fetchall()
+    cambios = []
+    for rowid, gestion, tipo, fila, textoViejos, textoNuevos in filas:
+        # La descripción se arma con los textos separados igual que
+        # antes, con el elemento vacío del final, para que quede igual
+        # a la que se mostraba aunque el registro tenga datos de menos.
+        descripcion = describirCambio(
+            gestion, tipo, fila,
+            textoViejos.split(';') if textoViejos is not None else None,
+            textoNuevos.split(';') if textoNuevos is not None else None)
+        cambios.append((textoDatos(datosLegados(textoViejos)),
+                        textoDatos(datosLegados(textoNuevos)),
+                        descripcion, rowid))
+    con.executemany("""
+        UPDATE historial
+        SET datos_viejos = ?, datos_nuevos = ?, descripcion = ?
+        WHERE rowid = ?""", cambios)
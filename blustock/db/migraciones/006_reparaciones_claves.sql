@@ -0,0 +1,34 @@
+-- La tabla reparaciones tenía una clave foránea de más, que apuntaba su
+-- propio id al id de personal. Como las conexiones ahora verifican las
+-- claves foráneas, no se podría registrar ninguna reparación cuyo id no
+-- coincida con el de alguien del personal. sqlite no permite borrar una
+-- clave foránea, así que creamos la tabla de nuevo sin ella, copiamos
+-- los datos y volvemos a crear sus índices.
+
+CREATE TABLE "reparaciones_nueva" (
+	"id"	INTEGER NOT NULL UNIQUE,
+	"id_herramienta"	INTEGER NOT NULL,
+	"cantidad"	INTEGER NOT NULL,
+	"id_usuario"	INTEGER NOT NULL,
+	"destino"	VARCHAR(50) NOT NULL,
+	"fecha_envio"	VARCHAR(24) NOT NULL,
+	"fecha_regreso"	VARCHAR(24),
+	FOREIGN KEY("id_herramienta") REFERENCES "stock"("id") ON UPDATE CASCADE,
+	FOREIGN KEY("id_usuario") REFERENCES "personal"("id"),
+	PRIMARY KEY("id" AUTOINCREMENT)
+);
+
+INSERT INTO reparaciones_nueva(id, id_herramienta, cantidad, id_usuario,
+destino, fecha_envio, fecha_regreso)
+SELECT id, id_herramienta, cantidad, id_usuario, destino, fecha_envio,
+fecha_regreso FROM reparaciones;
+
+DROP TABLE reparaciones;
+ALTER TABLE reparaciones_nueva RENAME TO reparaciones;
+
+CREATE INDEX IF NOT EXISTS reparaciones_id_herramienta
+ON reparaciones(id_herramienta);
+CREATE INDEX IF NOT EXISTS reparaciones_id_usuario
+ON reparaciones(id_usuario);
+CREATE INDEX IF NOT EXISTS reparaciones_fecha_envio ON reparaciones(fecha_envio);
+CREATE INDEX IF NOT EXISTS reparaciones_fecha_regreso ON reparaciones(fecha_regreso);
@@ -0,0 +1,121 @@
+"""Este módulo verifica, con EXPLAIN QUERY PLAN, que las consultas de
+dal/queries usen índices en lugar de recorrer tablas enteras.
+
+Se ejecuta desde la carpeta blustock con:
+    python -m db.verificar_indices
+
+Por cada consulta (con y sin búsqueda) se permite recorrer entera solo
+la tabla principal, la que recorre el listado, y las tablas de
+catálogo, que tienen unas pocas filas. Cualquier otro recorrido
+completo de una tabla se informa como error.
+
+Funciones
+---------
+    tablasRecorridas(con: sqlite3.Connection, sql: str,
+                     parametros: dict) -> list:
+        Devuelve las tablas que una consulta recorre enteras.
+
+    verificar(con: sqlite3.Connection) -> list:
+        Verifica todas las consultas del registro y devuelve los
+        errores encontrados.
+"""
+import re
+import sqlite3
+import sys
+from db.bdd import bdd
+from dal.consultas import consultas
+
+# Tablas chicas que se pueden recorrer enteras sin problema.
+CATALOGOS = ("cats_clase", "clases", "estados", "gestiones", "grupos",
+             "subgrupos", "tipos_cambio", "tipos_mov", "ubicaciones")
+# Las consultas de merge usan la tabla temporal que solo existe
+# mientras se carga una planilla.
+CONSULTAS_OMITIDAS = ("merge/bajas", "merge/clases", "merge/eliminar_bajas",
+                      "merge/personal")
+# Valores de ejemplo para los parámetros de búsqueda, fechas y páginas.
+PARAMETROS_EJEMPLO = {"busqueda": "%a%", "fts": '"a"*', "numero": 1,
+                      "desde": "2023-01-01 00:00:00",
+                      "hasta": "2023-12-31 23:59:59",
+                      "cursorFecha": "2023-06-30 12:00:00", "cursorId": 1,
+                      "limite": 100}
+
+
+def tablasRecorridas(con: sqlite3.Connection, sql: str,
+                     parametros: dict) -> list:
+    """Esta función devuelve las tablas que una consulta recorre
+    enteras, sin contar la tabla principal.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos.
+
+        sql: str
+            El código de la consulta.
+
+        parametros: dict
+            Los parámetros de la consulta.
+
+    Devuelve
+    --------
+        list: los nombres de las tablas recorridas.
+    """
+    # Relacionamos cada alias con su tabla ("FROM stock s" -> s: stock).
+    alias = {}
+    for tabla, nombre in re.findall(
+            r"(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|"
+            r"LEFT\b|ORDER\b|GROUP\b)(\w+))?", sql, re.IGNORECASE):
+        alias[nombre or tabla] = tabla
+    recorridas = []
+    principal = True
+    for _, padre, _, detalle in con.execute(
+            f"EXPLAIN QUERY PLAN {sql}", parametros):
+        recorrido = re.fullmatch(r"SCAN (\w+)", detalle)
+        if not recorrido:
+            continue
+        # El primer recorrido de la consulta de afuera es el de la
+        # tabla principal del listado.
+        if padre == 0 and principal:
+            principal = False
+            continue
+        tabla = alias.get(recorrido.group(1), recorrido.group(1))
+        if tabla not in CATALOGOS:
+            recorridas.append(tabla)
+    return recorridas
+
+
+def verificar(con: sqlite3.Connection) -> list:
+    """Esta función verifica todas las consultas del registro.
+
+    Parámetros
+    ----------
+        con: sqlite3.Connection
+            La conexión a la base de datos.
+
+    Devuelve
+    --------
+        list: un texto por cada tabla recorrida sin índice.
+    """
+    errores = []
+    for nombre, consulta in sorted(consultas.consultas.items()):
+        if nombre in CONSULTAS_OMITIDAS:
+            continue
+        parametros = dict(PARAMETROS_EJEMPLO)
+        for parametro in consulta.nombres:
+            if parametro.startswith("filtro"):
+                parametros[parametro] = '%%'
+        variantes = {"sin búsqueda": consulta.sqlSinBusqueda,
+                     "con búsqueda": consulta.sql}
+        for variante, sql in variantes.items():
+            for tabla in tablasRecorridas(con, sql, parametros):
+                errores.append(
+                    f"{nombre} ({variante}): recorre la tabla {tabla}")
+    return errores
+
+
+if __name__ == "__main__":
+    errores = verificar(bdd.con)
+    for error in errores:
+        print(error)
+    print(f"Recorridos de tablas sin índice: {len(errores)}")
+    sys.exit(1 if errores else 0)
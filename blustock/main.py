@@ -11,20 +11,31 @@ Objetos:
 # Antes de arrancar, establecemos el path con el que la app trabajará 
 # para evitar problemas de importar módulos
 import os
-os.chdir(f"{os.path.abspath(__file__)}{os.sep}..")
+os.chdir(os.path.dirname(os.path.abspath(__file__)))
 
 # Ahora sí, hacemos todos los imports
-from PyQt6 import QtWidgets, QtCore, QtGui, uic
+from PyQt6 import QtWidgets, QtCore, QtGui
 from ui.presets.Toolbotoon import toolboton
 from ui.presets.param_edit import ParamEdit
 from ui.presets.popup import PopUp
+from ui.presets.modelo_tabla import configurarTabla
+from ui.presets.delegados import DelegadoSugerencias, DelegadoBotones
+from ui.presets.busqueda_diferida import BusquedaDiferida
+from ui.presets.pantallas import RegistroPantallas
+from ui.cargador import cargarUi
 from dal.dal import dal
+from dal.consultas import TAMANO_PAGINA
+from dal.asincrono import dalAsincrona
+from dal.vocabularios import marcarCambio
+from dal.catalogos import catalogos
+from dal.movimientos import motorMovimientos, ErrorMovimiento
+from dal.planillas import LectorPlanilla, CargaPlanilla
+from dal.exportacion import Exportacion, formatosDisponibles
+from dal.sugerencias import sugerencias
 from db.bdd import bdd
-from datetime import datetime
-from textwrap import dedent
+from db.fechas import ahora
 from unidecode import unidecode
 import core
-import pandas as pd
 from types import FunctionType as function
 import sys
 
@@ -41,6 +52,12 @@ class MainWindow(QtWidgets.QMainWindow):
 
             Crea la ventana principal con un menú inicialmente
             escondido y una colección de pantallas.
+
+        prepararPantalla(self, pantalla: QtWidgets.QWidget):
+            Aplica los estilos comunes a una pantalla al cargarla.
+
+        conectarStock(self), conectarAlumnos(self), ...:
+            Conectan cada pantalla al cargarla.
         
         actualizarSug(self):
             Refresca las sugerencias de todos los campos con
@@ -57,12 +74,6 @@ class MainWindow(QtWidgets.QMainWindow):
             Actualiza el campo total de la tabla stock cuando se
             modifican las cantidades.
 
-        actualizarSugSubgrupos(self):
-            Actualiza las sugerencias de los campos de subgrupos al
-            editar lo ingresado en un campo de grupos relacionado, ya
-            que las sugerencias de subgrupos deben estar relacionadas
-            al grupo ingresado.
-        
         fetchStock(self):
             Refresca la tabla y los filtros de la pantalla stock.
         
@@ -155,150 +166,146 @@ class MainWindow(QtWidgets.QMainWindow):
         super().__init__()
 
         # Inicializamos el menú principal
-        uic.loadUi(os.path.join(os.path.abspath(os.getcwd()),
-                   f'ui{os.sep}screens_uis{os.sep}main.ui'), self)
+        cargarUi('main.ui', self)
 
         # Escondemos el menú para que no se pueda acceder apenas
         # se inicia la aplicación.
         self.menubar.hide()
 
-        # Empezamos a crear todas las pantallas:
-        # # Creamos un widget vacío
-        self.pantallaAlumnos = QtWidgets.QWidget()
-        # # Guardamos el path al archivo ui
-        pathAlumnos = os.path.join(os.path.abspath(os.getcwd()),
-                                 f'ui{os.sep}screens_uis{os.sep}alumnos.ui')
-        # # Cargamos el ui al widget vacío
-        uic.loadUi(pathAlumnos, self.pantallaAlumnos)
-        # Hacemos lo mismo con el resto de las pantallas.
-        self.pantallaGrupos = QtWidgets.QWidget()
-        pathGrupos = os.path.join(os.path.abspath(os.getcwd()),
-                                  f'ui{os.sep}screens_uis{os.sep}grupos.ui')
-        uic.loadUi(pathGrupos, self.pantallaGrupos)
-        self.pantallaStock = QtWidgets.QWidget()
-        pathStock = os.path.join(os.path.abspath(os.getcwd()),
-                                 f'ui{os.sep}screens_uis{os.sep}stock.ui')
-        uic.loadUi(pathStock, self.pantallaStock)
-        self.pantallaHistorial = QtWidgets.QWidget()
-        pathHistorial = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}historial.ui')
-        uic.loadUi(pathHistorial, self.pantallaHistorial)
-        self.pantallaMovs = QtWidgets.QWidget()
-        pathMovs = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}movimientos.ui')
-        uic.loadUi(pathMovs, self.pantallaMovs)
-        self.pantallaOtroPersonal = QtWidgets.QWidget()
-        pathOtroPersonal = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}otro_personal.ui')
-        uic.loadUi(pathOtroPersonal, self.pantallaOtroPersonal)
-        self.pantallaSubgrupos = QtWidgets.QWidget()
-        pathSubgrupos = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}subgrupos.ui')
-        uic.loadUi(pathSubgrupos, self.pantallaSubgrupos)
-        self.pantallaTurnos = QtWidgets.QWidget()
-        pathTurnos = os.path.join(os.path.abspath(os.getcwd()),
-                                  f'ui{os.sep}screens_uis{os.sep}turnos.ui')
-        uic.loadUi(pathTurnos, self.pantallaTurnos)
-        self.pantallaUsuarios = QtWidgets.QWidget()
-        pathUsuarios = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}usuarios.ui')
-        uic.loadUi(pathUsuarios, self.pantallaUsuarios)
-        self.pantallaLogin = QtWidgets.QWidget()
-        pathLogin = os.path.join(os.path.abspath(os.getcwd()),
-                                 f'ui{os.sep}screens_uis{os.sep}login.ui')
-        uic.loadUi(pathLogin, self.pantallaLogin)
-        self.pantallaClases = QtWidgets.QWidget()
-        pathClases = os.path.join(os.path.abspath(os.getcwd()),
-                                  f'ui{os.sep}screens_uis{os.sep}clases.ui')
-        uic.loadUi(pathClases, self.pantallaClases)
-        self.pantallaReps = QtWidgets.QWidget()
-        pathReps = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}reparaciones.ui')
-        uic.loadUi(pathReps, self.pantallaReps)
-        self.pantallaUbis = QtWidgets.QWidget()
-        pathUbis = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}ubicaciones.ui')
-        uic.loadUi(pathUbis, self.pantallaUbis)
-        self.pantallaRealizarMov = QtWidgets.QWidget()
-        pathRealizarMov = os.path.join(
-            os.path.abspath(os.getcwd()),
-            f'ui{os.sep}screens_uis{os.sep}n-movimiento.ui')
-        uic.loadUi(pathRealizarMov, self.pantallaRealizarMov)
-        self.pantallaDeudas = QtWidgets.QWidget()
-        pathDeudas = os.path.join(os.path.abspath(os.getcwd()),
-                                  f'ui{os.sep}screens_uis{os.sep}deudas.ui')
-        uic.loadUi(pathDeudas, self.pantallaDeudas)
-        self.pantallaResumen = QtWidgets.QWidget()
-        pathResumen = os.path.join(os.path.abspath(os.getcwd()),
-                                   f'ui{os.sep}screens_uis{os.sep}resumen.ui')
-        uic.loadUi(pathResumen, self.pantallaResumen)
-
-        # Queremos aplicar cambios a todas las pantallas
-        # # Primero, hacemos una tupla que contenga todas las tablas.
-        pantallas = (self.pantallaLogin, self.pantallaAlumnos,
-                     self.pantallaGrupos, self.pantallaStock,
-                     self.pantallaMovs, self.pantallaOtroPersonal,
-                     self.pantallaSubgrupos, self.pantallaTurnos,
-                     self.pantallaUsuarios, self.pantallaHistorial,
-                     self.pantallaClases, self.pantallaReps,
-                     self.pantallaUbis, self.pantallaRealizarMov,
-                     self.pantallaDeudas, self.pantallaResumen)
-        # # Por cada pantalla ...
-        for pantalla in pantallas:
-            # # ... la añadimos al stackedwidget de la ventana
-            # # principal
-            self.stackedWidget.addWidget(pantalla)
-            # #, intentamos...
-            try:
-                # # insertarle el logo de la barra de búsqueda
-                path = f'ui{os.sep}rsc{os.sep}icons{os.sep}buscar.png'
-                pixmap = QtGui.QPixmap(path)
-                pantalla.label_2.setPixmap(pixmap)
-                # # aplicar estilos y funcionalidad a todas las tablas
-                pantalla.tableWidget.horizontalHeader().setFont(QtGui.QFont("Oswald", 13))
-                pantalla.tableWidget.cellChanged.connect(self.habilitarSaves)
-            # # Si ocurre algún error, es porque la pantalla no tenía
-            # # una tabla. En ese caso, ignoramos la excepción.
-            except BaseException:
-                pass
+        # Las pantallas se cargan recién la primera vez que se usan.
+        # Cada una se registra con su archivo ui y el método que la
+        # conecta, y después se usa como cualquier atributo (por
+        # ejemplo, self.pantallaStock): __getattr__ la carga si hace
+        # falta.
+        self.pantallas = RegistroPantallas(self, self.stackedWidget,
+                                           self.prepararPantalla)
+        for nombre, archivo, funcConectar in (
+                ("pantallaLogin", "login.ui", self.conectarLogin),
+                ("pantallaAlumnos", "alumnos.ui", self.conectarAlumnos),
+                ("pantallaGrupos", "grupos.ui", self.conectarGrupos),
+                ("pantallaStock", "stock.ui", self.conectarStock),
+                ("pantallaMovs", "movimientos.ui", self.conectarMovs),
+                ("pantallaOtroPersonal", "otro_personal.ui",
+                 self.conectarOtroPersonal),
+                ("pantallaSubgrupos", "subgrupos.ui",
+                 self.conectarSubgrupos),
+                ("pantallaTurnos", "turnos.ui", self.conectarTurnos),
+                ("pantallaUsuarios", "usuarios.ui", self.conectarUsuarios),
+                ("pantallaHistorial", "historial.ui",
+                 self.conectarHistorial),
+                ("pantallaClases", "clases.ui", self.conectarClases),
+                ("pantallaReps", "reparaciones.ui", self.conectarReps),
+                ("pantallaUbis", "ubicaciones.ui", self.conectarUbis),
+                ("pantallaRealizarMov", "n-movimiento.ui",
+                 self.conectarRealizarMov),
+                ("pantallaDeudas", "deudas.ui", self.conectarDeudas),
+                ("pantallaResumen", "resumen.ui", self.conectarResumen)):
+            self.pantallas.registrar(nombre, archivo, funcConectar)
+        # El lote de movimientos
+        self.lote = []
+        # Los filtros con los que se mostró cada listado, para
+        # exportarlo tal como se ve. Los guarda cada método fetch.
+        self.filtrosExportacion = {}
+        # Inicializamos las sugerencias.
+        self.actualizarSug()
+        # La única pantalla que se carga al iniciar es la del inicio de
+        # sesión.
+        self.pantallas.obtener("pantallaLogin")
 
         # Conectamos las opciones del menú a sus respectivas pantallas
         self.opcionStock.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(3))
+            lambda: self.pantallas.mostrar("pantallaStock"))
         self.opcionSubgrupos.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(6))
+            lambda: self.pantallas.mostrar("pantallaSubgrupos"))
         self.opcionGrupos.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(2))
+            lambda: self.pantallas.mostrar("pantallaGrupos"))
         self.opcionAlumnos.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(1))
+            lambda: self.pantallas.mostrar("pantallaAlumnos"))
         self.opcionOtroPersonal.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(5))
+            lambda: self.pantallas.mostrar("pantallaOtroPersonal"))
         self.opcionTurnos.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(7))
+            lambda: self.pantallas.mostrar("pantallaTurnos"))
         self.opcionMovimientos.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(4))
+            lambda: self.pantallas.mostrar("pantallaMovs"))
         self.opcionUsuarios.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(8))
+            lambda: self.pantallas.mostrar("pantallaUsuarios"))
         self.GestionUbicaciones.triggered.connect(self.fetchUbis)
         self.GestionClases.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(10))
+            lambda: self.pantallas.mostrar("pantallaClases"))
         self.realizarMovimientos.triggered.connect(self.realizarMovimiento)
         self.GestionReparacion.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(11))
+            lambda: self.pantallas.mostrar("pantallaReps"))
         self.opcionHistorial.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(9))
+            lambda: self.pantallas.mostrar("pantallaHistorial"))
         self.opcionDeudas.triggered.connect(
-            lambda: self.stackedWidget.setCurrentIndex(14))
+            lambda: self.pantallas.mostrar("pantallaDeudas"))
         self.opcionResumen.triggered.connect(self.fetchResumen)
         
-        #Pantalla login
+        #ToolBoton
+        self.boton = toolboton("usuario", self)
+        self.boton.setIconSize(QtCore.QSize(60, 40))
+        self.label = QtWidgets.QLabel(str("El pañolero en turno es: "))
+        self.label.setObjectName("sopas")
+        widget_with_layout = QtWidgets.QWidget()
+        layout = QtWidgets.QHBoxLayout(widget_with_layout)
+        layout.addWidget(self.label)
+        layout.addWidget(self.boton)
+        self.menubar.setCornerWidget(
+            widget_with_layout, QtCore.Qt.Corner.TopRightCorner)
+
+        # Hacemos que la pantalla principal no se vea como ventana.
+        self.setWindowFlags(QtCore.Qt.WindowType.FramelessWindowHint)
+        # Establecemos la pantalla del login como pantalla por defecto.
+        self.pantallas.mostrar("pantallaLogin")
+        # Cambiamos el titulo de la ventana y la hacemos pantalla completa.
+        self.move(0, 0)
+        self.setFixedSize(QtGui.QGuiApplication.primaryScreen().size())
+        #Ponemos las flags
+        self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowType.WindowStaysOnTopHint)
+        #Ponemos el ícono
+        path = f'ui{os.sep}rsc{os.sep}icons{os.sep}blustock.ico'
+        self.setWindowIcon(QtGui.QIcon(QtGui.QPixmap(path)))
+        # Mostramos la ventana principal.
+        self.show()
+   
+    def __getattr__(self, nombre: str):
+        """Carga una pantalla la primera vez que se usa como atributo.
+        Solo se llama si el atributo no existe: una vez cargada, la
+        pantalla ya es un atributo más de la ventana."""
+        # El registro se busca en el diccionario de la instancia para
+        # no volver a llamar a este método antes de crearlo.
+        pantallas = self.__dict__.get("pantallas")
+        if pantallas is not None and nombre in pantallas:
+            return pantallas.obtener(nombre)
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{nombre}'")
+
+    def prepararPantalla(self, pantalla: QtWidgets.QWidget):
+        """Este método aplica los estilos comunes a una pantalla al
+        cargarla.
+
+        Parámetros
+        ----------
+            pantalla: QtWidgets.QWidget
+                La pantalla.
+        """
+        # Intentamos...
+        try:
+            # # insertarle el logo de la barra de búsqueda
+            path = f'ui{os.sep}rsc{os.sep}icons{os.sep}buscar.png'
+            pixmap = QtGui.QPixmap(path)
+            pantalla.label_2.setPixmap(pixmap)
+            # # aplicar estilos y funcionalidad a todas las tablas
+            pantalla.tableWidget.horizontalHeader().setFont(QtGui.QFont("Oswald", 13))
+            pantalla.tableWidget.cellChanged.connect(self.habilitarSaves)
+        # # Si ocurre algún error, es porque la pantalla no tenía
+        # # una tabla. En ese caso, ignoramos la excepción.
+        except BaseException:
+            pass
+
+    def conectarLogin(self):
+        """Este método conecta la pantalla del inicio de sesión.
+        Se llama al cargarla."""
         # Añadimos un botón de mostrar contraseña para la pantalla de
         # inicio de sesión.
         # Primero aplicamos el ícono.
@@ -335,19 +342,36 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pantallaLogin.gridLayout.addWidget(
             self.minimizar, 0, 0, alignment=QtCore.Qt.AlignmentFlag.AlignTop | QtCore.Qt.AlignmentFlag.AlignRight)
 
-        # Empezamos a conectar los botones de agregar de todas las
-        # gestiones.
-        # Inicializamos las sugerencias.
-        self.actualizarSug()
+    def conectarStock(self):
+        """Este método conecta la pantalla de stock.
+        Se llama al cargarla."""
         # Conectamos el botón.
         self.pantallaStock.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
-                self.pantallaStock.tableWidget,
-                lambda: self.saveOne(
-                    self.pantallaStock.tableWidget, dal.saveStock),
-                self.deleteStock, self.actualizarTotal, core.camposStock[0],
-                (self.sGrupos, [], self.sUbis,),
-                self.actualizarSugSubgrupos))
+                self.pantallaStock.tableWidget, None, None,
+                self.actualizarTotal, core.camposStock[0]))
+        # Los campos de grupo, subgrupo y ubicación de la tabla stock
+        # son items de texto. El campo con sugerencias se crea recién
+        # cuando se edita una celda, con el modelo de sugerencias
+        # compartido. Las sugerencias de subgrupos dependen del grupo
+        # de la fila.
+        tablaStock = self.pantallaStock.tableWidget
+        self.delegadosStock = (
+            DelegadoSugerencias(lambda index: sugerencias.grupos(),
+                                tablaStock),
+            DelegadoSugerencias(
+                lambda index: sugerencias.subgrupos(
+                    tablaStock.item(index.row(), 7).text()), tablaStock),
+            DelegadoSugerencias(lambda index: sugerencias.ubicaciones(),
+                                tablaStock),)
+        for col, delegado in enumerate(self.delegadosStock, 7):
+            tablaStock.setItemDelegateForColumn(col, delegado)
+        # Los botones de guardar y eliminar de cada fila los dibuja un
+        # delegado. Sus señales se conectan en fetchStock.
+        self.botonesStock = DelegadoBotones(tablaStock)
+        tablaStock.setItemDelegateForColumn(10, self.botonesStock)
+        tablaStock.setItemDelegateForColumn(11, self.botonesStock)
+        tablaStock.verticalHeader().setDefaultSectionSize(35)
         # Conectamos el boton de guardar cambios
         self.pantallaStock.botonGuardar.clicked.connect(
             lambda: self.saveAll(self.pantallaStock.tableWidget,
@@ -383,9 +407,9 @@ class MainWindow(QtWidgets.QMainWindow):
         # Conectamos el botón de imprimir
         self.pantallaStock.botonImprimir.clicked.connect(self.printStock)
 
-        # Hacemos lo mismo con las otras pantallas
-        
-        #Pantalla otroPersonal
+    def conectarOtroPersonal(self):
+        """Este método conecta la pantalla de la gestión del personal.
+        Se llama al cargarla."""
         self.pantallaOtroPersonal.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaOtroPersonal.tableWidget, lambda: self.saveOne(
@@ -416,8 +440,10 @@ class MainWindow(QtWidgets.QMainWindow):
                                  self.fetchOtroPersonal))
         self.pantallaOtroPersonal.tableWidget.horizontalHeader().setSectionResizeMode(
             3, QtWidgets.QHeaderView.ResizeMode.Stretch)
-        
-        #Pantalla subgrupos
+
+    def conectarSubgrupos(self):
+        """Este método conecta la pantalla de la gestión de subgrupos.
+        Se llama al cargarla."""
         self.pantallaSubgrupos.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaSubgrupos.tableWidget,
@@ -444,7 +470,9 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda: core.refresh(self.pantallaSubgrupos.tableWidget,
                                  self.fetchSubgrupos))
 
-        #Pantalla grupos
+    def conectarGrupos(self):
+        """Este método conecta la pantalla de la gestión de grupos.
+        Se llama al cargarla."""
         self.pantallaGrupos.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaGrupos.tableWidget,
@@ -468,7 +496,9 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda: core.refresh(self.pantallaGrupos.tableWidget,
                                  self.fetchGrupos))
 
-        #Pantallas alumnos
+    def conectarAlumnos(self):
+        """Este método conecta la pantalla de la gestión de alumnos.
+        Se llama al cargarla."""
         self.pantallaAlumnos.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaAlumnos.tableWidget,
@@ -499,7 +529,9 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda: core.refresh(self.pantallaAlumnos.tableWidget,
                                  self.fetchAlumnos))
 
-        #Pantalla ubis
+    def conectarUbis(self):
+        """Este método conecta la pantalla de la gestión de ubicaciones.
+        Se llama al cargarla."""
         self.pantallaUbis.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaUbis.tableWidget, lambda: self.saveOne(
@@ -519,7 +551,9 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda: core.refresh(self.pantallaUbis.tableWidget,
                                  self.fetchUbis))
 
-        #Pantalla clases
+    def conectarClases(self):
+        """Este método conecta la pantalla de la gestión de clases.
+        Se llama al cargarla."""
         self.pantallaClases.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaClases.tableWidget, lambda: self.saveOne(
@@ -543,7 +577,9 @@ class MainWindow(QtWidgets.QMainWindow):
             lambda: core.refresh(self.pantallaClases.tableWidget,
                                  self.fetchClases))
 
-       #Pantalla usuarios
+    def conectarUsuarios(self):
+        """Este método conecta la pantalla de la gestión de usuarios.
+        Se llama al cargarla."""
         self.pantallaUsuarios.pushButton_2.clicked.connect(
             lambda: core.insertarFilas(
                 self.pantallaUsuarios.tableWidget, lambda: self.saveOne(
@@ -559,15 +595,33 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pantallaUsuarios.tableWidget.resizeColumnsToContents()
         self.pantallaUsuarios.tableWidget.horizontalHeader(
         ).setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
-        
-        #Pantalla movs
+
+    def conectarMovs(self):
+        """Este método conecta la pantalla del listado de movimientos.
+        Se llama al cargarla."""
+        # Los movimientos y el historial se cargan de a páginas.
+        self.modeloMovs = configurarTabla(
+            self.pantallaMovs.tableWidget, core.encabezadosMovs,
+            core.camposMovs[1], TAMANO_PAGINA)
         self.pantallaMovs.tableWidget.resizeColumnsToContents()
         self.pantallaMovs.tableWidget.horizontalHeader().setSectionResizeMode(
             5, QtWidgets.QHeaderView.ResizeMode.Stretch)
-        self.pantallaMovs.lineEdit.editingFinished.connect(self.fetchMovs)
-        self.pantallaMovs.nId.valueChanged.connect(self.fetchMovs)
-        self.pantallaMovs.nTurno.valueChanged.connect(self.fetchMovs)
+        # Los filtros no refrescan la pantalla en cada cambio: la
+        # búsqueda diferida espera a que dejen de cambiar y busca una
+        # sola vez. La barra de búsqueda busca mientras se escribe.
+        self.busquedaMovs = BusquedaDiferida(
+            self.fetchMovs, "movimientos", self.pantallaMovs)
+        self.pantallaMovs.lineEdit.textEdited.connect(
+            self.busquedaMovs.programar)
+        self.pantallaMovs.lineEdit.editingFinished.connect(
+            self.busquedaMovs.buscarYa)
+        self.pantallaMovs.nId.valueChanged.connect(
+            self.busquedaMovs.programar)
+        self.pantallaMovs.nTurno.valueChanged.connect(
+            self.busquedaMovs.programar)
         self.pantallaMovs.botonRefresh.clicked.connect(self.fetchMovs)
+        self.pantallaMovs.botonExportar.clicked.connect(
+            lambda: self.exportar("movimientos"))
         # Conectamos las otras barras de búsqueda y los otros filtros
         self.pantallaMovs.hastaFecha.setDateTime(QtCore.QDateTime(
             QtCore.QDate.currentDate().year()+1,
@@ -583,9 +637,15 @@ class MainWindow(QtWidgets.QMainWindow):
             QtCore.QTime.currentTime().hour(),
             QtCore.QTime.currentTime().minute(),
             QtCore.QTime.currentTime().second()))
-        self.pantallaMovs.hastaFecha.dateChanged.connect(self.fetchMovs)
-
-        #Pantalla reparacion
+        self.pantallaMovs.hastaFecha.dateChanged.connect(
+            self.busquedaMovs.programar)
+
+    def conectarReps(self):
+        """Este método conecta la pantalla del listado de reparaciones.
+        Se llama al cargarla."""
+        self.modeloReps = configurarTabla(
+            self.pantallaReps.tableWidget, core.encabezadosReps,
+            core.camposReps[1])
         self.pantallaReps.tableWidget.resizeColumnsToContents()
         self.pantallaReps.tableWidget.horizontalHeader(
         ).setSectionResizeMode(1, QtWidgets.QHeaderView.ResizeMode.Stretch)
@@ -594,8 +654,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pantallaReps.tableWidget.horizontalHeader(
         ).setSectionResizeMode(4, QtWidgets.QHeaderView.ResizeMode.Stretch)
         # Conectamos las otras barras de búsqueda y los otros filtros
-        self.pantallaReps.lineEdit.editingFinished.connect(self.fetchReps)
+        self.busquedaReps = BusquedaDiferida(
+            self.fetchReps, "reparaciones", self.pantallaReps)
+        self.pantallaReps.lineEdit.textEdited.connect(
+            self.busquedaReps.programar)
+        self.pantallaReps.lineEdit.editingFinished.connect(
+            self.busquedaReps.buscarYa)
         self.pantallaReps.botonRefresh.clicked.connect(self.fetchReps)
+        self.pantallaReps.botonExportar.clicked.connect(
+            lambda: self.exportar("reparaciones"))
         self.pantallaReps.hastaFecha.setDate(QtCore.QDate(
             QtCore.QDate.currentDate().year()+1,
             QtCore.QDate.currentDate().month(),
@@ -604,15 +671,31 @@ class MainWindow(QtWidgets.QMainWindow):
             QtCore.QDate.currentDate().year()+1,
             QtCore.QDate.currentDate().month(),
             QtCore.QDate.currentDate().day()))
-        self.pantallaReps.hastaFecha.dateChanged.connect(self.fetchReps)
-
-        #Pantalla turnos
+        self.pantallaReps.hastaFecha.dateChanged.connect(
+            self.busquedaReps.programar)
+
+    def conectarTurnos(self):
+        """Este método conecta la pantalla del listado de turnos.
+        Se llama al cargarla."""
+        self.modeloTurnos = configurarTabla(
+            self.pantallaTurnos.tableWidget, core.encabezadosTurnos,
+            core.camposTurnos[1])
         # Conectamos las otras barras de búsqueda y los otros filtros
-        self.pantallaTurnos.lineEdit.editingFinished.connect(self.fetchTurnos)
-        self.pantallaTurnos.nId.valueChanged.connect(self.fetchTurnos)
+        self.busquedaTurnos = BusquedaDiferida(
+            self.fetchTurnos, "turnos", self.pantallaTurnos)
+        self.pantallaTurnos.lineEdit.textEdited.connect(
+            self.busquedaTurnos.programar)
+        self.pantallaTurnos.lineEdit.editingFinished.connect(
+            self.busquedaTurnos.buscarYa)
+        self.pantallaTurnos.nId.valueChanged.connect(
+            self.busquedaTurnos.programar)
         self.pantallaTurnos.botonRefresh.clicked.connect(self.fetchTurnos)
-        self.pantallaTurnos.desdeFecha.dateChanged.connect(self.fetchTurnos)
-        self.pantallaTurnos.hastaFecha.dateChanged.connect(self.fetchTurnos)
+        self.pantallaTurnos.botonExportar.clicked.connect(
+            lambda: self.exportar("turnos"))
+        self.pantallaTurnos.desdeFecha.dateChanged.connect(
+            self.busquedaTurnos.programar)
+        self.pantallaTurnos.hastaFecha.dateChanged.connect(
+            self.busquedaTurnos.programar)
         self.pantallaTurnos.hastaFecha.setDate(QtCore.QDate(
             QtCore.QDate.currentDate().year()+1,
             QtCore.QDate.currentDate().month(),
@@ -621,14 +704,30 @@ class MainWindow(QtWidgets.QMainWindow):
             QtCore.QDate.currentDate().year()+1,
             QtCore.QDate.currentDate().month(),
             QtCore.QDate.currentDate().day()))
-        self.pantallaTurnos.hastaFecha.dateChanged.connect(self.fetchTurnos)
-        
-        #Pantalla Historial
+
+    def conectarHistorial(self):
+        """Este método conecta la pantalla del historial.
+        Se llama al cargarla."""
+        self.modeloHistorial = configurarTabla(
+            self.pantallaHistorial.tableWidget, core.encabezadosHistorial,
+            core.camposHistorial[1], TAMANO_PAGINA)
+        # Las descripciones ocupan varias líneas, así que ajustamos el
+        # alto de las filas de cada página que se carga.
+        self.pantallaHistorial.tableWidget.model().rowsInserted.connect(
+            lambda parent, primera, ultima: [
+                self.pantallaHistorial.tableWidget.resizeRowToContents(fila)
+                for fila in range(primera, ultima + 1)])
         # Conectamos las otras barras de búsqueda y los otros filtros
+        self.busquedaHistorial = BusquedaDiferida(
+            self.fetchHistorial, "historial", self.pantallaHistorial)
+        self.pantallaHistorial.lineEdit.textEdited.connect(
+            self.busquedaHistorial.programar)
         self.pantallaHistorial.lineEdit.editingFinished.connect(
-            self.fetchHistorial)
+            self.busquedaHistorial.buscarYa)
         self.pantallaHistorial.botonRefresh.clicked.connect(
             self.fetchHistorial)
+        self.pantallaHistorial.botonExportar.clicked.connect(
+            lambda: self.exportar("historial"))
         self.pantallaHistorial.hastaFecha.setDateTime(QtCore.QDateTime(
             QtCore.QDate.currentDate().year()+1,
             QtCore.QDate.currentDate().month(),
@@ -644,9 +743,11 @@ class MainWindow(QtWidgets.QMainWindow):
             QtCore.QTime.currentTime().minute(),
             QtCore.QTime.currentTime().second()))
         self.pantallaHistorial.hastaFecha.dateChanged.connect(
-            self.fetchHistorial)
-        
-        #Pantalla RealizarMov
+            self.busquedaHistorial.programar)
+
+    def conectarRealizarMov(self):
+        """Este método conecta la pantalla de realizar movimientos.
+        Se llama al cargarla."""
         self.pantallaRealizarMov.cursoComboBox.textActivated.connect(
             self.alumnos)
         self.pantallaRealizarMov.pushButton.clicked.connect(
@@ -654,20 +755,59 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pantallaRealizarMov.ubicacionComboBox.textActivated.connect(
             self.herramientas)
         self.pantallaRealizarMov.Limpiar.clicked.connect(self.clear)
+        self.pantallaRealizarMov.agregarLoteButton.clicked.connect(
+            self.agregarAlLote)
+        self.pantallaRealizarMov.quitarLoteButton.clicked.connect(
+            self.quitarDelLote)
+        self.pantallaRealizarMov.vaciarLoteButton.clicked.connect(
+            self.vaciarLote)
+        self.pantallaRealizarMov.guardarLoteButton.clicked.connect(
+            self.guardarLote)
         self.pantallaRealizarMov.tipoDeMovimientoComboBox.textActivated.connect(
             self.check)
         self.pantallaRealizarMov.formLayout.setAlignment(self.pantallaRealizarMov.herramientasDisponiblesLineEdit, QtCore.Qt.AlignmentFlag.AlignHCenter)
-        
-        #Pantalla Deudas
+
+    def conectarDeudas(self):
+        """Este método conecta la pantalla del listado de deudas.
+        Se llama al cargarla."""
         # Conectamos las otras barras de búsqueda y los otros filtros
-        self.pantallaDeudas.lineEdit.editingFinished.connect(self.fetchDeudas)
+        self.busquedaDeudas = BusquedaDiferida(
+            self.fetchDeudas, pantalla=self.pantallaDeudas)
+        self.pantallaDeudas.lineEdit.textEdited.connect(
+            self.busquedaDeudas.programar)
+        self.pantallaDeudas.lineEdit.editingFinished.connect(
+            self.busquedaDeudas.buscarYa)
         self.pantallaDeudas.botonRefresh.clicked.connect(self.fetchDeudas)
-        self.pantallaDeudas.radioHerramienta.toggled.connect(self.fetchDeudas)
-        self.pantallaDeudas.radioPersona.toggled.connect(self.fetchDeudas)
-        self.pantallaDeudas.nMov.valueChanged.connect(self.fetchDeudas)
-        self.pantallaDeudas.nTurno.valueChanged.connect(self.fetchDeudas)
-        
-        #Pantalla Resumen
+        self.pantallaDeudas.botonExportar.clicked.connect(
+            lambda: self.exportar("deudas"))
+        # Al cambiar de radio se emiten dos toggled, uno por cada
+        # botón; la búsqueda diferida los junta.
+        self.pantallaDeudas.radioHerramienta.toggled.connect(
+            self.busquedaDeudas.programar)
+        self.pantallaDeudas.radioPersona.toggled.connect(
+            self.busquedaDeudas.programar)
+        self.pantallaDeudas.nMov.valueChanged.connect(
+            self.busquedaDeudas.programar)
+        self.pantallaDeudas.nTurno.valueChanged.connect(
+            self.busquedaDeudas.programar)
+
+    def conectarResumen(self):
+        """Este método conecta la pantalla del resumen de deudas.
+        Se llama al cargarla."""
+        self.modeloResumenDeudas = configurarTabla(
+            self.pantallaResumen.tablaDeudas, core.encabezadosDeudas,
+            core.camposDeudas[1])
+        self.modeloResumenBaja = configurarTabla(
+            self.pantallaResumen.tablaBaja, core.encabezadosBaja,
+            core.camposBaja[1])
+        # Los títulos de las columnas del resumen van un poco más
+        # grandes.
+        fuenteEncabezado = QtGui.QFont()
+        fuenteEncabezado.setPointSize(13)
+        self.pantallaResumen.tablaDeudas.horizontalHeader().setFont(
+            fuenteEncabezado)
+        self.pantallaResumen.tablaBaja.horizontalHeader().setFont(
+            fuenteEncabezado)
         # Conectamos las otras barras de búsqueda y los otros filtros
         self.pantallaResumen.hastaFecha.setDate(QtCore.QDate(
             QtCore.QDate.currentDate().year()+1,
@@ -679,33 +819,6 @@ class MainWindow(QtWidgets.QMainWindow):
             QtCore.QDate.currentDate().day()))
         self.pantallaResumen.hastaFecha.dateChanged.connect(self.fetchResumen)
 
-        #ToolBoton
-        self.boton = toolboton("usuario", self)
-        self.boton.setIconSize(QtCore.QSize(60, 40))
-        self.label = QtWidgets.QLabel(str("El pañolero en turno es: "))
-        self.label.setObjectName("sopas")
-        widget_with_layout = QtWidgets.QWidget()
-        layout = QtWidgets.QHBoxLayout(widget_with_layout)
-        layout.addWidget(self.label)
-        layout.addWidget(self.boton)
-        self.menubar.setCornerWidget(
-            widget_with_layout, QtCore.Qt.Corner.TopRightCorner)
-
-        # Hacemos que la pantalla principal no se vea como ventana.
-        self.setWindowFlags(QtCore.Qt.WindowType.FramelessWindowHint)
-        # Establecemos la pantalla del login como pantalla por defecto.
-        self.stackedWidget.setCurrentIndex(0)
-        # Cambiamos el titulo de la ventana y la hacemos pantalla completa.
-        self.move(0, 0)
-        self.setFixedSize(QtGui.QGuiApplication.primaryScreen().size())
-        #Ponemos las flags
-        self.setWindowFlags(self.windowFlags() | QtCore.Qt.WindowType.WindowStaysOnTopHint)
-        #Ponemos el ícono
-        path = f'ui{os.sep}rsc{os.sep}icons{os.sep}blustock.ico'
-        self.setWindowIcon(QtGui.QIcon(QtGui.QPixmap(path)))
-        # Mostramos la ventana principal.
-        self.show()
-   
     #Esta funcion nos permite sacar o poner la flag para que la ventana este siempre arriba
     def desbloquear(self):
         if self.windowFlags() & QtCore.Qt.WindowType.WindowStaysOnTopHint:
@@ -720,10 +833,9 @@ class MainWindow(QtWidgets.QMainWindow):
     def actualizarSug(self):
         """Este método refresca las sugerencias de todos los campos
         con sugerencias del sistema."""
-        self.sGrupos = [i[0] for i in bdd.cur.execute(
-            'SELECT descripcion FROM grupos').fetchall()]
-        self.sUbis = [i[0] for i in bdd.cur.execute(
-            'SELECT descripcion FROM ubicaciones').fetchall()]
+        # Las sugerencias de grupos, subgrupos y ubicaciones de stock
+        # están en modelos compartidos, que se actualizan en el lugar.
+        sugerencias.invalidar()
         sql = '''SELECT c.descripcion FROM clases c
                JOIN cats_clase cat ON c.id_cat=cat.id
                WHERE cat.descripcion='Personal' or c.descripcion='Director de Taller' or c.descripcion = 'Profesor de Taller';'''
@@ -761,7 +873,10 @@ class MainWindow(QtWidgets.QMainWindow):
             if check[0] == 1:
                 self.usuario = bdd.cur.execute("SELECT dni FROM personal WHERE usuario = ? and contrasena = ?", (
                     self.pantallaLogin.usuariosLineEdit.text(), self.pantallaLogin.passwordLineEdit.text(),)).fetchall()[0][0]
-                self.stackedWidget.setCurrentIndex(3)
+                self.pantallas.mostrar("pantallaStock")
+                # Las demás pantallas se van cargando cuando la app
+                # está sin hacer nada.
+                self.pantallas.precargar()
                 if bdd.cur.execute("SELECT c.descripcion FROM clases c join personal p on p.id_clase = c.id WHERE dni = ?", (self.usuario,)).fetchone()[0] != "Director de Taller":
                     self.menubar.actions()[4].setVisible(False)
                 pañolero = bdd.cur.execute(
@@ -799,10 +914,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
                     if popup == QtWidgets.QMessageBox.StandardButton.No:
                         profe = dal.obtenerDatos("usuarios", self.usuario,)
-                        hora = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
+                        hora = ahora()
                         bdd.cur.execute(
                             """UPDATE turnos SET fecha_egr = ?, id_prof_egr = ? WHERE fecha_egr is null""", (hora, profe[0][0],))
                         bdd.con.commit()
+                        marcarCambio("turnos")
                         self.label.setText("Usuario: " + bdd.cur.execute(
                             "SELECT nombre_apellido FROM personal WHERE dni = ?", (self.usuario,)).fetchone()[0])
                         for i in range(7):
@@ -1179,174 +1295,152 @@ class MainWindow(QtWidgets.QMainWindow):
             self.pantallaRealizarMov.tipoDeMovimientoComboBox.removeItem(
                 self.pantallaRealizarMov.tipoDeMovimientoComboBox.findText("Ingreso de Herramienta Reparada")
             )
-        self.stackedWidget.setCurrentIndex(13)
+        self.pantallas.mostrar("pantallaRealizarMov")
 
-    #Suma la cantidad de herramientas a la base de datos
-    def sumar(self, cant, herramienta, estado):
-        try:
-            estado = estado[estado.index(" "):]
-            estado = estado[1:]
-        except:
-            pass
-        estado = unidecode(estado)
-        estado = "cant_" + estado.lower()
-        query = f"select {estado} from stock WHERE id = ?"
-        params = (herramienta,)
-        if bdd.cur.execute(query,params) ==None:
-            query = f"UPDATE stock SET {estado} = 0 + ? WHERE id = ?"
-        else:
-            query = f"UPDATE stock SET {estado} = {estado} + ? WHERE id = ?"
-            params = (cant, herramienta)
-        self.sopas = True
-        bdd.cur.execute(query, params)
+    def leerMovimiento(self) -> tuple | None:
+        """Este método lee el movimiento cargado en la pantalla de
+        nuevo movimiento. Si falta algún dato, avisa al usuario.
 
-    #Resta la cantidad de herramientas a la base de datos
-    def restar(self, cant,herramienta,estado):
-        try:
-            estado = estado[estado.index(" "):]
-            estado = estado[1:]
-        except:
-            pass
-        estado = unidecode(estado)
-        estado = "cant_" + estado.lower()
-        query = f"select {estado} from stock WHERE id = ?"
-        params = (herramienta,)
-        try:
-            resultado = bdd.cur.execute(query,params).fetchone()[0]
-            if resultado is None:
-                resultado = 0
-        except:
-            print("ERROR DE PROGRAMACION")
-            return
-        if resultado-cant >=0:
-            query = f"UPDATE stock SET {estado} = {estado} - ? WHERE id = ?"
-            params = (cant, herramienta)
-            bdd.cur.execute(query, params)
-            bdd.con.commit()
-            self.sopas = True
-        else:
-            self.sopas = False
-
-    #Guarda el movimiento
-    def saveMovimiento(self):
-        turno = bdd.cur.execute(
-            "select id from turnos where fecha_egr IS NULL").fetchall()
-        tipo = dal.obtenerDatos(
-            "tipos_mov", self.pantallaRealizarMov.tipoDeMovimientoComboBox.currentText())
+        Devuelve
+        --------
+            tuple | None: el tipo, el id de la herramienta, el estado,
+            la cantidad, el id de la persona y la descripción del
+            movimiento, o None si falta algún dato.
+        """
         cant = self.pantallaRealizarMov.cantidadSpinBox.value()
-        estado = dal.obtenerDatos(
-            "estados", self.pantallaRealizarMov.estadoComboBox.currentText())
         persona = bdd.cur.execute('''SELECT p.id 
             FROM personal p
             JOIN clases c ON c.id = p.id_clase
             WHERE p.nombre_apellido LIKE ?
             and c.descripcion LIKE ?;''', (self.pantallaRealizarMov.alumnoComboBox.currentText(), self.pantallaRealizarMov.cursoComboBox.currentText())).fetchone()
-        ubicacion = dal.obtenerDatos(
-            "ubicaciones", self.pantallaRealizarMov.ubicacionComboBox.currentText())
+        idUbicacion = catalogos.ubicaciones.id(
+            self.pantallaRealizarMov.ubicacionComboBox.currentText())
         herramienta = bdd.cur.execute(
             """SELECT s.id FROM STOCK s
             JOIN subgrupos sub ON s.id_subgrupo = sub.id
             JOIN grupos g ON sub.id_grupo=g.id
             JOIN ubicaciones u ON s.id_ubi=u.id
-            where s.descripcion LIKE ? and s.id_ubi  LIKE ?""" , (self.pantallaRealizarMov.herramientaComboBox.currentText(), ubicacion[0][0])).fetchone()
+            where s.descripcion LIKE ? and s.id_ubi  LIKE ?""" , (self.pantallaRealizarMov.herramientaComboBox.currentText(), idUbicacion)).fetchone()
 
         descripcion = self.pantallaRealizarMov.descripcionLineEdit.text()
-        fecha = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
 
         texto = self.pantallaRealizarMov.tipoDeMovimientoComboBox.currentText()
         if texto == " " or texto == None or texto=="":
             mensaje = """Por favor ingrese el tipo de movimiento que desea realizar."""
-            return PopUp("Error", mensaje).exec()
+            PopUp("Error", mensaje).exec()
+            return None
         else:
             if herramienta == " " or herramienta == None:
                 mensaje = """Por favor ingrese la herramienta que desea mover."""
-                return PopUp("Error", mensaje).exec()
+                PopUp("Error", mensaje).exec()
+                return None
             else:
                 if cant == 0:
                     mensaje = """Por favor ingrese un valor mayor a 0."""
-                    return PopUp("Error", mensaje).exec()
+                    PopUp("Error", mensaje).exec()
+                    return None
                 else:
                     if texto in {"Dar De Baja", "Ingreso de Herramienta Reparada", "Envío a Reparación", "Ingreso"}:
-                        persona = bdd.cur.execute("""SELECT id FROM personal where dni= ?""" , (self.usuario,)).fetchall()[0]
+                        idUsuario = catalogos.personal.id(self.usuario)
+                        persona = (idUsuario,) if idUsuario else None
                     if (descripcion == " " or not descripcion) and texto in {"Envío a Reparacion", "Dar De Baja"}:
                         if texto=="Envío a Reparación":
                             mensaje = """Por favor ingrese la ubicacion a la que la herramienta será enviada"""
                         else:
                             mensaje = """Por favor ingrese el motivo por el que la herramienta se dió de baja"""
-                        return PopUp("Error", mensaje).exec()
+                        PopUp("Error", mensaje).exec()
+                        return None
                     if persona:
-                        try:
-                            turno = turno[0][0]
-                        except:
-                            turno = None
-                        if tipo[0][0] == 1:
-                            bdd.cur.execute("INSERT INTO movimientos(id_turno,id_elem,id_estado,cant,id_persona,fecha_hora,id_tipo,descripcion) VALUES(?, ?, ?, ?, ?, ?, ?,?)",
-                                        (turno, herramienta[0], estado[0][0], cant, persona[0], fecha, tipo[0][0], descripcion))
-                            self.sumar(cant, herramienta[0], estado[0][1])
-                        elif tipo[0][0] == 2:
-                            usuario = bdd.cur.execute("""SELECT id FROM personal where dni= ?""" , (self.usuario,)).fetchall()[0][0]
-                            self.restar(cant, herramienta[0], estado[0][1])
-                            self.sumar(cant, herramienta[0],"reparacion")
-                            bdd.cur.execute("INSERT INTO reparaciones(id_herramienta,cantidad,id_usuario,destino,fecha_envio) VALUES(?, ?, ?, ?, ?)",(herramienta[0],cant, usuario,descripcion, fecha[:10]))
-                        elif tipo[0][0] == 3:
-                            bdd.cur.execute("INSERT INTO movimientos(id_turno,id_elem,id_estado,cant,id_persona,fecha_hora,id_tipo,descripcion) VALUES(?, ?, ?, ?, ?, ?, ?,?)",
-                                        (turno, herramienta[0], estado[0][0], cant, persona[0], fecha, tipo[0][0], descripcion))
-                            self.restar(cant, herramienta[0],estado[0][1])
-                            self.sumar(cant, herramienta[0],"prest")
-                            bdd.cur.execute("INSERT INTO deudas (id_mov, cant) SELECT id, ? FROM movimientos ORDER BY id DESC LIMIT 1", (cant,))
-                        elif tipo[0][0] == 4:
-                            sql="""SELECT d.id_mov FROM deudas d 
-                            join movimientos m on d.id_mov = m.id
-                            where m.id_elem=? and m.id_persona=?"""
-                            id = bdd.cur.execute(
-                                    sql, (herramienta[0], persona[0])).fetchone()
-                            if id:
-                                self.sumar(cant, herramienta[0],estado[0][1])
-                                self.restar(cant, herramienta[0],"prest")
-                                bdd.cur.execute("DELETE FROM deudas WHERE id_mov = ?",(id[0],))
-                            else:
-                                mensaje = """No se ha encontrado el movimiento"""
-                                return PopUp("Error", mensaje).exec()
-                        elif tipo[0][0] == 5:
-                            bdd.cur.execute("INSERT INTO movimientos(id_turno,id_elem,id_estado,cant,id_persona,fecha_hora,id_tipo,descripcion) VALUES(?, ?, ?, ?, ?, ?, ?,?)",
-                                        (turno, herramienta[0], estado[0][0], cant, persona[0], fecha, tipo[0][0], descripcion))
-                            self.restar(cant, herramienta[0], estado[0][1])
-                            self.sumar(cant, herramienta[0], "baja")
-                        elif tipo[0][0] == 6:
-                            sql="""SELECT id
-                            FROM reparaciones
-                            WHERE id_herramienta = ?
-                            AND cantidad = ?
-                            AND fecha_regreso IS NULL
-                            ORDER BY id"""
-                            id = bdd.cur.execute(sql, (herramienta[0], cant,)).fetchone()
-                            if id:
-                                self.sumar(cant,herramienta[0],estado[0][1])
-                                self.restar(cant, herramienta[0],"En reparacion")
-                                sql="""UPDATE reparaciones
-                                SET fecha_regreso = ?
-                                WHERE cantidad = ? and id_herramienta = ?"""
-                                bdd.cur.execute(sql, (datetime.now().strftime("%Y/%m/%d %H:%M:%S"), 
-                                                      cant, herramienta[0]))
-                            else:
-                                mensaje = """No se ha encontrado el movimiento"""
-                                return PopUp("Error", mensaje).exec()
-
-                        bdd.con.commit()
-                        # Hermano que hiciste aca
-                        if hasattr(self,"sopas"):
-                            if self.sopas == True:
-                                self.clear()                                
-                                mensaje = """Movimiento realizado con exito."""
-                                return PopUp("Aviso", mensaje).exec()
-                            else:
-                                mensaje = """Movimiento cancelado no hay suficientes herramientas para realizar el movimiento."""
-                                return PopUp("Error", mensaje).exec()
-
+                        return (texto, herramienta[0],
+                                self.pantallaRealizarMov.estadoComboBox.currentText(),
+                                cant, persona[0], descripcion)
                     else:
                         mensaje = """Por favor ingrese el nombre del alumno solicitante."""
-                        return PopUp("Error", mensaje).exec()
-                    
+                        PopUp("Error", mensaje).exec()
+                        return None
+
+    #Guarda el movimiento
+    def saveMovimiento(self):
+        linea = self.leerMovimiento()
+        if linea is None:
+            return
+        tipo, herramienta, estado, cant, persona, descripcion = linea
+        # El motor aplica todo el movimiento en una sola transacción: si
+        # falla, no se guarda nada.
+        try:
+            motorMovimientos.registrar(
+                tipo, herramienta, estado, cant, persona,
+                catalogos.personal.id(self.usuario), descripcion)
+        except ErrorMovimiento as error:
+            return PopUp("Error", str(error)).exec()
+        self.clear()
+        mensaje = """Movimiento realizado con exito."""
+        return PopUp("Aviso", mensaje).exec()
+
+    def agregarAlLote(self):
+        """Este método agrega el movimiento cargado en la pantalla al
+        lote y limpia la herramienta, la persona y la cantidad para
+        cargar el siguiente. La validación contra el stock se hace al
+        guardar el lote."""
+        linea = self.leerMovimiento()
+        if linea is None:
+            return
+        # Las líneas que ya se guardaron dejan lugar a las nuevas.
+        self.lote = [fila for fila in self.lote if fila[2] != "Realizado"]
+        persona = (self.pantallaRealizarMov.alumnoComboBox.currentText()
+                   or self.usuario)
+        self.lote.append(
+            [linea, (self.pantallaRealizarMov.herramientaComboBox.currentText(),
+                     persona), ""])
+        self.mostrarLote()
+        self.pantallaRealizarMov.herramientaComboBox.setCurrentIndex(-1)
+        self.pantallaRealizarMov.alumnoComboBox.setCurrentIndex(-1)
+        self.pantallaRealizarMov.herramientasDisponiblesLineEdit.setText("")
+        self.pantallaRealizarMov.cantidadSpinBox.setValue(0)
+
+    def mostrarLote(self):
+        """Este método muestra las líneas del lote y su resultado en
+        la tabla del lote."""
+        tabla = self.pantallaRealizarMov.loteTableWidget
+        tabla.setRowCount(len(self.lote))
+        for fila, ((tipo, _, estado, cant, _, _), (herramienta, persona),
+                   resultado) in enumerate(self.lote):
+            for col, dato in enumerate((tipo, herramienta, estado, cant,
+                                        persona, resultado)):
+                tabla.setItem(fila, col, QtWidgets.QTableWidgetItem(str(dato)))
+
+    def quitarDelLote(self):
+        """Este método quita del lote las líneas seleccionadas."""
+        filas = {indice.row() for indice in
+                 self.pantallaRealizarMov.loteTableWidget.selectedIndexes()}
+        self.lote = [linea for fila, linea in enumerate(self.lote)
+                     if fila not in filas]
+        self.mostrarLote()
+
+    def vaciarLote(self):
+        """Este método quita todas las líneas del lote."""
+        self.lote = []
+        self.mostrarLote()
+
+    def guardarLote(self):
+        """Este método guarda las líneas pendientes del lote en una sola
+        transacción y muestra el resultado de cada una. Las que no se
+        pudieron realizar quedan en el lote para corregirlas."""
+        pendientes = [fila for fila in self.lote if fila[2] != "Realizado"]
+        if not pendientes:
+            mensaje = """No hay movimientos en el lote."""
+            return PopUp("Error", mensaje).exec()
+        resultados = motorMovimientos.registrarLote(
+            [fila[0] for fila in pendientes],
+            catalogos.personal.id(self.usuario))
+        for fila, resultado in zip(pendientes, resultados):
+            fila[2] = resultado or "Realizado"
+        self.mostrarLote()
+        realizados = resultados.count(None)
+        mensaje = f"""Se realizaron {realizados} de {len(resultados)} movimientos."""
+        return PopUp("Aviso" if realizados == len(resultados) else "Error",
+                     mensaje).exec()
+
     def habilitarSaves(self, row: int | None = None, col: int | None = None,
                        tabla: QtWidgets.QTableWidget | None = None):
         """Este método habilita el botón de guardar de una fila de una
@@ -1372,7 +1466,7 @@ class MainWindow(QtWidgets.QMainWindow):
             tabla = self.sender()
         if row is None:
             row = tabla.indexAt(self.sender().pos()).row()
-        tabla.cellWidget(row, tabla.columnCount()-2).setEnabled(True)
+        core.marcarFila(tabla, row, True)
         tabla.parent().botonGuardar.setEnabled(True)
 
     def actualizarTotal(self, row: int, col: int,
@@ -1441,31 +1535,6 @@ class MainWindow(QtWidgets.QMainWindow):
             tabla.setItem(row, 6, item)
             tabla.setSortingEnabled(True)
 
-    def actualizarSugSubgrupos(self):
-        """Este método actualiza las sugerencias de los campos de
-        subgrupos al editar lo ingresado en un campo de grupos
-        relacionado, ya que las sugerencias de subgrupos deben estar
-        relacionadas al grupo ingresado.
-        """
-        # Usamos la tabla de stock.
-        tabla = self.pantallaStock.tableWidget
-        # Obtenemos la fila del campo de grupos modificado.
-        row = tabla.indexAt(self.sender().pos()).row()
-        # Obtenemos los nuevos datos.
-        grupo = tabla.cellWidget(row, 7).text()
-        # Obtenemos el cuadro de sugerencias del campo subgrupos.
-        completer = tabla.cellWidget(row, 8).completer()
-        # Obtenemos sugerencias actualizadas.
-        sugerencias =[i[0] for i in 
-                     bdd.cur.execute('''SELECT s.descripcion FROM subgrupos s
-                     JOIN grupos g ON s.id_grupo = g.id
-                     WHERE g.descripcion LIKE ?''', (grupo,)).fetchall()]
-        # Añadimos las sugerencias actualizadas al campo de subgrupos.
-        completer.setModel(QtCore.QStringListModel(sugerencias))
-        # Habilitamos el boton de guardar para que el usuario pueda
-        # guardar los cambios.
-        tabla.cellWidget(row, tabla.columnCount()-2).setEnabled(True)
-
     def fetchStock(self):
         """Este método refresca la tabla y los filtros de la pantalla
         stock.
@@ -1473,20 +1542,6 @@ class MainWindow(QtWidgets.QMainWindow):
         # Los métodos de fetch son parecidos a este, por lo que solo
         # voy a documentar esta función. Si hay una acción especial
         # en algún otro método fetch, lo voy a documentar.
-        # Obtenemos la tabla.
-        tabla = self.pantallaStock.tableWidget
-        # Desactivamos el sorting por defecto porque si alguien
-        # refresca con el sorting activado se bugea.
-        tabla.setSortingEnabled(False)
-        # Desconectamos la tabla para que no ejecute funciones mientras
-        # la refrescamos.
-        try:
-            tabla.disconnect()
-        except:
-            pass
-        # Se refresca la tabla, eliminando todas las filas anteriores.
-        tabla.setRowCount(0)
-        
         # Obtenemos los filtros.
         barraBusqueda = self.pantallaStock.lineEdit
 
@@ -1517,8 +1572,44 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             filtroUbi = (ubiSeleccionada,)
 
-        # Se obtienen los datos de la base de datos.
-        datos = dal.obtenerDatos("stock", barraBusqueda.text(), filtroUbi)
+        # Se piden los datos en el hilo de consultas, así la ventana no
+        # se congela mientras tanto. Cuando llegan, mostrarStock llena
+        # la tabla. Si se vuelve a buscar antes, este pedido se cancela.
+        dalAsincrona.obtenerDatos("stock", self.mostrarStock, "stock",
+                                  barraBusqueda.text(), filtroUbi)
+        self.filtrosExportacion["stock"] = (
+            barraBusqueda.text(), filtroUbi, None, None)
+
+        # Volvemos a conectar el filtro.
+        listaUbi.setMinimumWidth(
+            listaUbi.minimumSizeHint().width() + 100
+        )
+        listaUbi.currentIndexChanged.connect(self.fetchStock)
+        # Mostramos la pantalla de stock.
+        self.pantallas.mostrar("pantallaStock")
+
+    def mostrarStock(self, datos: list):
+        """Este método llena la tabla de la pantalla stock con los
+        datos obtenidos.
+
+        Parámetros
+        ----------
+            datos: list
+                Las filas de stock obtenidas de la base de datos.
+        """
+        # Obtenemos la tabla.
+        tabla = self.pantallaStock.tableWidget
+        # Desactivamos el sorting por defecto porque si alguien
+        # refresca con el sorting activado se bugea.
+        tabla.setSortingEnabled(False)
+        # Desconectamos la tabla para que no ejecute funciones mientras
+        # la refrescamos.
+        try:
+            tabla.disconnect()
+        except:
+            pass
+        # Se refresca la tabla, eliminando todas las filas anteriores.
+        tabla.setRowCount(0)
 
         # Por cada número de fila y los contenidos de ésta en los datos
         # obtenidos...
@@ -1563,43 +1654,31 @@ class MainWindow(QtWidgets.QMainWindow):
                            QtCore.Qt.ItemFlag.ItemIsEnabled)
             tabla.setItem(rowNum, 6, item6)
 
-            # Creamos el campo de sugerencias del campo grupos.
-            sugerencias = [sugerencia[0] for sugerencia in
-                           bdd.cur.execute('SELECT descripcion FROM grupos'
-                           ).fetchall()]
-            # Creamos el campo con sugerencia.
-            paramGrupos = ParamEdit(sugerencias, rowData[7])
-            # Cuando termina de editarse, hacemos que actualice el
-            # cuadro de sugerencias del campo grupos.
-            paramGrupos.editingFinished.connect(self.actualizarSugSubgrupos)
-            tabla.setCellWidget(rowNum, 7, paramGrupos)
-            sql = '''SELECT s.descripcion FROM subgrupos s
-                   JOIN grupos g ON s.id_grupo = g.id
-                   WHERE g.descripcion LIKE ?'''
-            sugerencias = [sugerencia[0] for sugerencia in
-                           bdd.cur.execute(sql, (rowData[7],)).fetchall()]
-            subgrupos = ParamEdit(sugerencias, rowData[8])
-            subgrupos.textChanged.connect(
-                lambda: self.habilitarSaves(None, None, tabla))
-            tabla.setCellWidget(rowNum, 8, subgrupos)
-            sugerencias = [sugerencia[0] for sugerencia in
-                           bdd.cur.execute(
-                           'SELECT descripcion FROM ubicaciones').fetchall()]
-            ubicaciones = ParamEdit(sugerencias, rowData[9])
-            ubicaciones.textChanged.connect(
-                lambda: self.habilitarSaves(None, None, tabla))
-            tabla.setCellWidget(rowNum, 9, ubicaciones)
+            # Los campos con sugerencia son items comunes: el
+            # delegado de la columna crea el campo con sugerencias
+            # solo al editarlos.
+            for col in (7, 8, 9):
+                item = QtWidgets.QTableWidgetItem(str(rowData[col]))
+                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
+                tabla.setItem(rowNum, col, item)
 
-            # Generamos los botones para la fila de la tabla
-            core.generarBotones(
-                lambda: self.saveOne(tabla, dal.saveStock, datos),
-                lambda: self.deleteStock(datos), tabla, rowNum)
+            # Generamos los botones para la fila de la tabla. Los
+            # dibuja el delegado de botones.
+            core.generarBotones(None, None, tabla, rowNum)
 
-            # Cambiamos la altura de la fila.
-            tabla.setRowHeight(rowNum, 35)
+        # Conectamos los botones de las filas con los datos nuevos.
+        try:
+            self.botonesStock.guardar.disconnect()
+            self.botonesStock.eliminar.disconnect()
+        except TypeError:
+            pass
+        self.botonesStock.guardar.connect(
+            lambda row: self.saveOne(tabla, dal.saveStock, datos, row))
+        self.botonesStock.eliminar.connect(
+            lambda row: self.deleteStock(datos, row))
         # Hacemos que las columnas no puedan ser menos anchas que sus
-        # contenidos.
-        tabla.resizeRowsToContents()
+        # contenidos. Todas las filas tienen el alto por defecto, así
+        # que no hace falta medirlas.
         tabla.resizeColumnsToContents()
         tabla.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded);
@@ -1615,16 +1694,9 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.cellChanged.connect(self.actualizarTotal)
         # Volvemos a habilitar el sorting.
         tabla.setSortingEnabled(True)
-        # Volvemos a conectar el filtro.
-        listaUbi.setMinimumWidth(
-            listaUbi.minimumSizeHint().width() + 100
-        )
-        listaUbi.currentIndexChanged.connect(self.fetchStock)
-        # Mostramos la pantalla de stock.
-        self.stackedWidget.setCurrentIndex(3)
 
     def saveOne(self, tabla: QtWidgets.QTableWidget, funcSave: function,
-                datos: list | None = None):
+                datos: list | None = None, row: int | None = None):
         """Este método guarda los cambios hechos en una fila de una
         tabla de una gestión.
 
@@ -1640,10 +1712,15 @@ class MainWindow(QtWidgets.QMainWindow):
                 Datos por defecto que se usarán para guardar registro
                 en el historial.
                 Default: None.
+            row: int | None = None
+                La fila a guardar. Si se pasa None, se usa la fila del
+                botón que ejecutó la función.
+                Default: None.
         """
         # Obtenemos el id de la fila, que es la posición donde se
         # apretó el boton de guardar.
-        row = tabla.indexAt(self.sender().pos()).row()
+        if row is None:
+            row = tabla.indexAt(self.sender().pos()).row()
         # Preguntamos si el usuario quiere guardar los cambios.
         info = "Esta acción no se puede deshacer. ¿Desea guardar los cambios hechos en la fila?"
         popup = PopUp("Pregunta", info).exec()
@@ -1654,7 +1731,7 @@ class MainWindow(QtWidgets.QMainWindow):
             # Si el guardado fue exitoso...
             if exito == True:
                 # Se muestra que el guardado fue con éxito.
-                tabla.cellWidget(row, tabla.columnCount()-2).setEnabled(False)
+                core.marcarFila(tabla, row, False)
                 info = "Los datos se han guardado con éxito."
                 PopUp("Aviso", info).exec()
                 self.actualizarSug()
@@ -1690,12 +1767,12 @@ class MainWindow(QtWidgets.QMainWindow):
                 #...si se hicieron cambios en la fila...
                 # Si el botón de guardar está habilitado, significa
                 # que la fila fue modificada.
-                if tabla.cellWidget(i, tabla.columnCount()-2).isEnabled():
+                if core.filaModificada(tabla, i):
                     # guardamos los cambios.
                     if not funcSave(tabla, i, self.usuario, datos):
                         exito=False
                     else:
-                        tabla.cellWidget(i, tabla.columnCount()-2).setEnabled(False)
+                        core.marcarFila(tabla, i, False)
 
             if exito==True:
                 info = "Los datos se han guardado con éxito."
@@ -1705,7 +1782,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 info = "Los datos se han guardado con errores. Revise los campos que quedaron sin guardar."
                 PopUp("Advertencia", info).exec()
 
-    def deleteStock(self, datos: list | None = None) -> None:
+    def deleteStock(self, datos: list | None = None,
+                    row: int | None = None) -> None:
         """Este método elimina una fila de la tabla de la gestión
         stock.
 
@@ -1715,11 +1793,16 @@ class MainWindow(QtWidgets.QMainWindow):
                 Datos por defecto que se usarán para guardar registro
                 en el historial.
                 Default: None.
+            row: int | None = None
+                La fila a eliminar. Si se pasa None, se usa la fila del
+                botón que ejecutó la función.
+                Default: None.
         """
         # Obtenemos la tabla stock
         tabla = self.pantallaStock.tableWidget
         # Obtenemos la fila en la que se presionó el botón eliminar
-        row = (tabla.indexAt(self.sender().pos())).row()
+        if row is None:
+            row = (tabla.indexAt(self.sender().pos())).row()
         idd = tabla.item(row, 0).text()
         # Si el id de la tabla está en blanco, significa que la tabla
         # fue recientemente agregada, entonces...
@@ -1740,7 +1823,7 @@ class MainWindow(QtWidgets.QMainWindow):
         # Para esta verificación, llamamos a la función del dal.
         hayRelacion = dal.verifElimStock(idd)
         desc=tabla.item(row, 1).text()
-        ubi=tabla.cellWidget(row, 9).text()
+        ubi=tabla.item(row, 9).text()
         if hayRelacion:
             mensaje = f"El elemento {desc} de la ubicación {ubi} tiene movimientos o un seguimiento de reparación relacionados. Por motivos de seguridad, debe eliminar primero los registros relacionados antes de eliminar esta herramienta/insumo."
             return PopUp('Advertencia', mensaje).exec()
@@ -1760,10 +1843,7 @@ class MainWindow(QtWidgets.QMainWindow):
             except TypeError:
                 datosEliminados = []
                 for numCol in range(tabla.columnCount() - 2):
-                    if core.camposStock[1][numCol] < 2:
-                        datosEliminados.append(tabla.item(row, numCol).text())
-                    else:
-                        datosEliminados.append(tabla.cellWidget(row, numCol).text())
+                    datosEliminados.append(tabla.item(row, numCol).text())
 
             # Insertamos los datos en el historial para que quede registro.
             dal.insertarHistorial(
@@ -1782,52 +1862,101 @@ class MainWindow(QtWidgets.QMainWindow):
         boton = PopUp('Advertencia', info).exec()
         # Si se cerro sin apretar ok, no se ejecuta.
         if boton == QtWidgets.QMessageBox.StandardButton.Ok:
-            # Creamos la ventana filedialog.
-            filename = QtWidgets.QFileDialog(self).getSaveFileName(self,
-                'Guardar archivo', os.path.expanduser('~documents'),
-                'Hoja de cálculo (*.xlsx)'
-            );
-            # Si no se abrió un archivo, corta la función
-            if not filename[0]:
-                return
+            self.exportar("stock")
+
+    def exportar(self, listado: str):
+        """Este método exporta un listado a un archivo, con los mismos
+        filtros con los que se está mostrando. El formato se elige en
+        la ventana de guardado y el listado se escribe en segundo
+        plano, mostrando el progreso.
+
+        Parámetros
+        ----------
+            listado: str
+                El nombre del listado a exportar.
+        """
+        formatos = formatosDisponibles()
+        # Creamos la ventana filedialog.
+        filename = QtWidgets.QFileDialog(self).getSaveFileName(self,
+            'Guardar archivo', os.path.expanduser('~documents'),
+            ';;'.join(formatos.values())
+        )
+        # Si no se abrió un archivo, corta la función
+        if not filename[0]:
+            return
+        # El formato es el del filtro elegido, y si el nombre no tiene
+        # su extensión, se la agregamos.
+        formato = next(extension for extension, descripcion
+                       in formatos.items() if descripcion == filename[1])
+        ruta = filename[0]
+        if not ruta.lower().endswith(f'.{formato}'):
+            ruta += f'.{formato}'
+
+        busqueda, filtros, desde, hasta = self.filtrosExportacion.get(
+            listado, ("", None, None, None))
+        exportacion = Exportacion(listado, ruta, formato, busqueda,
+                                  filtros, desde, hasta, self)
+        self.ejecutarConProgreso(
+            exportacion, 'Exportando...', 'Exportar', 0,
+            "Los datos se exportaron exitosamente.")
+
+    def ejecutarConProgreso(self, tarea: QtCore.QObject, texto: str,
+                            titulo: str, total: int, aviso: str,
+                            funcFin: function | None = None):
+        """Este método ejecuta una tarea en segundo plano, mostrando
+        el progreso en un diálogo desde el que se puede cancelar.
+
+        Parámetros
+        ----------
+            tarea: QtCore.QObject
+                La tarea. Debe tener los métodos iniciar y cancelar y
+                las señales progreso(int) y terminado(bool, str). Si
+                además tiene la señal total(int), el diálogo la usa
+                como máximo.
+
+            texto: str
+                El texto del diálogo.
 
-            # Obtenemos los filtros
-            barraBusqueda = self.pantallaStock.lineEdit
-            listaUbi = self.pantallaStock.listaUbi
-            # Obtenemos los datos de los filtros.
-            if listaUbi.currentText() == "Todas":
-                filtroUbi = (None,)
+            titulo: str
+                El título del diálogo.
+
+            total: int
+                El valor máximo del progreso. Si es 0, el diálogo
+                muestra una barra sin fin.
+
+            aviso: str
+                El mensaje que se muestra si la tarea termina bien.
+
+            funcFin: function | None = None
+                La función que se llama si la tarea termina bien, antes
+                del aviso. Default: None.
+        """
+        dialogo = QtWidgets.QProgressDialog(texto, 'Cancelar', 0, total,
+                                            self)
+        dialogo.setWindowTitle(titulo)
+        dialogo.setWindowModality(QtCore.Qt.WindowModality.WindowModal)
+        dialogo.setAutoReset(False)
+        if hasattr(tarea, 'total'):
+            tarea.total.connect(dialogo.setMaximum)
+        tarea.progreso.connect(dialogo.setValue)
+        dialogo.canceled.connect(tarea.cancelar)
+
+        def terminar(exito: bool, mensaje: str):
+            dialogo.canceled.disconnect(tarea.cancelar)
+            dialogo.close()
+            tarea.deleteLater()
+            if exito:
+                if funcFin:
+                    funcFin()
+                PopUp('Aviso', aviso).exec()
             else:
-                filtroUbi = (listaUbi.currentText(),)
-
-            # Obtenemos los datos usando los filtros ingresados.
-            datos = dal.obtenerDatos(
-                "stock", barraBusqueda.text(), filtroUbi)
-            # Definimos las columnas de la spreadsheet en una lista
-            columnas = ["Elemento", "Cant. en Condiciones",
-                        "Cant. en Reparación", "Cant. de Baja",
-                        "Cant. Prestadas", "Total", "Grupo", "Subgrupo",
-                        "Ubicación"]
-            # Creamos el dataframe. Usamos la list comprehension
-            # para ignorar el campo id de las filas al generarlo.
-            df = pd.DataFrame([i[1:] for i in datos], columns=columnas)
-            # Intentamos...
-            try:
-                #... crear el xlsx a partir del dataframe.
-                df.to_excel(filename[0])
-                info = "Los datos se imprimieron exitosamente."
-                PopUp('Aviso', info).exec()
-            # Excepto que el sistema no permita la generación...
-            except PermissionError:
-                # suele ocurrir porque se quiere reemplazar un archivo
-                # que está siendo usado por otra app, y windows no deja
-                # hacer eso.
-                info = "Ocurrió un error al imprimir la tabla. Esto pudo haber ocurrido porque intentó reemplazar un documento que tenía abierto o estaba siendo usado por otra app. Por favor, verifique que el documento que desea reemplazar esté cerrado y no esté siendo usado por ningún otra app."
-                PopUp('Aviso', info).exec()
+                PopUp('Error', mensaje).exec()
+        tarea.terminado.connect(terminar)
+        tarea.iniciar()
 
     def cargarPlanillaAlumnos(self):
-        """Este método crea un dataframe para la carga de datos
-        de una spreadsheet en la base de datos de la gestión alumnos.
+        """Este método carga los datos de una spreadsheet en la base
+        de datos de la gestión alumnos.
         """
         info = '¿La planilla está en el formato de tutorvip?'
         formato = PopUp('Pregunta-Info', info).exec()
@@ -1870,7 +1999,7 @@ class MainWindow(QtWidgets.QMainWindow):
         dialog.setFileMode(QtWidgets.QFileDialog.FileMode.ExistingFile)
         dialog.setViewMode(QtWidgets.QFileDialog.ViewMode.List)
         dialog.setNameFilter(
-            "Hoja de cálculo (*.xlsx *.xls *.xlsm *.xlsb *.xltx *.xltm *.xlt *.xlam *.xla *.xlw *.xlr)")
+            "Hoja de cálculo (*.xlsx *.xls *.xlsm *.xlsb *.xltx *.xltm *.xlt *.xlam *.xla *.xlw *.xlr *.csv)")
         dialog.setWindowTitle('Abrir archivo')
         # Si abrió un archivo el usuario...
         if dialog.exec():
@@ -1880,43 +2009,45 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             return
         
-        # Intentamos hacer el dataframe a partir del excel
+        # Intentamos abrir la planilla. Por ahora solo se lee el
+        # encabezado; las filas se leen de a bloques al cargarla.
         try:
-            df = pd.read_excel(filename)
+            lector = LectorPlanilla(filename)
         # Si el archivo no es válido, avisamos y cortamos la funcion.
         except:
             info = 'El archivo proporcionado no es válido como planilla. Proporcione un archivo válido.'
             return PopUp('Error', info).exec()
         # Obtenemos las columnas
-        cols = list(df.columns.values)
+        cols = lector.encabezado
 
         # Si la cantidad de columnas es menor a 3, corta
         if len(cols) != 3:
+            lector.cerrar()
             info = 'La plantilla proporcionada tiene una cantidad de columnas distinta al formato requerido. Proporcione la cantidad justa de columnas.'
             return PopUp('Error', info).exec()
 
         # Si va con formato de tutorvip, cambiamos las columnas de 
         # orden
-        if formato:
-            df = df[[cols[2], cols[0], cols[1]]]
-            cols = list(df.columns.values)
+        orden = [2, 0, 1] if formato else [0, 1, 2]
+        cols = [cols[i] for i in orden]
 
         # Si las columnas están en el orden incorrecto, corta
         if ("dni" in cols[0].lower() or "curso" in cols[0].lower()
             or "dni" in cols[1].lower() or "curso" in cols[2].lower()
                 or "nombre" in cols[2].lower()):
+            lector.cerrar()
             info = 'Los datos proporcionados no están ordenados correctamente. Ordene los datos de la planilla correctamente e intente nuevamente.'
             return PopUp('Error', info).exec()
         
-        # Ejecutamos el cargar planilla del dal.
-        dal.cargarPlanillaAlumnos(df.values.tolist(), actualizarCursos)
-        # Refrescamos la gestión de alumnos.
-        self.fetchAlumnos()
-        PopUp('Aviso', 'La planilla se ha cargado con éxito.').exec()
+        # Cargamos la planilla en segundo plano y, al terminar,
+        # refrescamos la gestión de alumnos. Los alumnos que no están
+        # en la planilla pasan a ser egresados.
+        self.cargarPlanilla(lector, orden, "Alumno", "Egresado",
+                            self.fetchAlumnos, not actualizarCursos)
 
     def cargarPlanillaPersonal(self):
-        """Este método crea un dataframe para la carga de datos
-        de una spreadsheet en la base de datos de la gestión personal.
+        """Este método carga los datos de una spreadsheet en la base
+        de datos de la gestión personal.
         """
         info = 'Esta acción no se puede deshacer. Los datos de la gestión se actualizarán en base al dni y se actualizarán los nombres y las clases en base a los datos de la planilla. Asegúrese que los dni de la planilla y de la gestión personal sean correctos, de lo contrario se pueden originar personal duplicado. Además, asegúrese de que los datos (columnas) de la planilla esten en el siguiente orden: nombre, clase y dni.'
         # Si cerro sin responder, corta la función.
@@ -1930,7 +2061,7 @@ class MainWindow(QtWidgets.QMainWindow):
         dialog.setFileMode(QtWidgets.QFileDialog.FileMode.ExistingFile)
         dialog.setViewMode(QtWidgets.QFileDialog.ViewMode.List)
         dialog.setNameFilter(
-            "Hoja de cálculo (*.xlsx *.xls *.xlsm *.xlsb *.xltx *.xltm *.xlt *.xlam *.xla *.xlw *.xlr)")
+            "Hoja de cálculo (*.xlsx *.xls *.xlsm *.xlsb *.xltx *.xltm *.xlt *.xlam *.xla *.xlw *.xlr *.csv)")
         dialog.setWindowTitle('Abrir archivo')
         # Si abrió un archivo el usuario...
         if dialog.exec():
@@ -1940,32 +2071,72 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             return
         
-        # Intentamos hacer el dataframe a partir del excel
+        # Intentamos abrir la planilla. Por ahora solo se lee el
+        # encabezado; las filas se leen de a bloques al cargarla.
         try:
-            df = pd.read_excel(planilla)
+            lector = LectorPlanilla(planilla)
         # Si el archivo no es válido, avisamos y cortamos la funcion.
         except:
             info = 'El archivo proporcionado no es válido como planilla. Proporcione un archivo válido.'
             return PopUp('Error', info).exec()
         # Obtenemos las columnas
-        cols = list(df.columns.values)
+        cols = lector.encabezado
 
         # Si la cantidad de columnas es dsitinta a 3, corta
         if len(cols) != 3:
+            lector.cerrar()
             info = 'La plantilla proporcionada tiene una cantidad de columnas distinta al formato requerido. Proporcione la cantidad justa de columnas.'
             return PopUp('Error', info).exec()
 
         # Si las columnas están en el orden incorrecto, corta
         if ("dni" in cols[0].lower() or "dni" in cols[1].lower() 
                                 or "nombre" in cols[2].lower()):
+            lector.cerrar()
             info = 'Los datos proporcionados no están ordenados correctamente. Ordene los datos de la planilla correctamente e intente nuevamente.'
             return PopUp('Error', info).exec()
         
-        # Ejecutamos el cargar planilla del dal.
-        dal.cargarPlanillaPersonal(df.values.tolist())
-        # Refrescamos la gestión de alumnos.
-        self.fetchOtroPersonal()
-        PopUp('Aviso', 'La planilla se ha cargado con éxito.').exec()
+        # Cargamos la planilla en segundo plano y, al terminar,
+        # refrescamos la gestión de personal. El personal que no está
+        # en la planilla pasa a estar destituído.
+        self.cargarPlanilla(lector, [0, 1, 2], "Personal", "Destituído",
+                            self.fetchOtroPersonal)
+
+    def cargarPlanilla(self, lector: LectorPlanilla, orden: list,
+                       categoria: str, baja: str, funcFetch: function,
+                       cursosTutorvip: bool = False):
+        """Este método carga una planilla en segundo plano, mostrando
+        el progreso en un diálogo desde el que se puede cancelar.
+
+        Parámetros
+        ----------
+            lector: LectorPlanilla
+                El lector de la planilla.
+
+            orden: list
+                Las posiciones de las columnas nombre, clase y dni.
+
+            categoria: str
+                La categoría de clase de las personas de la planilla.
+
+            baja: str
+                La clase de las personas de la categoría que no están
+                en la planilla.
+
+            funcFetch: function
+                La función que refresca la gestión al terminar.
+
+            cursosTutorvip: bool = False
+                Si los cursos se pasan al formato de tutorvip.
+                Default: False.
+        """
+        # El total de filas no incluye el encabezado. Si no se sabe,
+        # el diálogo muestra una barra sin fin.
+        carga = CargaPlanilla(lector, orden, categoria, baja,
+                              cursosTutorvip, self)
+        self.ejecutarConProgreso(
+            carga, 'Cargando la planilla...', 'Cargar planilla',
+            max(lector.total - 1, 0), 'La planilla se ha cargado con éxito.',
+            funcFetch)
     
     def fetchAlumnos(self):
         """Este método refresca la gestión de alumnos."""
@@ -2017,7 +2188,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(1)
+        self.pantallas.mostrar("pantallaAlumnos")
 
     def deleteAlumnos(self, datos: list | None = None) -> None:
         """Este método elimina una fila de la tabla de la gestión
@@ -2096,47 +2267,15 @@ class MainWindow(QtWidgets.QMainWindow):
         desdeFecha.setMaximumDateTime(QtCore.QDateTime.currentDateTime())
         hastaFecha.setMinimumDateTime(QtCore.QDateTime.currentDateTime())
 
+        # Las opciones de las listas salen de la caché de
+        # vocabularios: solo se vuelven a consultar y cargar si se
+        # escribió en sus tablas.
+        core.llenarLista(listaElem, "elementos", "Todos")
+        core.llenarLista(listaPersona, "personas", "Todas")
+        core.llenarLista(listaPanolero, "panoleros", "Todos")
         elemSeleccionado = listaElem.currentText()
-        elems = bdd.cur.execute("""SELECT DISTINCT s.descripcion
-                                FROM movimientos m
-                                JOIN stock s
-                                ON s.id=m.id_elem""").fetchall()
-        listaElem.clear()
-        listaElem.addItem("Todos")
-        for elem in elems:
-            listaElem.addItem(elem[0])
-        listaElem.setCurrentIndex(listaElem.findText(elemSeleccionado))
-
         personaSeleccionada = listaPersona.currentText()
-        personas = bdd.cur.execute("""SELECT DISTINCT p.nombre_apellido || ' ' || c.descripcion 
-                                FROM movimientos m
-                                JOIN personal p
-                                ON p.id=m.id_persona
-                                JOIN clases c
-                                ON p.id_clase = c.id""").fetchall()
-        listaPersona.clear()
-        listaPersona.addItem("Todas")
-        for persona in personas:
-            listaPersona.addItem(persona[0])
-        listaPersona.setCurrentIndex(
-            listaPersona.findText(personaSeleccionada))
-
         panoleroSeleccionado = listaPanolero.currentText()
-        panoleros = bdd.cur.execute("""SELECT DISTINCT p.nombre_apellido || ' ' || c.descripcion
-                                FROM movimientos m
-                                JOIN turnos t
-                                ON m.id_turno = t.id
-                                JOIN personal p
-                                ON p.id=t.id_panolero
-                                JOIN clases c
-                                ON p.id_clase = c.id""").fetchall()
-
-        listaPanolero.clear()
-        listaPanolero.addItem("Todos")
-        for panolero in panoleros:
-            listaPanolero.addItem(panolero[0])
-        listaPanolero.setCurrentIndex(
-            listaPanolero.findText(panoleroSeleccionado))
 
         filtros = []
         for i in (nId, nTurno):
@@ -2160,51 +2299,50 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             filtros.append(panoleroSeleccionado)
 
-        datosCrudos = dal.obtenerDatos(
-            "movimientos", barraBusqueda.text(), filtros)
-        datos = []
-        for rowData in datosCrudos:
-            fecha = QtCore.QDateTime.fromString(
-                rowData[8], 'yyyy/MM/dd HH:mm:ss')
-            if fecha >= desdeFecha.dateTime() and fecha <= hastaFecha.dateTime():
-                datos.append(rowData)
-
-        tabla.setRowCount(0)
-
-        for rowNum, rowData in enumerate(datos):
-            tabla.insertRow(rowNum)
-            for cellNum, cellData in enumerate(rowData):
-                if core.camposMovs[1][cellNum]:
-                    item = QtWidgets.QTableWidgetItem(str(cellData))
-                else:
-                    item = QtWidgets.QTableWidgetItem()
-                    item.setData(0, cellData)
-                item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                              QtCore.Qt.ItemFlag.ItemIsEnabled)
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                tabla.setItem(rowNum, cellNum, item)
-            tabla.setRowHeight(rowNum, 35)
-        tabla.resizeRowsToContents()
-        tabla.resizeColumnsToContents()
+        # El rango de fechas se filtra en la consulta. Guardamos los
+        # filtros actuales para que todas las páginas usen los mismos.
+        busqueda = barraBusqueda.text()
+        desde = desdeFecha.dateTime().toPyDateTime()
+        hasta = hastaFecha.dateTime().toPyDateTime()
+
+        # Todas las páginas se piden en el hilo de consultas, con la
+        # misma clave: una búsqueda nueva corta la página que se esté
+        # cargando. Cuando llega la primera, el modelo la muestra y
+        # pide las siguientes a medida que se baja en la tabla.
+        def pedirPagina(ultimaFila, funcResultado, funcCancelado):
+            dalAsincrona.obtenerPagina(
+                "movimientos", funcResultado, "movimientos", busqueda,
+                filtros, desde, hasta, ultimaFila,
+                funcCancelado=funcCancelado)
+        def mostrarMovs(datos):
+            self.modeloMovs.setFuncPagina(pedirPagina, datos)
+            tabla.resizeColumnsToContents()
+        dalAsincrona.obtenerDatos(
+            "movimientos", mostrarMovs, "movimientos", busqueda, filtros,
+            desde, hasta, limite=TAMANO_PAGINA)
+        self.filtrosExportacion["movimientos"] = (
+            busqueda, filtros, desde, hasta)
         tabla.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded);
 
         listaElem.setMinimumWidth(
             listaElem.minimumSizeHint().width() + 100
         )
-        listaElem.currentIndexChanged.connect(self.fetchMovs)
+        listaElem.currentIndexChanged.connect(self.busquedaMovs.programar)
         listaPersona.setMinimumWidth(
             listaPersona.minimumSizeHint().width() + 100
         )
-        listaPersona.currentIndexChanged.connect(self.fetchMovs)
+        listaPersona.currentIndexChanged.connect(
+            self.busquedaMovs.programar)
         listaPanolero.setMinimumWidth(
             listaPanolero.minimumSizeHint().width() + 100
         )
-        listaPanolero.currentIndexChanged.connect(self.fetchMovs)
-        desdeFecha.dateTimeChanged.connect(self.fetchMovs)
-        hastaFecha.dateTimeChanged.connect(self.fetchMovs)
+        listaPanolero.currentIndexChanged.connect(
+            self.busquedaMovs.programar)
+        desdeFecha.dateTimeChanged.connect(self.busquedaMovs.programar)
+        hastaFecha.dateTimeChanged.connect(self.busquedaMovs.programar)
 
-        self.stackedWidget.setCurrentIndex(4)
+        self.pantallas.mostrar("pantallaMovs")
 
     def fetchGrupos(self):
         """Este método refresca la gestión de grupos."""
@@ -2244,7 +2382,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(2)
+        self.pantallas.mostrar("pantallaGrupos")
 
     def deleteGrupos(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión de
@@ -2288,6 +2426,7 @@ class MainWindow(QtWidgets.QMainWindow):
             dal.insertarHistorial(self.usuario, 'Eliminación', 'Grupos',
                                   datosEliminados[1], None)
             dal.eliminarDatos('grupos', idd)
+            self.actualizarSug()
             tabla.removeRow(row)
 
     def fetchOtroPersonal(self):
@@ -2343,7 +2482,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(5)
+        self.pantallas.mostrar("pantallaOtroPersonal")
 
     def deleteOtroPersonal(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión del
@@ -2434,7 +2573,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(6)
+        self.pantallas.mostrar("pantallaSubgrupos")
 
     def deleteSubgrupos(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión
@@ -2477,6 +2616,7 @@ class MainWindow(QtWidgets.QMainWindow):
             dal.insertarHistorial(self.usuario, 'Eliminación', 'Subgrupos',
                                   datosEliminados[1], datosEliminados[2:])
             dal.eliminarDatos('subgrupos', idd)
+            self.actualizarSug()
             tabla.removeRow(row)
 
     def fetchTurnos(self):
@@ -2506,29 +2646,15 @@ class MainWindow(QtWidgets.QMainWindow):
         else:
             filtro = (None,)
 
-        tabla.setRowCount(0)
-        datosCrudos = dal.obtenerDatos("turnos", barraBusqueda.text(), filtro)
-        datos = []
-        for rowData in datosCrudos:
-            fecha = QtCore.QDate.fromString(rowData[2][:10], 'yyyy/MM/dd')
-            if fecha >= desdeFecha.date() and fecha <= hastaFecha.date():
-                datos.append(rowData)
-
-        for rowNum, rowData in enumerate(datos):
-            tabla.insertRow(rowNum)
-            for cellNum, cellData in enumerate(rowData):
-                if core.camposTurnos[1][cellNum]:
-                    item = QtWidgets.QTableWidgetItem(str(cellData))
-                else:
-                    item = QtWidgets.QTableWidgetItem()
-                    item.setData(0, cellData)
-                item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                              QtCore.Qt.ItemFlag.ItemIsEnabled)
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                tabla.setItem(rowNum, cellNum, item)
-            tabla.setRowHeight(rowNum, 35)
-        tabla.resizeRowsToContents()
-        tabla.resizeColumnsToContents()
+        def mostrarTurnos(datos):
+            self.modeloTurnos.setFilas(datos)
+            tabla.resizeColumnsToContents()
+        dalAsincrona.obtenerDatos(
+            "turnos", mostrarTurnos, "turnos", barraBusqueda.text(), filtro,
+            desdeFecha.date().toPyDate(), hastaFecha.date().toPyDate())
+        self.filtrosExportacion["turnos"] = (
+            barraBusqueda.text(), filtro, desdeFecha.date().toPyDate(),
+            hastaFecha.date().toPyDate())
         tabla.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded);
         tabla.horizontalHeader(
@@ -2544,7 +2670,10 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.horizontalHeader(
         ).setSectionResizeMode(6, QtWidgets.QHeaderView.ResizeMode.Stretch)
 
-        self.stackedWidget.setCurrentIndex(7)
+        desdeFecha.dateChanged.connect(self.busquedaTurnos.programar)
+        hastaFecha.dateChanged.connect(self.busquedaTurnos.programar)
+
+        self.pantallas.mostrar("pantallaTurnos")
 
     def fetchUsuarios(self):
         """Este método refresca la gestión usuarios."""
@@ -2605,7 +2734,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(8)
+        self.pantallas.mostrar("pantallaUsuarios")
 
     def deleteUsuarios(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión
@@ -2704,7 +2833,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(10)
+        self.pantallas.mostrar("pantallaClases")
 
     def fetchUbis(self):
         """Este método refresca la gestión ubicaciones."""
@@ -2746,7 +2875,7 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.setSortingEnabled(True)
         tabla.cellChanged.connect(self.habilitarSaves)
 
-        self.stackedWidget.setCurrentIndex(12)
+        self.pantallas.mostrar("pantallaUbis")
 
     def deleteUbis(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión
@@ -2788,6 +2917,7 @@ class MainWindow(QtWidgets.QMainWindow):
             dal.insertarHistorial(self.usuario, 'Eliminación', 'Ubicaciones',
                                   datosEliminados[1], None)
             dal.eliminarDatos('ubicaciones', idd)
+            self.actualizarSug()
             tabla.removeRow(row)
 
     def fetchReps(self):
@@ -2810,36 +2940,16 @@ class MainWindow(QtWidgets.QMainWindow):
         desdeFecha.setMaximumDate(QtCore.QDate.currentDate())
         hastaFecha.setMinimumDate(QtCore.QDate.currentDate())
 
-        datosCrudos = dal.obtenerDatos("reparaciones", barraBusqueda.text())
-        datos = []
-        for rowData in datosCrudos:
-            fechaEnvio = QtCore.QDate.fromString(rowData[5], 'yyyy/MM/dd')
-            fechaRegreso = QtCore.QDate.fromString(rowData[6], 'yyyy/MM/dd')
-            if (
-                fechaEnvio >= desdeFecha.date()
-                and fechaEnvio <= hastaFecha.date()
-            ) or (
-                fechaRegreso >= desdeFecha.date()
-                and fechaRegreso <= hastaFecha.date()
-            ):
-                datos.append(rowData)
-        tabla.setRowCount(0)
-
-        for rowNum, rowData in enumerate(datos):
-            tabla.insertRow(rowNum)
-            for cellNum, cellData in enumerate(rowData):
-                if core.camposReps[1][cellNum]:
-                    item = QtWidgets.QTableWidgetItem(str(cellData))
-                else:
-                    item = QtWidgets.QTableWidgetItem()
-                    item.setData(0, cellData)
-                item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                              QtCore.Qt.ItemFlag.ItemIsEnabled)
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                tabla.setItem(rowNum, cellNum, item)
-            tabla.setRowHeight(rowNum, 35)
-        tabla.resizeRowsToContents()
-        tabla.resizeColumnsToContents()
+        def mostrarReps(datos):
+            self.modeloReps.setFilas(datos)
+            tabla.resizeColumnsToContents()
+        dalAsincrona.obtenerDatos(
+            "reparaciones", mostrarReps, "reparaciones",
+            barraBusqueda.text(), None, desdeFecha.date().toPyDate(),
+            hastaFecha.date().toPyDate())
+        self.filtrosExportacion["reparaciones"] = (
+            barraBusqueda.text(), None, desdeFecha.date().toPyDate(),
+            hastaFecha.date().toPyDate())
         tabla.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded);
         tabla.horizontalHeader(
@@ -2849,10 +2959,10 @@ class MainWindow(QtWidgets.QMainWindow):
         tabla.horizontalHeader(
         ).setSectionResizeMode(4, QtWidgets.QHeaderView.ResizeMode.Stretch)
 
-        desdeFecha.dateChanged.connect(self.fetchReps)
-        hastaFecha.dateChanged.connect(self.fetchReps)
+        desdeFecha.dateChanged.connect(self.busquedaReps.programar)
+        hastaFecha.dateChanged.connect(self.busquedaReps.programar)
 
-        self.stackedWidget.setCurrentIndex(11)
+        self.pantallas.mostrar("pantallaReps")
 
     def deleteClases(self, datos: list | None = None):
         """Este método elimina una fila de la tabla de la gestión
@@ -2920,173 +3030,45 @@ class MainWindow(QtWidgets.QMainWindow):
         desdeFecha.setMaximumDateTime(QtCore.QDateTime.currentDateTime())
         hastaFecha.setMinimumDateTime(QtCore.QDateTime.currentDateTime())
 
+        core.llenarLista(listaGestion, "gestiones", "Todas")
         gestionSeleccionada = listaGestion.currentText()
-        gestiones = bdd.cur.execute("""SELECT DISTINCT g.descripcion
-                                FROM historial h
-                                JOIN gestiones g
-                                ON g.id=h.id_gest""").fetchall()
-        listaGestion.clear()
-        listaGestion.addItem("Todas")
-        for gestion in gestiones:
-            listaGestion.addItem(gestion[0])
-        listaGestion.setCurrentIndex(
-            listaGestion.findText(gestionSeleccionada))
 
         if gestionSeleccionada == "Todas":
             filtroGestion = (None,)
         else:
             filtroGestion = (gestionSeleccionada,)
 
-        tabla.setRowCount(0)
-        rawData = dal.obtenerDatos("historial", None, filtroGestion)
-        datos = []
-        for rawRow in rawData:
-            fecha = QtCore.QDateTime.fromString(
-                rawRow[1], 'yyyy/MM/dd HH:mm:ss')
-            if fecha >= desdeFecha.dateTime() and fecha <= hastaFecha.dateTime():
-                if rawRow[2] == 'Stock':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"""                Se insertó la herramienta {rawRow[4]}, con los siguientes datos:
-                        - Cantidad en condiciones: {datosInsertados[0]}
-                        - Cantidad de baja: {datosInsertados[1]}
-                        - Grupo: {datosInsertados[2]}
-                        - Subgrupo: {datosInsertados[3]}
-                        - Ubicación: {datosInsertados[4]}"""
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"""                Se editó la herramienta {rawRow[4]}, y se reemplazaron los siguientes datos:
-                        - Descripción: {rawRow[4]}, por {datosNuevos[0]}
-                        - Cantidad en condiciones: {datosViejos[0]}, por {datosNuevos[1]}
-                        - Cantidad de baja: {datosViejos[1]}, por {datosNuevos[2]}
-                        - Grupo: {datosViejos[2]}, por {datosNuevos[3]}
-                        - Subgrupo: {datosViejos[3]}, por {datosNuevos[4]}
-                        - Ubicación: {datosViejos[4]}, por {datosNuevos[5]}"""
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"""                Se eliminó la herramienta {rawRow[4]}, que tenía los siguientes datos:
-                        - Cantidad en condiciones: {datosEliminados[0]}
-                        - Cantidad en reparacion: {datosEliminados[1]}
-                        - Cantidad de baja: {datosEliminados[2]}
-                        - Cantidad prestadas: {datosEliminados[3]}
-                        - Grupo: {datosEliminados[4]}
-                        - Subgrupo: {datosEliminados[5]}
-                        - Ubicación: {datosEliminados[6]}"""
-                elif rawRow[2] == 'Subgrupos':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"Se insertó el subgrupo {rawRow[4]}, perteneciendo al grupo {datosInsertados[0]}."
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"""                Se editó el subgrupo {rawRow[4]}, y se reemplazaron los siguientes datos:
-                        - Subgrupo: {rawRow[4]}, por {datosNuevos[0]}
-                        - Grupo: {datosViejos[0]}, por {datosNuevos[1]}"""
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó el subgrupo {rawRow[4]}, que pertenecía al grupo {datosEliminados[0]}."
-                elif rawRow[2] == 'Grupos':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"Se insertó el grupo {rawRow[4]}."
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"Se editó el grupo {rawRow[4]}, y se reemplazó por el grupo {datosNuevos[0]}."
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó el grupo {rawRow[4]}."
-                elif rawRow[2] == 'Alumnos':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"""                Se insertó el alumno {rawRow[4]}, con los siguientes datos:
-                        - Curso: {datosInsertados[0]}
-                        - DNI: {datosInsertados[1]}"""
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"""                Se editó el alumno {rawRow[4]}, y se reemplazaron los siguientes datos:
-                        - Nombre y apellido: {rawRow[4]}, por {datosNuevos[0]}
-                        - Curso: {datosViejos[0]}, por {datosNuevos[1]}
-                        - DNI: {datosViejos[1]}, por {datosNuevos[2]}"""
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó el alumno {rawRow[4]}, que pertenecía al curso {datosEliminados[0]} y tenía el dni {datosEliminados[1]}."
-                elif rawRow[2] == 'Personal':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"""                Se insertó el personal {rawRow[4]}, con los siguientes datos:
-                        - Clase: {datosInsertados[0]}
-                        - DNI: {datosInsertados[1]}"""
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"""                Se editó el personal {rawRow[4]}, y se reemplazaron los siguientes datos:
-                        - Nombre y apellido: {rawRow[4]}, por {datosNuevos[0]}
-                        - Clase: {datosViejos[0]}, por {datosNuevos[1]}
-                        - DNI: {datosViejos[1]}, por {datosNuevos[2]}"""
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó el personal {rawRow[4]}, cuya clase era {datosEliminados[0]} y tenía el dni {datosEliminados[1]}."
-                elif rawRow[2] == 'Clases':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"Se insertó la clase {rawRow[4]}, perteneciendo a la categoría {datosInsertados[0]}."
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"""                Se editó la clase {rawRow[4]}, y se reemplazaron los siguientes datos:
-                        - Clase: {rawRow[4]}, por {datosNuevos[0]}
-                        - Categoría: {datosViejos[0]}, por {datosNuevos[1]}"""
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó la clase {rawRow[4]}, que pertenecía a la categoría {datosEliminados[0]}."
-                elif rawRow[2] == 'Ubicaciones':
-                    if rawRow[3] == 'Inserción':
-                        datosInsertados = rawRow[6].split(';')
-                        desc = f"Se insertó la ubicación {rawRow[4]}."
-                    elif rawRow[3] == 'Edición':
-                        datosViejos = rawRow[5].split(';')
-                        datosNuevos = rawRow[6].split(';')
-                        desc = f"Se editó la ubicación {rawRow[4]}, y se reemplazó por la ubicación {datosNuevos[0]}."
-                    elif rawRow[3] == 'Eliminación':
-                        datosEliminados = rawRow[5].split(';')
-                        desc = f"Se eliminó la ubicación {rawRow[4]}."
-
-                row = [rawRow[0], rawRow[1], rawRow[2],
-                       rawRow[3], rawRow[4], dedent(desc)]
-                for cellData in row:
-                    if barraBusqueda.text() in cellData:
-                        datos.append(row)
-                        break
-
-        for rowNum, rowData in enumerate(datos):
-            tabla.insertRow(rowNum)
-            for cellNum, cellData in enumerate(rowData):
-                if core.camposHistorial[1][cellNum]:
-                    item = QtWidgets.QTableWidgetItem(str(cellData))
-                else:
-                    item = QtWidgets.QTableWidgetItem()
-                    item.setData(0, cellData)
-                item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                              QtCore.Qt.ItemFlag.ItemIsEnabled)
-                item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                tabla.setItem(rowNum, cellNum, item)
-
-            tabla.setRowHeight(rowNum, 35)
+        # El rango de fechas se filtra en la consulta, y la
+        # descripción de cada cambio ya viene armada. Como en
+        # movimientos, el historial se carga de a páginas.
+        busqueda = barraBusqueda.text()
+        desde = desdeFecha.dateTime().toPyDateTime()
+        hasta = hastaFecha.dateTime().toPyDateTime()
+        def pedirPagina(ultimaFila, funcResultado, funcCancelado):
+            dalAsincrona.obtenerPagina(
+                "historial", funcResultado, "historial", busqueda,
+                filtroGestion, desde, hasta, ultimaFila,
+                funcCancelado=funcCancelado)
+        def mostrarHistorial(datos):
+            self.modeloHistorial.setFuncPagina(pedirPagina, datos)
+            tabla.resizeRowsToContents()
+            tabla.resizeColumnsToContents()
+        dalAsincrona.obtenerDatos(
+            "historial", mostrarHistorial, "historial", busqueda,
+            filtroGestion, desde, hasta, limite=TAMANO_PAGINA)
+        self.filtrosExportacion["historial"] = (
+            busqueda, filtroGestion, desde, hasta)
         tabla.setVerticalScrollBarPolicy(
             QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded);
-        tabla.resizeRowsToContents()
-        tabla.resizeColumnsToContents()
         listaGestion.setMinimumWidth(
             listaGestion.minimumSizeHint().width() + 100
         )
-        listaGestion.currentIndexChanged.connect(self.fetchHistorial)
-        desdeFecha.dateTimeChanged.connect(self.fetchHistorial)
-        hastaFecha.dateTimeChanged.connect(self.fetchHistorial)
+        listaGestion.currentIndexChanged.connect(
+            self.busquedaHistorial.programar)
+        desdeFecha.dateTimeChanged.connect(self.busquedaHistorial.programar)
+        hastaFecha.dateTimeChanged.connect(self.busquedaHistorial.programar)
 
-        self.stackedWidget.setCurrentIndex(9)
+        self.pantallas.mostrar("pantallaHistorial")
 
     def fetchDeudas(self):
         """Este método refresca el listado de deudas."""
@@ -3112,22 +3094,8 @@ class MainWindow(QtWidgets.QMainWindow):
         except:
             pass
 
+        core.llenarLista(listaPanolero, "panoleros", "Todos")
         panoleroSeleccionado = listaPanolero.currentText()
-        panoleros = bdd.cur.execute("""SELECT DISTINCT p.nombre_apellido || ' ' || c.descripcion
-                                FROM movimientos m
-                                JOIN turnos t
-                                ON m.id_turno = t.id
-                                JOIN personal p
-                                ON p.id=t.id_panolero
-                                JOIN clases c
-                                ON p.id_clase = c.id""").fetchall()
-
-        listaPanolero.clear()
-        listaPanolero.addItem("Todos")
-        for panolero in panoleros:
-            listaPanolero.addItem(panolero[0])
-        listaPanolero.setCurrentIndex(
-            listaPanolero.findText(panoleroSeleccionado))
 
         filtros = []
         for i in (nMov, nTurno):
@@ -3161,6 +3129,8 @@ class MainWindow(QtWidgets.QMainWindow):
             colData = 2
         
         datos = dal.obtenerDatos("deudas", barraBusqueda.text(), filtros)
+        self.filtrosExportacion["deudas"] = (
+            barraBusqueda.text(), filtros, None, None)
         datos = sorted(datos, key=lambda i:i[colData])
         try:
             grupo = datos[0][colData]
@@ -3268,9 +3238,10 @@ class MainWindow(QtWidgets.QMainWindow):
         listaPanolero.setMinimumWidth(
             listaPanolero.minimumSizeHint().width() + 100
         )
-        listaPanolero.currentIndexChanged.connect(self.fetchDeudas)
+        listaPanolero.currentIndexChanged.connect(
+            self.busquedaDeudas.programar)
 
-        self.stackedWidget.setCurrentIndex(14)
+        self.pantallas.mostrar("pantallaDeudas")
 
     def fetchResumen(self):
         """Este método refresca el resumen de deudas."""
@@ -3288,34 +3259,17 @@ class MainWindow(QtWidgets.QMainWindow):
             pass
 
         # Este fetch tiene dos tablas, asi que hacemos dos veces
-        rawData = dal.obtenerDatos(f"resumen{os.sep}deudas")
-        datos = []
-        # Filtramos por fecha
-        for rawRow in rawData:
-            fecha = QtCore.QDate.fromString(rawRow[7][:10], 'yyyy/MM/dd')
-            if fecha == hastaFecha.date():
-                datos.append(rawRow[:7])
+        # Obtenemos los datos del día elegido. La fecha y hora del
+        # movimiento, la última columna, no se muestra.
+        dia = hastaFecha.date().toPyDate()
+        datos = [rawRow[:7] for rawRow in dal.obtenerDatos(
+            f"resumen{os.sep}deudas", None, None, dia, dia)]
 
         # Si se encontraron datos de la primera tabla
         if datos:
             # Se muestra la tabla
             labelDeudas.setText('Han quedado herramientas adeudadas:')
-            tablaDeudas.setRowCount(0)
-
-            for rowNum, rowData in enumerate(datos):
-                tablaDeudas.insertRow(rowNum)
-                for cellNum, cellData in enumerate(rowData):
-                    if core.camposDeudas[1][cellNum]:
-                        item = QtWidgets.QTableWidgetItem(str(cellData))
-                    else:
-                        item = QtWidgets.QTableWidgetItem()
-                        item.setData(0, cellData)
-                    item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                    item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                                  QtCore.Qt.ItemFlag.ItemIsEnabled)
-                    tablaDeudas.setItem(rowNum, cellNum, item)
-                tablaDeudas.setRowHeight(rowNum, 35)
-            tablaDeudas.resizeRowsToContents()
+            self.modeloResumenDeudas.setFilas(datos)
             tablaDeudas.resizeColumnsToContents()
             tablaDeudas.setVerticalScrollBarPolicy(
                 QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -3336,29 +3290,11 @@ class MainWindow(QtWidgets.QMainWindow):
             tablaDeudas.hide()
 
         # Hacemos lo mismo con la segunda tabla
-        rawData = dal.obtenerDatos(f"resumen{os.sep}baja")
-        datos = []
-        for rawRow in rawData:
-            fecha = QtCore.QDate.fromString(rawRow[8], 'yyyy/MM/dd')
-            if fecha == hastaFecha.date():
-                datos.append(rawRow[:8])
+        datos = [rawRow[:8] for rawRow in dal.obtenerDatos(
+            f"resumen{os.sep}baja", None, None, dia, dia)]
 
         if datos:
-            for rowNum, rowData in enumerate(datos):
-                tablaBaja.insertRow(rowNum)
-                for cellNum, cellData in enumerate(rowData):
-                    if core.camposBaja[1][cellNum]:
-                        item = QtWidgets.QTableWidgetItem(str(cellData))
-                    else:
-                        item = QtWidgets.QTableWidgetItem()
-                        item.setData(0, cellData)
-                    item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
-                    item.setFlags(QtCore.Qt.ItemFlag.ItemIsSelectable |
-                                  QtCore.Qt.ItemFlag.ItemIsEnabled)
-                    tablaBaja.setItem(rowNum, cellNum, item)
-
-                tablaBaja.setRowHeight(rowNum, 35)
-            tablaBaja.resizeRowsToContents()
+            self.modeloResumenBaja.setFilas(datos)
             tablaBaja.resizeColumnsToContents()
             tablaBaja.setVerticalScrollBarPolicy(
                 QtCore.Qt.ScrollBarPolicy.ScrollBarAsNeeded)
@@ -3379,7 +3315,7 @@ class MainWindow(QtWidgets.QMainWindow):
             tablaBaja.hide()
 
         hastaFecha.dateChanged.connect(self.fetchResumen)
-        self.stackedWidget.setCurrentIndex(15)
+        self.pantallas.mostrar("pantallaResumen")
 
 
 # Creamos la app
@@ -3391,6 +3327,13 @@ app.setStyleSheet(open(os.path.join(os.path.abspath(
 # Cargamos las fuentes que usamos en la app
 core.cargarFuentes()
 
+# Al cerrar la app, detenemos el hilo de consultas.
+app.aboutToQuit.connect(dalAsincrona.cerrar)
+# Si falla una consulta del hilo, lo avisamos.
+dalAsincrona.error.connect(
+    lambda clave, mensaje: PopUp(
+        "Error", f"No se pudieron obtener los datos: {mensaje}").exec())
+
 # Hacemos el objeto de la clase de la ventana principal
 window = MainWindow()
 # Ejecutamos la app
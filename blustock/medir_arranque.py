@@ -0,0 +1,199 @@
+"""Este módulo mide el arranque de la app, hasta que se muestra el
+inicio de sesión, y falla si empeoró.
+
+Se ejecuta desde la carpeta blustock con:
+    python medir_arranque.py
+
+Abre la app varias veces, cada una en un proceso aparte, y cierra cada
+proceso apenas se muestra el inicio de sesión. Muestra:
+    - los segundos hasta el inicio de sesión (el menor de los intentos)
+    - la memoria máxima que usó el proceso, en MB
+    - los módulos que más tardan en importarse, según python -X
+      importtime.
+Si alguno de los módulos pesados que se importan recién al usarlos
+(ver dal/diferidos.py) se importó al arrancar, o si el tiempo o la
+memoria superan su presupuesto, termina con un error.
+
+Funciones
+---------
+    memoriaMaxima() -> float | None:
+        Devuelve la memoria máxima que usó el proceso, en MB.
+
+    medirEsteProceso():
+        Arranca la app en este proceso y muestra la medición.
+
+    medir(importtime: bool = False) -> tuple:
+        Arranca la app en otro proceso y devuelve la medición.
+
+    importacionesMasLentas(salida: str, cantidad: int) -> list:
+        Devuelve los módulos que más tardaron en importarse.
+
+Variables
+---------
+    MODULOS_DIFERIDOS: tuple
+        Los módulos que no se tienen que importar al arrancar.
+
+    PRESUPUESTO_SEGUNDOS: float
+        Los segundos máximos hasta el inicio de sesión.
+
+    PRESUPUESTO_MB: float
+        Los MB máximos de memoria al mostrar el inicio de sesión.
+
+    INTENTOS: int
+        Las veces que se arranca la app para medir el tiempo.
+"""
+import json
+import os
+import re
+import runpy
+import subprocess
+import sys
+import time
+
+MODULOS_DIFERIDOS = ("pandas", "numpy", "openpyxl", "pyarrow")
+PRESUPUESTO_SEGUNDOS = 1.5
+PRESUPUESTO_MB = 100
+INTENTOS = 3
+
+
+def memoriaMaxima() -> float | None:
+    """Esta función devuelve la memoria máxima que usó el proceso.
+
+    Devuelve
+    --------
+        float | None: la memoria, en MB, o None si no se puede medir
+            en este sistema.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Contadores(ctypes.Structure):
+            # PROCESS_MEMORY_COUNTERS, de la api de Windows.
+            _fields_ = [("cb", wintypes.DWORD),
+                        ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t),
+                        ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t),
+                        ("PeakPagefileUsage", ctypes.c_size_t)]
+        contadores = Contadores()
+        contadores.cb = ctypes.sizeof(contadores)
+        kernel32 = ctypes.windll.kernel32
+        kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+        if not kernel32.K32GetProcessMemoryInfo(
+                kernel32.GetCurrentProcess(), ctypes.byref(contadores),
+                contadores.cb):
+            return None
+        return contadores.PeakWorkingSetSize / 1024 / 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # En macOS se mide en bytes y en Linux, en KB.
+    return maximo / 1024 / (1024 if sys.platform == "darwin" else 1)
+
+
+def medirEsteProceso():
+    """Esta función arranca la app en este proceso y, cuando se
+    muestra el inicio de sesión, en lugar de ejecutar la app, muestra
+    la medición en formato json y termina.
+    """
+    from PyQt6 import QtWidgets
+
+    def medicion(*args) -> int:
+        print(json.dumps({
+            "fin": time.time(),
+            "mb": memoriaMaxima(),
+            "diferidos": [modulo for modulo in MODULOS_DIFERIDOS
+                          if modulo in sys.modules]}))
+        return 0
+    # main.py llama a app.exec() justo después de mostrar la ventana
+    # con el inicio de sesión.
+    QtWidgets.QApplication.exec = medicion
+    runpy.run_path("main.py", run_name="__main__")
+    # Salimos sin cerrar la app, porque no se llegó a ejecutar.
+    sys.stdout.flush()
+    os._exit(0)
+
+
+def medir(importtime: bool = False) -> tuple:
+    """Esta función arranca la app en otro proceso y devuelve la
+    medición.
+
+    Parámetros
+    ----------
+        importtime: bool = False
+            Si se ejecuta con python -X importtime. Default: False.
+
+    Devuelve
+    --------
+        tuple: los segundos hasta el inicio de sesión, el dict con la
+            medición del proceso y la salida de errores (con los
+            tiempos de importación, si se pidieron).
+    """
+    opciones = ["-X", "importtime"] if importtime else []
+    inicio = time.time()
+    proceso = subprocess.run(
+        [sys.executable, *opciones, os.path.abspath(__file__), "--hijo"],
+        capture_output=True, text=True, check=True)
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    return resultado["fin"] - inicio, resultado, proceso.stderr
+
+
+def importacionesMasLentas(salida: str, cantidad: int) -> list:
+    """Esta función devuelve los módulos que más tardaron en importarse,
+    contando lo que tardaron en importarse los módulos que importan.
+
+    Parámetros
+    ----------
+        salida: str
+            La salida de python -X importtime.
+
+        cantidad: int
+            La cantidad de módulos que se devuelven.
+
+    Devuelve
+    --------
+        list: los módulos, como tuplas con los milisegundos y el
+            nombre, del más lento al más rápido.
+    """
+    # Cada línea es "import time: propio | acumulado | módulo". Solo
+    # se cuentan los módulos importados directamente por la app, los
+    # que no tienen sangría.
+    linea = re.compile(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)$")
+    tiempos = [(int(coincidencia[1]) / 1000, coincidencia[2])
+               for coincidencia in map(linea.match, salida.splitlines())
+               if coincidencia]
+    return sorted(tiempos, reverse=True)[:cantidad]
+
+
+if __name__ == "__main__":
+    if "--hijo" in sys.argv:
+        medirEsteProceso()
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    segundos = min(medir()[0] for _ in range(INTENTOS))
+    _, resultado, salida = medir(importtime=True)
+    print("Importaciones más lentas (ms acumulados):")
+    for milisegundos, modulo in importacionesMasLentas(salida, 15):
+        print(f"    {milisegundos:>8.1f}  {modulo}")
+    print(f"Segundos hasta el inicio de sesión: {segundos:.2f} "
+          f"(presupuesto: {PRESUPUESTO_SEGUNDOS})")
+    if resultado["mb"] is not None:
+        print(f"Memoria máxima: {resultado['mb']:.1f} MB "
+              f"(presupuesto: {PRESUPUESTO_MB})")
+    errores = []
+    if resultado["diferidos"]:
+        errores.append("Se importaron al arrancar: "
+                       + ", ".join(resultado["diferidos"]))
+    if segundos > PRESUPUESTO_SEGUNDOS:
+        errores.append("El arranque superó su presupuesto de tiempo.")
+    if resultado["mb"] is not None and resultado["mb"] > PRESUPUESTO_MB:
+        errores.append("El arranque superó su presupuesto de memoria.")
+    for error in errores:
+        print(error)
+    sys.exit(1 if errores else 0)
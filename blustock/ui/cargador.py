@@ -0,0 +1,91 @@
+"""Este módulo contiene la función que carga los archivos ui de la
+carpeta ui/screens_uis en los widgets.
+
+Leer un archivo ui con uic.loadUi procesa su xml cada vez que se carga.
+Para evitarlo, ui/compilar.py convierte los archivos ui en módulos de
+python en la carpeta ui/compilados, que solo crean los widgets. Esta
+función usa el módulo compilado si existe y está al día con su archivo
+ui; si no, como durante el desarrollo, usa uic.loadUi.
+
+Funciones
+---------
+    rutaUi(archivo: str) -> str:
+        Devuelve la ruta de un archivo ui.
+
+    nombreModulo(archivo: str) -> str:
+        Devuelve el nombre del módulo compilado de un archivo ui.
+
+    cargarUi(archivo: str, widget: QtWidgets.QWidget):
+        Carga un archivo ui en un widget.
+"""
+import importlib
+import os
+from PyQt6 import QtWidgets, uic
+
+
+def rutaUi(archivo: str) -> str:
+    """Esta función devuelve la ruta de un archivo ui.
+
+    Parámetros
+    ----------
+        archivo: str
+            El nombre del archivo, en la carpeta ui/screens_uis.
+
+    Devuelve
+    --------
+        str: la ruta del archivo.
+    """
+    return os.path.join(os.path.abspath(os.getcwd()),
+                        f'ui{os.sep}screens_uis{os.sep}{archivo}')
+
+
+def nombreModulo(archivo: str) -> str:
+    """Esta función devuelve el nombre del módulo compilado de un
+    archivo ui. Los guiones se cambian por guiones bajos, porque no
+    pueden ir en el nombre de un módulo.
+
+    Parámetros
+    ----------
+        archivo: str
+            El nombre del archivo ui.
+
+    Devuelve
+    --------
+        str: el nombre del módulo, sin la carpeta.
+    """
+    return os.path.splitext(archivo)[0].replace('-', '_')
+
+
+def cargarUi(archivo: str, widget: QtWidgets.QWidget):
+    """Esta función carga un archivo ui en un widget. Igual que con
+    uic.loadUi, los widgets del archivo quedan como atributos del
+    widget.
+
+    Parámetros
+    ----------
+        archivo: str
+            El nombre del archivo, en la carpeta ui/screens_uis.
+
+        widget: QtWidgets.QWidget
+            El widget en el que se carga.
+    """
+    ruta = rutaUi(archivo)
+    try:
+        modulo = importlib.import_module(
+            f'ui.compilados.{nombreModulo(archivo)}')
+    except ImportError:
+        # No se compilaron los archivos ui.
+        return uic.loadUi(ruta, widget)
+    # Si se modificó el archivo ui después de compilarlo, el módulo
+    # quedó viejo y se usa el archivo.
+    if (os.path.exists(ruta)
+            and os.path.getmtime(ruta) > os.path.getmtime(modulo.__file__)):
+        return uic.loadUi(ruta, widget)
+    # El módulo tiene una sola clase, Ui_ y el nombre del widget, que
+    # guarda los widgets que crea como sus atributos. Los pasamos al
+    # widget, que es donde los busca la app.
+    clase = next(valor for nombre, valor in vars(modulo).items()
+                 if nombre.startswith('Ui_'))
+    ui = clase()
+    ui.setupUi(widget)
+    widget.__dict__.update(vars(ui))
@@ -0,0 +1,51 @@
+"""Este módulo compila los archivos ui de la carpeta ui/screens_uis en
+módulos de python, en la carpeta ui/compilados. Es un paso del armado
+de la app: ui/cargador.py usa los módulos compilados si existen.
+
+Se ejecuta desde la carpeta blustock con:
+    python -m ui.compilar
+
+Cada vez que se modifica un archivo ui hay que volver a compilarlo. Si
+no, el cargador usa el archivo ui hasta que se compile.
+
+Funciones
+---------
+    compilar() -> list:
+        Compila todos los archivos ui y devuelve los módulos creados.
+
+Variables
+---------
+    CARPETA_COMPILADOS: str
+        La carpeta en la que se guardan los módulos compilados.
+"""
+import os
+from PyQt6 import uic
+from ui.cargador import rutaUi, nombreModulo
+
+CARPETA_COMPILADOS = os.path.join('ui', 'compilados')
+
+
+def compilar() -> list:
+    """Esta función compila todos los archivos ui de la carpeta
+    ui/screens_uis.
+
+    Devuelve
+    --------
+        list: las rutas de los módulos creados.
+    """
+    os.makedirs(CARPETA_COMPILADOS, exist_ok=True)
+    modulos = []
+    for archivo in sorted(os.listdir(os.path.dirname(rutaUi('')))):
+        if not archivo.endswith('.ui'):
+            continue
+        ruta = os.path.join(CARPETA_COMPILADOS,
+                            f'{nombreModulo(archivo)}.py')
+        with open(ruta, 'w', encoding='utf-8') as modulo:
+            uic.compileUi(rutaUi(archivo), modulo)
+        modulos.append(ruta)
+    return modulos
+
+
+if __name__ == '__main__':
+    for ruta in compilar():
+        print(ruta)
@@ -0,0 +1,92 @@
+"""Este módulo mide cuánto tarda en cargarse cada archivo ui, leyéndolo
+con uic.loadUi y con su módulo compilado, para comparar las dos formas.
+
+Se ejecuta desde la carpeta blustock, después de compilar los archivos
+ui con python -m ui.compilar, con:
+    python -m ui.medir_carga
+
+Muestra, para cada archivo, el promedio de milisegundos de cada forma,
+y al final el total del arranque (main.ui y login.ui) y de todos los
+archivos.
+
+Funciones
+---------
+    medir(funcCargar: types.FunctionType, archivo: str,
+          veces: int) -> float:
+        Devuelve los milisegundos promedio que tarda en cargarse un
+        archivo ui.
+
+Variables
+---------
+    VECES: int
+        Las veces que se carga cada archivo para sacar el promedio.
+
+    ARRANQUE: tuple
+        Los archivos ui que se cargan al iniciar la app.
+"""
+import os
+import sys
+import time
+import types
+from xml.etree import ElementTree
+from PyQt6 import QtWidgets, uic
+from ui.cargador import cargarUi, rutaUi
+from ui.compilar import CARPETA_COMPILADOS
+
+VECES = 20
+ARRANQUE = ('main.ui', 'login.ui')
+
+
+def medir(funcCargar: types.FunctionType, archivo: str,
+          veces: int) -> float:
+    """Esta función devuelve los milisegundos promedio que tarda en
+    cargarse un archivo ui.
+
+    Parámetros
+    ----------
+        funcCargar: types.FunctionType
+            La función que carga el archivo en un widget.
+
+        archivo: str
+            El nombre del archivo ui.
+
+        veces: int
+            Las veces que se carga el archivo.
+
+    Devuelve
+    --------
+        float: el promedio, en milisegundos.
+    """
+    # El widget tiene que ser de la misma clase que el del archivo:
+    # main.ui es una ventana y los de los turnos, diálogos.
+    claseWidget = getattr(
+        QtWidgets, ElementTree.parse(rutaUi(archivo)).find('widget').get(
+            'class'))
+    inicio = time.perf_counter()
+    for _ in range(veces):
+        widget = claseWidget()
+        funcCargar(archivo, widget)
+        widget.deleteLater()
+    return (time.perf_counter() - inicio) * 1000 / veces
+
+
+if __name__ == '__main__':
+    if not os.path.isdir(CARPETA_COMPILADOS):
+        sys.exit('Primero hay que compilar los archivos ui con '
+                 'python -m ui.compilar')
+    app = QtWidgets.QApplication(sys.argv)
+    archivos = sorted(archivo for archivo
+                      in os.listdir(os.path.dirname(rutaUi('')))
+                      if archivo.endswith('.ui'))
+    tiempos = {}
+    print(f"{'Archivo':<22}{'uic (ms)':>10}{'compilado (ms)':>16}")
+    for archivo in archivos:
+        tiempos[archivo] = (
+            medir(lambda a, w: uic.loadUi(rutaUi(a), w), archivo, VECES),
+            medir(cargarUi, archivo, VECES))
+        print(f"{archivo:<22}{tiempos[archivo][0]:>10.2f}"
+              f"{tiempos[archivo][1]:>16.2f}")
+    for titulo, grupo in (('Arranque', ARRANQUE), ('Todos', archivos)):
+        print(f"{titulo:<22}"
+              f"{sum(tiempos[a][0] for a in grupo):>10.2f}"
+              f"{sum(tiempos[a][1] for a in grupo):>16.2f}")
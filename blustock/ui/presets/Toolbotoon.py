@@ -81,7 +81,7 @@ class toolboton(QtWidgets.QToolButton):
         self.nw.findChild(QtWidgets.QLineEdit, "usuariosLineEdit").clear()
         self.nw.findChild(QtWidgets.QLineEdit, "passwordLineEdit").clear()
         self.nw.menubar.hide()
-        self.nw.stackedWidget.setCurrentIndex(0)
+        self.nw.pantallas.mostrar("pantallaLogin")
         self.close()
     
     def nuevo(self):
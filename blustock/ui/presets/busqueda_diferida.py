@@ -0,0 +1,119 @@
+"""Este módulo contiene la clase que agrupa los cambios de los filtros
+de una pantalla en una sola búsqueda.
+
+Los filtros de los listados (las barras de búsqueda, los números, las
+fechas y las listas) avisan cada cambio: escribir un texto o girar la
+rueda sobre una fecha genera decenas de cambios seguidos. En lugar de
+refrescar la pantalla con cada uno, se espera a que los cambios paren
+un momento y se refresca una sola vez, con los filtros finales. Si la
+búsqueda anterior todavía se está ejecutando en el hilo de consultas,
+se interrumpe.
+
+Clases
+------
+    BusquedaDiferida(QtCore.QObject):
+        Refresca una pantalla cuando sus filtros dejan de cambiar.
+
+Variables
+---------
+    DEMORA_BUSQUEDA: int
+        Los milisegundos sin cambios que se esperan antes de buscar.
+"""
+import types
+from PyQt6 import QtWidgets, QtCore
+from dal.asincrono import dalAsincrona
+
+DEMORA_BUSQUEDA = 300
+
+
+class BusquedaDiferida(QtCore.QObject):
+    """Esta clase refresca una pantalla cuando sus filtros dejan de
+    cambiar. Cada cambio reinicia la espera, así que una ráfaga de
+    cambios termina en una sola búsqueda.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        funcFetch: types.FunctionType
+            La función que refresca la pantalla.
+
+        clave: str | None
+            La clave de los pedidos de la pantalla en el hilo de
+            consultas. Al cambiar un filtro, se cancela el pedido en
+            curso.
+
+        pantalla: QtWidgets.QWidget | None
+            La pantalla que se refresca. Si cuando termina la espera no
+            se está mostrando, la búsqueda queda pendiente hasta que se
+            muestre.
+
+        pendiente: bool
+            Si hay una búsqueda que se hará cuando se muestre la
+            pantalla.
+
+        timer: QtCore.QTimer
+            El timer que espera a que los filtros dejen de cambiar.
+
+    Métodos
+    -------
+        programar(self, *args):
+            Programa la búsqueda, reiniciando la espera.
+
+        buscarYa(self):
+            Hace la búsqueda programada sin esperar.
+
+        eventFilter(self, objeto: QtCore.QObject,
+                    evento: QtCore.QEvent) -> bool:
+            Hace la búsqueda pendiente cuando se muestra la pantalla.
+    """
+    def __init__(self, funcFetch: types.FunctionType,
+                 clave: str | None = None,
+                 pantalla: QtWidgets.QWidget | None = None,
+                 demora: int = DEMORA_BUSQUEDA):
+        super().__init__(pantalla)
+        self.funcFetch = funcFetch
+        self.clave = clave
+        self.pantalla = pantalla
+        self.pendiente = False
+        if pantalla is not None:
+            pantalla.installEventFilter(self)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(demora)
+        self.timer.timeout.connect(self._buscar)
+
+    def programar(self, *args):
+        """Este método programa la búsqueda, reiniciando la espera.
+        Recibe y descarta los argumentos de la señal que lo llama."""
+        # Los resultados de la búsqueda anterior ya no sirven.
+        if self.clave is not None:
+            dalAsincrona.cancelar(self.clave)
+        self.timer.start()
+
+    def buscarYa(self):
+        """Este método hace la búsqueda programada sin esperar. Si no
+        hay ninguna programada, no hace nada."""
+        if self.timer.isActive():
+            self.timer.stop()
+            self._buscar()
+
+    def eventFilter(self, objeto: QtCore.QObject,
+                    evento: QtCore.QEvent) -> bool:
+        """Este método hace la búsqueda pendiente cuando se muestra la
+        pantalla. No filtra ningún evento."""
+        if (evento.type() == QtCore.QEvent.Type.Show
+                and self.pendiente):
+            self._buscar()
+        return False
+
+    def _buscar(self):
+        """Refresca la pantalla, si se está mostrando. Si no, deja la
+        búsqueda pendiente."""
+        # Refrescar una pantalla oculta no sirve, pero la búsqueda no
+        # se puede perder: al mostrarla tiene que tener los filtros
+        # actuales.
+        self.pendiente = (self.pantalla is not None
+                          and not self.pantalla.isVisible())
+        if not self.pendiente:
+            self.funcFetch()
@@ -0,0 +1,145 @@
+"""Este módulo contiene los delegados de las tablas de las gestiones.
+
+Un delegado dibuja las celdas de una columna en lugar de poner un
+widget en cada celda. Así, una tabla con miles de filas no crea miles
+de lineEdits y botones: el delegado de sugerencias crea el campo con
+sugerencias solo cuando se edita una celda, y el delegado de botones
+dibuja los botones de guardar y eliminar y atiende sus clics.
+
+Clases
+------
+    DelegadoSugerencias(QtWidgets.QStyledItemDelegate):
+        Edita las celdas de una columna con un campo con sugerencias.
+
+    DelegadoBotones(QtWidgets.QStyledItemDelegate):
+        Dibuja los botones de guardar y eliminar de las filas.
+
+Variables
+---------
+    ROL_HABILITADO: QtCore.Qt.ItemDataRole
+        El rol de los items de las columnas de botones que guarda si el
+        botón está habilitado.
+"""
+import types
+from PyQt6 import QtWidgets, QtCore
+from ui.presets.param_edit import ParamEdit
+from ui.presets.boton import BotonFila
+
+ROL_HABILITADO = QtCore.Qt.ItemDataRole.UserRole
+
+
+class DelegadoSugerencias(QtWidgets.QStyledItemDelegate):
+    """Esta clase edita las celdas de una columna con un campo con
+    sugerencias. Fuera de la edición, la celda es un item de texto
+    común.
+
+    Hereda: PyQt6.QtWidgets.QStyledItemDelegate
+
+    Atributos
+    ---------
+        funcSugerencias: types.FunctionType
+            Una función que recibe el índice de la celda que se va a
+            editar y devuelve el modelo de sugerencias del campo.
+    """
+    def __init__(self, funcSugerencias: types.FunctionType,
+                 parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.funcSugerencias = funcSugerencias
+
+    def createEditor(self, parent: QtWidgets.QWidget,
+                     option: QtWidgets.QStyleOptionViewItem,
+                     index: QtCore.QModelIndex) -> QtWidgets.QWidget:
+        # El modelo se pide recién al editar, así las sugerencias
+        # dependen de los datos actuales de la fila.
+        editor = ParamEdit(self.funcSugerencias(index), "")
+        # El campo de la tabla tiene fondo transparente; el editor
+        # tiene que tapar el texto de la celda.
+        editor.setObjectName("editorSugerencias")
+        editor.setParent(parent)
+        return editor
+
+
+class DelegadoBotones(QtWidgets.QStyledItemDelegate):
+    """Esta clase dibuja los botones de guardar y eliminar de las filas
+    de una tabla. Se usa en las dos últimas columnas: la anteúltima es
+    la de guardar y la última la de eliminar.
+
+    El estado de cada botón se guarda en el item de su celda, con el
+    rol ROL_HABILITADO. Los botones se dibujan con el estilo de un
+    BotonFila de muestra, que no se muestra.
+
+    Hereda: PyQt6.QtWidgets.QStyledItemDelegate
+
+    Atributos
+    ---------
+        tabla: QtWidgets.QTableWidget
+            La tabla en la que se dibujan los botones.
+
+        muestras: dict
+            Un BotonFila de muestra por columna.
+
+    Señales
+    -------
+        guardar(int):
+            Se emite con el número de fila al apretar guardar.
+
+        eliminar(int):
+            Se emite con el número de fila al apretar eliminar.
+    """
+    guardar = QtCore.pyqtSignal(int)
+    eliminar = QtCore.pyqtSignal(int)
+
+    def __init__(self, tabla: QtWidgets.QTableWidget):
+        super().__init__(tabla)
+        self.tabla = tabla
+        self.muestras = {}
+        for icono in ("guardar", "eliminar"):
+            muestra = BotonFila(icono)
+            muestra.setParent(tabla)
+            muestra.hide()
+            self.muestras[icono] = muestra
+        # Para dibujar el botón que está bajo el mouse.
+        tabla.setMouseTracking(True)
+
+    def _icono(self, index: QtCore.QModelIndex) -> str:
+        if index.column() == self.tabla.columnCount() - 1:
+            return "eliminar"
+        return "guardar"
+
+    def paint(self, painter, option: QtWidgets.QStyleOptionViewItem,
+              index: QtCore.QModelIndex):
+        muestra = self.muestras[self._icono(index)]
+        opcion = QtWidgets.QStyleOptionButton()
+        opcion.rect = option.rect
+        opcion.icon = muestra.icon()
+        opcion.iconSize = muestra.iconSize()
+        opcion.state = QtWidgets.QStyle.StateFlag.State_Raised
+        if index.data(ROL_HABILITADO):
+            opcion.state |= QtWidgets.QStyle.StateFlag.State_Enabled
+            opcion.state |= (option.state &
+                             QtWidgets.QStyle.StateFlag.State_MouseOver)
+        muestra.style().drawControl(
+            QtWidgets.QStyle.ControlElement.CE_PushButton, opcion, painter,
+            muestra)
+
+    def sizeHint(self, option: QtWidgets.QStyleOptionViewItem,
+                 index: QtCore.QModelIndex) -> QtCore.QSize:
+        return self.muestras[self._icono(index)].sizeHint()
+
+    def editorEvent(self, event: QtCore.QEvent,
+                    model: QtCore.QAbstractItemModel,
+                    option: QtWidgets.QStyleOptionViewItem,
+                    index: QtCore.QModelIndex) -> bool:
+        if event.type() not in (QtCore.QEvent.Type.MouseButtonPress,
+                                QtCore.QEvent.Type.MouseButtonRelease,
+                                QtCore.QEvent.Type.MouseButtonDblClick):
+            return False
+        # Los clics sobre los botones no seleccionan la celda.
+        if (event.type() == QtCore.QEvent.Type.MouseButtonRelease
+                and event.button() == QtCore.Qt.MouseButton.LeftButton
+                and index.data(ROL_HABILITADO)):
+            if self._icono(index) == "eliminar":
+                self.eliminar.emit(index.row())
+            else:
+                self.guardar.emit(index.row())
+        return True
@@ -0,0 +1,261 @@
+"""Este módulo contiene un modelo de tabla de solo lectura para los
+listados de la UI.
+
+A diferencia de un QTableWidget, que crea un QTableWidgetItem por cada
+celda, el modelo guarda las filas tal como las devuelve el DAL y la
+vista le pide solo las celdas que se ven en pantalla.
+
+Clases
+------
+    ModeloTabla(QtCore.QAbstractTableModel):
+        Un modelo de tabla que muestra una lista de filas.
+
+    ModeloPaginado(ModeloTabla):
+        Un modelo de tabla que carga las filas de a páginas, a medida
+        que se baja en la tabla.
+
+Funciones
+---------
+    configurarTabla(tabla: QtWidgets.QTableView, encabezados: tuple,
+                    tiposValor: tuple,
+                    tamanoPagina: int | None = None) -> ModeloTabla:
+        Crea el modelo de una tabla y lo conecta a la vista con un
+        proxy que permite ordenar.
+"""
+import types
+from PyQt6 import QtWidgets, QtCore
+
+
+class ModeloTabla(QtCore.QAbstractTableModel):
+    """Esta clase crea un modelo de tabla de solo lectura que muestra
+    una lista de filas.
+
+    Hereda: PyQt6.QtCore.QAbstractTableModel
+
+    Atributos
+    ---------
+        encabezados: tuple
+            Los títulos de las columnas.
+
+        tiposValor: tuple
+            El tipo de valor de cada columna, como en las tuplas campos
+            de core: 0 si es un número, cualquier otro valor si es
+            texto. Los números se muestran tal cual para que se ordenen
+            como números.
+
+        filas: list
+            Las filas que muestra el modelo.
+
+    Métodos
+    -------
+        setFilas(self, filas: list):
+            Reemplaza las filas que muestra el modelo.
+
+        fila(self, numFila: int) -> list | tuple:
+            Devuelve una fila del modelo.
+    """
+    def __init__(self, encabezados: tuple, tiposValor: tuple,
+                 parent: QtCore.QObject | None = None):
+        super().__init__(parent)
+        self.encabezados = encabezados
+        self.tiposValor = tiposValor
+        self.filas = []
+
+    def setFilas(self, filas: list):
+        """Este método reemplaza las filas que muestra el modelo.
+
+        Parámetros
+        ----------
+            filas: list
+                Las filas nuevas, cada una una lista o tupla con un
+                valor por columna.
+        """
+        self.beginResetModel()
+        self.filas = filas
+        self.endResetModel()
+
+    def fila(self, numFila: int) -> list | tuple:
+        """Este método devuelve una fila del modelo.
+
+        Parámetros
+        ----------
+            numFila: int
+                El número de la fila en el modelo.
+
+        Devuelve
+        --------
+            list | tuple: la fila.
+        """
+        return self.filas[numFila]
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.filas)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.encabezados)
+
+    def data(self, index: QtCore.QModelIndex,
+             role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            dato = self.filas[index.row()][index.column()]
+            if self.tiposValor[index.column()]:
+                return str(dato)
+            return dato
+        if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            return QtCore.Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section: int,
+                   orientation: QtCore.Qt.Orientation,
+                   role=QtCore.Qt.ItemDataRole.DisplayRole):
+        if (role == QtCore.Qt.ItemDataRole.DisplayRole
+                and orientation == QtCore.Qt.Orientation.Horizontal):
+            return self.encabezados[section]
+        return None
+
+    def flags(self, index: QtCore.QModelIndex) -> QtCore.Qt.ItemFlag:
+        return (QtCore.Qt.ItemFlag.ItemIsSelectable |
+                QtCore.Qt.ItemFlag.ItemIsEnabled)
+
+
+class ModeloPaginado(ModeloTabla):
+    """Esta clase crea un modelo de tabla que carga las filas de a
+    páginas. La tabla le pide la página siguiente (con canFetchMore y
+    fetchMore) cuando se llega al final de las filas cargadas, así que
+    al abrir un listado solo se carga la primera página, sin importar
+    cuántas filas tenga.
+
+    Hereda: ModeloTabla
+
+    Atributos
+    ---------
+        tamanoPagina: int
+            La cantidad de filas de cada página. Si una página trae
+            menos filas, ya no hay más para cargar.
+
+        funcPagina: types.FunctionType | None
+            La función que pide las páginas. Recibe la última fila
+            cargada, la función a la que hay que pasarle las filas de
+            la página siguiente cuando lleguen y la función a la que
+            hay que llamar si el pedido se cancela o falla. Así la
+            página se puede pedir al hilo de consultas sin bloquear la
+            interfaz.
+
+        completo: bool
+            Si ya se cargaron todas las filas.
+
+        cargando: bool
+            Si ya se pidió una página que todavía no llegó.
+
+    Métodos
+    -------
+        setFuncPagina(self, funcPagina: types.FunctionType, filas: list):
+            Reemplaza la función que pide las páginas y muestra la
+            primera página.
+    """
+    def __init__(self, encabezados: tuple, tiposValor: tuple,
+                 tamanoPagina: int, parent: QtCore.QObject | None = None):
+        super().__init__(encabezados, tiposValor, parent)
+        self.tamanoPagina = tamanoPagina
+        self.funcPagina = None
+        self.completo = True
+        self.cargando = False
+
+    def setFuncPagina(self, funcPagina: types.FunctionType, filas: list):
+        """Este método reemplaza la función que pide las páginas y
+        muestra la primera página. Si todavía no llegó una página de
+        la función anterior, se descarta.
+
+        Parámetros
+        ----------
+            funcPagina: types.FunctionType
+                La función que pide las páginas.
+
+            filas: list
+                La primera página.
+        """
+        self.funcPagina = funcPagina
+        self.cargando = False
+        self.completo = len(filas) < self.tamanoPagina
+        self.setFilas(filas)
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()) -> bool:
+        return (not parent.isValid() and not self.completo
+                and not self.cargando)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if not self.canFetchMore(parent) or not self.filas:
+            return
+        # Mientras la página no llegue, la tabla no pide otra.
+        self.cargando = True
+        funcPagina = self.funcPagina
+        funcPagina(self.filas[-1],
+                   lambda filas: self._agregarPagina(funcPagina, filas),
+                   lambda: self._cancelarPagina(funcPagina))
+
+    def _cancelarPagina(self, funcPagina: types.FunctionType):
+        """Permite volver a pedir la página, si se canceló un pedido de
+        la función de páginas actual."""
+        if funcPagina is self.funcPagina:
+            self.cargando = False
+
+    def _agregarPagina(self, funcPagina: types.FunctionType, filas: list):
+        """Agrega al final las filas de una página, si se pidió con la
+        función de páginas actual."""
+        if funcPagina is not self.funcPagina:
+            return
+        self.cargando = False
+        self.completo = len(filas) < self.tamanoPagina
+        if not filas:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), len(self.filas),
+                             len(self.filas) + len(filas) - 1)
+        self.filas.extend(filas)
+        self.endInsertRows()
+
+
+def configurarTabla(tabla: QtWidgets.QTableView, encabezados: tuple,
+                    tiposValor: tuple,
+                    tamanoPagina: int | None = None) -> ModeloTabla:
+    """Esta función crea el modelo de una tabla y lo conecta a la vista
+    a través de un QSortFilterProxyModel, para que se pueda ordenar por
+    columna sin tocar las filas del modelo.
+
+    Parámetros
+    ----------
+        tabla: QtWidgets.QTableView
+            La vista de la tabla.
+
+        encabezados: tuple
+            Los títulos de las columnas.
+
+        tiposValor: tuple
+            El tipo de valor de cada columna.
+
+        tamanoPagina: int | None = None
+            Si se pasa, se crea un ModeloPaginado con páginas de esa
+            cantidad de filas.
+            Default: None.
+
+    Devuelve
+    --------
+        ModeloTabla: el modelo creado.
+    """
+    if tamanoPagina is None:
+        modelo = ModeloTabla(encabezados, tiposValor, tabla)
+    else:
+        modelo = ModeloPaginado(encabezados, tiposValor, tamanoPagina,
+                                tabla)
+    proxy = QtCore.QSortFilterProxyModel(tabla)
+    proxy.setSourceModel(modelo)
+    tabla.setModel(proxy)
+    # Todas las filas tienen el mismo alto, así la vista no tiene que
+    # medir cada fila para saber cuánto ocupa la tabla.
+    tabla.verticalHeader().setDefaultSectionSize(35)
+    return modelo
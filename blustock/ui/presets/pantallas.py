@@ -0,0 +1,159 @@
+"""Este módulo contiene el registro de las pantallas de la ventana
+principal.
+
+Cargar un archivo ui lee y procesa el xml y crea todos sus widgets, y
+la ventana principal tiene más de quince pantallas, de las que en cada
+sesión se suelen usar dos o tres. En lugar de cargarlas todas antes de
+mostrar el inicio de sesión, cada pantalla se registra con su archivo
+ui y la función que la conecta, y se carga recién la primera vez que
+se usa. Después de iniciar sesión, las pantallas que faltan se pueden
+ir cargando de a una cuando la app está sin hacer nada.
+
+Clases
+------
+    RegistroPantallas(QtCore.QObject):
+        Carga las pantallas de una ventana la primera vez que se usan.
+
+Variables
+---------
+    PRECARGA: bool
+        Si las pantallas que faltan se cargan cuando la app está sin
+        hacer nada.
+"""
+import types
+from PyQt6 import QtWidgets, QtCore
+from ui.cargador import cargarUi
+
+PRECARGA = True
+
+
+class RegistroPantallas(QtCore.QObject):
+    """Esta clase carga las pantallas de una ventana la primera vez que
+    se usan. Cada pantalla se guarda como atributo de la ventana, con
+    el nombre con el que se registró, y se añade a su stackedWidget.
+
+    Hereda: PyQt6.QtCore.QObject
+
+    Atributos
+    ---------
+        ventana: QtWidgets.QMainWindow
+            La ventana que tiene las pantallas.
+
+        stackedWidget: QtWidgets.QStackedWidget
+            El widget en el que se muestran las pantallas.
+
+        funcPreparar: types.FunctionType | None
+            La función que se llama con cada pantalla al cargarla,
+            antes de conectarla.
+
+        registro: dict
+            El archivo ui y la función que conecta cada pantalla,
+            según su nombre.
+
+        cargadas: dict
+            Las pantallas ya cargadas, según su nombre.
+
+    Métodos
+    -------
+        registrar(self, nombre: str, archivo: str,
+                  funcConectar: types.FunctionType | None = None):
+            Registra una pantalla.
+
+        obtener(self, nombre: str) -> QtWidgets.QWidget:
+            Devuelve una pantalla, cargándola si hace falta.
+
+        mostrar(self, nombre: str):
+            Muestra una pantalla.
+
+        precargar(self):
+            Carga las pantallas que faltan cuando la app está sin
+            hacer nada.
+    """
+    def __init__(self, ventana: QtWidgets.QMainWindow,
+                 stackedWidget: QtWidgets.QStackedWidget,
+                 funcPreparar: types.FunctionType | None = None):
+        super().__init__(ventana)
+        self.ventana = ventana
+        self.stackedWidget = stackedWidget
+        self.funcPreparar = funcPreparar
+        self.registro = {}
+        self.cargadas = {}
+
+    def __contains__(self, nombre: str) -> bool:
+        return nombre in self.registro
+
+    def registrar(self, nombre: str, archivo: str,
+                  funcConectar: types.FunctionType | None = None):
+        """Este método registra una pantalla. No la carga.
+
+        Parámetros
+        ----------
+            nombre: str
+                El nombre del atributo de la ventana con la pantalla.
+
+            archivo: str
+                El nombre del archivo ui de la pantalla, en la carpeta
+                ui/screens_uis.
+
+            funcConectar: types.FunctionType | None = None
+                La función que conecta la pantalla al cargarla.
+                Default: None.
+        """
+        self.registro[nombre] = (archivo, funcConectar)
+
+    def obtener(self, nombre: str) -> QtWidgets.QWidget:
+        """Este método devuelve una pantalla. Si es la primera vez que
+        se pide, la carga, la añade al stackedWidget y la conecta.
+
+        Parámetros
+        ----------
+            nombre: str
+                El nombre de la pantalla.
+
+        Devuelve
+        --------
+            QtWidgets.QWidget: la pantalla.
+        """
+        if nombre in self.cargadas:
+            return self.cargadas[nombre]
+        archivo, funcConectar = self.registro[nombre]
+        pantalla = QtWidgets.QWidget()
+        cargarUi(archivo, pantalla)
+        self.stackedWidget.addWidget(pantalla)
+        # La pantalla se guarda antes de conectarla, porque la función
+        # que la conecta la usa como atributo de la ventana.
+        self.cargadas[nombre] = pantalla
+        setattr(self.ventana, nombre, pantalla)
+        if self.funcPreparar:
+            self.funcPreparar(pantalla)
+        if funcConectar:
+            funcConectar()
+        return pantalla
+
+    def mostrar(self, nombre: str):
+        """Este método muestra una pantalla, cargándola si hace falta.
+
+        Parámetros
+        ----------
+            nombre: str
+                El nombre de la pantalla.
+        """
+        self.stackedWidget.setCurrentWidget(self.obtener(nombre))
+
+    def precargar(self):
+        """Este método carga las pantallas que faltan, de a una por
+        vez, cuando la app está sin hacer nada. Así, las primeras veces
+        que se abren ya no hay que esperar que se carguen.
+        """
+        if PRECARGA:
+            # Un timer de 0 ms se dispara cuando no quedan eventos por
+            # procesar, así que la carga no demora a la interfaz.
+            QtCore.QTimer.singleShot(0, self._precargarSiguiente)
+
+    def _precargarSiguiente(self):
+        """Carga la siguiente pantalla que falta y programa la otra."""
+        for nombre in self.registro:
+            if nombre not in self.cargadas:
+                self.obtener(nombre)
+                QtCore.QTimer.singleShot(0, self._precargarSiguiente)
+                return
@@ -15,12 +15,15 @@ class ParamEdit(QtWidgets.QLineEdit):
 
     Atributos
     ---------
-        sugerencias: list | tuple
+        sugerencias: list | tuple | QtCore.QAbstractItemModel
             Las sugerencias que va a tener el cuadro de sugerencias.
+            Si se pasa un modelo, el cuadro lo usa directamente, así
+            varios campos pueden compartir las mismas sugerencias.
         texto: str
             El texto que estará por defecto en el lineEdit.
     """
-    def __init__(self, sugerencias: list | tuple, texto: str):
+    def __init__(self, sugerencias: list | tuple | QtCore.QAbstractItemModel,
+                 texto: str):
         super().__init__()
         texto=str(texto)
         self.setObjectName('paramEdit')
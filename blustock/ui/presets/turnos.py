@@ -7,18 +7,20 @@ Clases
 """
 import os
 from PyQt6.QtWidgets import QDialog
-from PyQt6 import uic,QtGui,QtCore,QtWidgets
+from PyQt6 import QtGui,QtCore,QtWidgets
 from dal.dal import dal
+from dal.vocabularios import marcarCambio
 from db.bdd import bdd
-from datetime import datetime
+from db.fechas import ahora
 from ui.presets.popup import PopUp
+from ui.cargador import cargarUi
 
 class NuevoTurno(QDialog):
     def __init__(self,usuario):
         self.turnFinalized = None
         self.usuario = usuario
         super().__init__()
-        uic.loadUi(os.path.join(os.path.abspath(os.pardir),os.getcwd(),"ui", 'screens_uis', 'cargar_turno.ui'), self)
+        cargarUi('cargar_turno.ui', self)
         self.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
         self.setWindowTitle("Cargar turno")
         sugerencias=[]
@@ -57,9 +59,10 @@ class NuevoTurno(QDialog):
                 profe = dal.obtenerDatos("usuarios",self.usuario,)
                 alumno = dal.obtenerDatos("alumnos",self.alumnoComboBox.currentText(),)
                 panol = dal.obtenerDatos("ubicaciones",self.comboBox.currentText(),)
-                fecha = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+                fecha = ahora()
                 bdd.cur.execute("INSERT INTO turnos(id_panolero, fecha_ing, id_prof_ing, id_ubi) VALUES (?, ?, ?, ?)", (alumno[0][0], fecha, profe[0][0], panol[0][0]))
                 bdd.con.commit()
+                marcarCambio("turnos")
                 mensaje = """El turno se cargo con exito."""
                 self.turnFinalized = True
                 PopUp("Aviso", mensaje).exec()
@@ -81,8 +84,7 @@ class TerminarTurno(QDialog):
         self.funcRefresh=funcRefresh
         super().__init__()
         self.setFixedSize(600, 400)
-        uic.loadUi(os.path.join(os.path.abspath(os.getcwd()),
-                   f'ui{os.sep}screens_uis{os.sep}finalizar_turno.ui'), self)
+        cargarUi('finalizar_turno.ui', self)
         self.setWindowTitle("Finalizar turno")
         self.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
         path = f'ui{os.sep}rsc{os.sep}icons{os.sep}mostrar.png'
@@ -114,9 +116,10 @@ class TerminarTurno(QDialog):
             if self.contrasenaLineEdit.text() == dal.obtenerDatos("usuarios", self.usuario)[0][5]:
                 self.turnFinalized = True
                 profe = dal.obtenerDatos("usuarios", self.usuario,)
-                hora = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
+                hora = ahora()
                 bdd.cur.execute("""UPDATE turnos SET fecha_egr = ?, id_prof_egr = ? WHERE fecha_egr is null""", (hora, profe[0][0],))
                 bdd.con.commit()
+                marcarCambio("turnos")
                 mensaje = """El turno se ha finalizado correctamente"""
                 PopUp("Aviso", mensaje).exec()
                 self.funcRefresh()
@@ -134,8 +137,7 @@ class cerrarSesion(QDialog):
         self.turnFinalized = None
         self.usuario = usuario
         super().__init__()
-        uic.loadUi(os.path.join(os.path.abspath(os.getcwd()),
-                   f'ui{os.sep}screens_uis{os.sep}finalizar_turno.ui'), self)
+        cargarUi('finalizar_turno.ui', self)
         self.setWindowTitle("Cerrar la aplicacion")
         self.setWindowModality(QtCore.Qt.WindowModality.ApplicationModal)
         self.Contrasena.setText("Para cerrar la aplicacion, por favor ingrese su contraseña")